@@ -1,2 +1,16 @@
 from django.contrib import admin
+from .models import SyncJob, AISummaryCache
 
+
+@admin.register(SyncJob)
+class SyncJobAdmin(admin.ModelAdmin):
+    list_display = ['sync_job_id', 'recruiter', 'kind', 'status', 'stage', 'created_at', 'finished_at']
+    list_filter = ['status', 'kind']
+    search_fields = ['recruiter__email']
+
+
+@admin.register(AISummaryCache)
+class AISummaryCacheAdmin(admin.ModelAdmin):
+    list_display = ['cache_key', 'kind', 'model_name', 'hit_count', 'last_used_at', 'expires_at']
+    list_filter = ['kind', 'model_name']
+    search_fields = ['cache_key']
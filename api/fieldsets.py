@@ -0,0 +1,81 @@
+from django.core.exceptions import FieldDoesNotExist
+
+
+def requested_fieldset(request):
+    """Return (fields, exclude) name sets from ?fields=a,b and ?exclude=c on a GET request"""
+    if request is None or request.method != 'GET':
+        return set(), set()
+    fields = {name.strip() for name in request.query_params.get('fields', '').split(',') if name.strip()}
+    exclude = {name.strip() for name in request.query_params.get('exclude', '').split(',') if name.strip()}
+    return fields, exclude
+
+
+class SparseFieldsetMixin:
+    """Drop serializer fields the request did not ask for with ?fields= or asked to leave out with ?exclude="""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, exclude = requested_fieldset(self.context.get('request'))
+        for name in list(self.fields):
+            if (fields and name not in fields) or name in exclude:
+                self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """Load only the columns the sparse serializer will read, plus the pagination ordering"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        ordering = getattr(self.pagination_class, 'ordering', ()) if self.pagination_class else ()
+        return sparse_queryset(self.request, queryset, self.get_serializer_class(), ordering)
+
+
+def sparse_queryset(request, queryset, serializer_class, ordering=()):
+    """
+    Restrict queryset to the columns behind the requested serializer fields with .only(), joining
+    just the relations they traverse. Left unchanged when no fieldset was requested or when a
+    field reads something other than a model column (method fields, properties).
+    """
+    fields, exclude = requested_fieldset(request)
+    if not fields and not exclude:
+        return queryset
+
+    serializer = serializer_class(context={'request': request})
+    model = queryset.model
+    paths = {model._meta.pk.name}
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        path = _column_path(model, field.source_attrs)
+        if path is None:
+            return queryset
+        paths.add(path)
+    for name in ordering:
+        name = name.lstrip('-')
+        paths.add(model._meta.pk.name if name == 'pk' else name)
+
+    relations = set()
+    for path in paths:
+        parts = path.split('__')
+        relations.update('__'.join(parts[:depth]) for depth in range(1, len(parts)))
+
+    queryset = queryset.select_related(None)
+    if relations:
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*paths)
+
+
+def _column_path(model, attrs):
+    parts = []
+    for attr in attrs:
+        if model is None:
+            return None
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if field.many_to_many or field.one_to_many:
+            return None
+        parts.append(attr)
+        model = field.related_model if field.is_relation else None
+    return '__'.join(parts) or None
@@ -0,0 +1,181 @@
+import functools
+import inspect
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+from unittest.mock import patch
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.utils import timezone
+from api.models import AISummaryCache, SyncJob
+from api.services.sync_job_service import SyncJobService
+from candidate.models import AttachmentText, Candidate, CandidateAttachment
+from candidate.services.attachment_preview_service import AttachmentPreviewService
+from candidate.services.attachment_text_service import AttachmentTextService
+from candidate.services.candidate_sync_service import CandidateSyncService
+from companies.models import Company
+from companies.services.company_sync_service import CompanySyncService
+from job.models import Job
+from job.services import job_sync_service
+from job.services.job_sync_service import JobSyncService
+from recos.ai_providers import FakeAIClient, get_ai_client
+from users.models import OdooCredentials, Recruiter
+from users.services.fake_odoo import FakeOdooAdapter
+from users.services.odoo_service import OdooService, get_shared_session
+
+FAKE_ODOO_URL = 'https://odoo.benchmark.invalid'
+
+STAGES = [
+    ('companies', CompanySyncService, 'sync_recruiter_companies'),
+    ('jobs', JobSyncService, 'sync_jobs_for_user'),
+    ('  job summaries', job_sync_service, 'generate_job_summaries'),
+    ('candidates (per job)', CandidateSyncService, 'sync_candidates_for_job'),
+    ('  candidate upsert', CandidateSyncService, '_bulk_upsert_candidates'),
+    ('  attachments', CandidateSyncService, '_sync_changed_attachments'),
+    ('    downloads', CandidateSyncService, '_download_attachment'),
+    ('    text extraction', AttachmentTextService, 'store_for_attachments'),
+    ('    previews', AttachmentPreviewService, 'store_for_attachments'),
+    ('  skill summaries', CandidateSyncService, 'regenerate_dirty_skill_summaries'),
+    ('odoo rpc', OdooService, '_post'),
+    ('llm calls', FakeAIClient, 'generate_content'),
+]
+
+
+class StageTimer:
+    """Accumulates call counts and time per stage across every thread of the sync"""
+
+    def __init__(self):
+        self.totals = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, owner, name, stage):
+        """Return a timed replacement for owner.name, keeping it a staticmethod if it was one"""
+        original = inspect.getattr_static(owner, name)
+        is_static = isinstance(original, staticmethod)
+        func = original.__func__ if is_static else original
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - started)
+
+        return staticmethod(timed) if is_static else timed
+
+    def add(self, stage, seconds):
+        with self._lock:
+            calls, total = self.totals.get(stage, (0, 0.0))
+            self.totals[stage] = (calls + 1, total + seconds)
+
+
+class Command(BaseCommand):
+    help = "Run a full sync against an in-process fake Odoo and fake LLM and report per-stage timings"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=3, help='Companies in the fake Odoo')
+        parser.add_argument('--jobs', type=int, default=5, help='Jobs per company')
+        parser.add_argument('--candidates', type=int, default=10, help='Applicants per job')
+        parser.add_argument('--attachments', type=int, default=1, help='Resumes per applicant')
+        parser.add_argument('--odoo-latency', type=float, default=0.05, help='Mean seconds per Odoo request')
+        parser.add_argument('--ai-latency', type=float, default=0.5, help='Mean seconds per LLM call')
+        parser.add_argument('--ai-error-rate', type=float, default=0.0, help='Share of LLM calls rate limited')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for injected latency and errors')
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        media_root = tempfile.mkdtemp(prefix='recos-benchmark-')
+        adapter = FakeOdooAdapter(
+            companies=options['companies'],
+            jobs_per_company=options['jobs'],
+            candidates_per_job=options['candidates'],
+            attachments_per_candidate=options['attachments'],
+            latency=options['odoo_latency'],
+            seed=options['seed'],
+            run_id=run_id
+        )
+        timer = StageTimer()
+        try:
+            with ExitStack() as stack:
+                stack.enter_context(override_settings(
+                    AI_PROVIDER='fake',
+                    AI_FAKE_LATENCY=options['ai_latency'],
+                    AI_FAKE_ERROR_RATE=options['ai_error_rate'],
+                    AI_FAKE_SEED=options['seed'],
+                    MEDIA_ROOT=media_root
+                ))
+                for stage, owner, name in STAGES:
+                    stack.enter_context(patch.object(owner, name, timer.instrument(owner, name, stage)))
+
+                AISummaryCache.objects.filter(model_name=FakeAIClient.model_name).delete()
+                recruiter = self._create_recruiter(run_id, adapter)
+                try:
+                    sync_job, created = SyncJobService.enqueue(recruiter, SyncJob.KIND_ALL)
+                    sync_job.status = SyncJob.STATUS_RUNNING
+                    sync_job.started_at = timezone.now()
+                    started = time.perf_counter()
+                    SyncJobService.run(sync_job)
+                    elapsed = time.perf_counter() - started
+                    self._report(recruiter, sync_job, elapsed, timer, adapter, get_ai_client())
+                finally:
+                    self._cleanup(recruiter)
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+    def _create_recruiter(self, run_id, adapter):
+        """A throwaway recruiter whose Odoo credentials point at the fake server"""
+        recruiter = Recruiter.objects.create_user(
+            email=f'benchmark-{run_id}@example.invalid',
+            first_name='Benchmark',
+            last_name=run_id,
+            password=uuid.uuid4().hex
+        )
+        credentials = OdooCredentials.objects.create(
+            odoo_user_id=FakeOdooAdapter.UID,
+            recruiter=recruiter,
+            api_key='benchmark',
+            email_address=recruiter.email,
+            db_name=f'benchmark_{run_id}',
+            db_url=FAKE_ODOO_URL
+        )
+        get_shared_session(credentials.db_url, credentials.db_name, credentials.email_address).mount(FAKE_ODOO_URL, adapter)
+        return recruiter
+
+    def _report(self, recruiter, sync_job, elapsed, timer, adapter, ai_client):
+        companies = Company.objects.filter(recruiter=recruiter)
+        jobs = Job.objects.filter(company__recruiter=recruiter)
+        candidates = Candidate.objects.filter(job__company__recruiter=recruiter)
+        attachments = CandidateAttachment.objects.filter(candidate__job__company__recruiter=recruiter)
+        self.stdout.write(
+            f"Sync {sync_job.status} in {elapsed:.2f}s: {companies.count()} companies, {jobs.count()} jobs, "
+            f"{candidates.count()} candidates, {attachments.count()} attachments"
+        )
+        if sync_job.error:
+            self.stdout.write(f"Error: {sync_job.error}")
+        self.stdout.write(
+            f"Fake Odoo served {adapter.requests} requests; fake LLM answered {ai_client.calls} calls "
+            f"({ai_client.failures} rate limited)"
+        )
+        self.stdout.write(f"{'stage':<24}{'calls':>8}{'total s':>10}{'mean ms':>10}")
+        for stage, owner, name in STAGES:
+            calls, total = timer.totals.get(stage, (0, 0.0))
+            mean = total / calls * 1000 if calls else 0.0
+            self.stdout.write(f"{stage:<24}{calls:>8}{total:>10.2f}{mean:>10.1f}")
+        self.stdout.write("Stage times are summed across threads; indented stages are part of the one above.")
+
+    def _cleanup(self, recruiter):
+        """Delete everything the run stored; blobs and previews go with their attachments"""
+        checksums = list(
+            CandidateAttachment.objects.filter(candidate__job__company__recruiter=recruiter)
+            .exclude(checksum='')
+            .values_list('checksum', flat=True)
+        )
+        recruiter.delete()
+        AttachmentText.objects.filter(checksum__in=checksums).exclude(
+            checksum__in=CandidateAttachment.objects.values('checksum')
+        ).delete()
+        AISummaryCache.objects.filter(model_name=FakeAIClient.model_name).delete()
@@ -0,0 +1,34 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from api.services.sync_job_service import SyncJobService
+from api.services.summary_cache_service import SummaryCacheService
+
+
+class Command(BaseCommand):
+    help = "Process queued Odoo sync jobs from the database queue"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run queued syncs until the queue is empty, then exit')
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='Seconds to wait when the queue is empty')
+
+    def handle(self, *args, **options):
+        self.stdout.write("Sync worker started")
+        processed = False
+        while True:
+            close_old_connections()
+            sync_job = SyncJobService.run_next()
+            if sync_job:
+                self.stdout.write(f"Sync {sync_job.sync_job_id} {sync_job.status}: {sync_job.message or sync_job.error}")
+                processed = True
+                continue
+            if processed:
+                evicted = SummaryCacheService.evict_expired()
+                stats = SummaryCacheService.stats()
+                self.stdout.write(
+                    f"Summary cache: {stats['hits']} hits, {stats['misses']} misses, {evicted} entries evicted"
+                )
+                processed = False
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
@@ -1 +1,84 @@
 from django.db import models
+from users.models import Recruiter
+
+
+class SyncJob(models.Model):
+    KIND_ALL = 'all'
+    KIND_CANDIDATES_ALL = 'candidates_all'
+    KIND_CANDIDATES_COMPANY = 'candidates_company'
+
+    KIND_CHOICES = [
+        (KIND_ALL, 'Companies, jobs and candidates'),
+        (KIND_CANDIDATES_ALL, 'Candidates for all companies'),
+        (KIND_CANDIDATES_COMPANY, 'Candidates for one company'),
+    ]
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    ACTIVE_STATUSES = [STATUS_QUEUED, STATUS_RUNNING]
+
+    sync_job_id = models.AutoField(primary_key=True)
+    recruiter = models.ForeignKey(Recruiter, on_delete=models.CASCADE, related_name='sync_jobs')
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    stage = models.CharField(max_length=30, blank=True, default='')
+    progress = models.JSONField(default=dict, blank=True)
+    message = models.TextField(blank=True, default='')
+    error = models.TextField(blank=True, default='')
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['recruiter', 'status']),
+        ]
+
+    def __str__(self):
+        return f"Sync {self.sync_job_id} ({self.kind}) - {self.get_status_display()}"
+
+    @property
+    def is_finished(self):
+        return self.status in [self.STATUS_COMPLETED, self.STATUS_FAILED]
+
+
+class AISummaryCache(models.Model):
+    KIND_JOB_SUMMARY = 'job_summary'
+    KIND_SKILL_SUMMARY = 'skill_summary'
+
+    KIND_CHOICES = [
+        (KIND_JOB_SUMMARY, 'Job summary'),
+        (KIND_SKILL_SUMMARY, 'Candidate skill summary'),
+    ]
+
+    cache_key = models.CharField(max_length=64, unique=True)
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    model_name = models.CharField(max_length=100)
+    summary = models.TextField()
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['last_used_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.cache_key[:12]}"
@@ -0,0 +1,19 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class StableCursorPagination(CursorPagination):
+    """
+    Cursor pagination ordered by (created_at, pk). DRF positions the cursor on created_at alone and
+    skips rows sharing the boundary timestamp with a small offset; pk only keeps that order stable.
+    There is no COUNT, and the offset is bounded by rows tied on one timestamp rather than by the
+    page number, so page cost does not grow with the number of rows a recruiter owns.
+    """
+    page_size = getattr(settings, 'API_PAGE_SIZE', 50)
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at', '-pk')
+
+
+class InterviewCursorPagination(StableCursorPagination):
+    ordering = ('-scheduled_at', '-pk')
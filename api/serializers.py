@@ -6,8 +6,10 @@ from candidate.models import Candidate, CandidateAttachment
 from users.models import OdooCredentials, Recruiter
 from companies.models import Company
 from ai_reports.models import AIReport
+from api.models import SyncJob
+from api.fieldsets import SparseFieldsetMixin
 
-class CandidateAttachmentSerializer(serializers.ModelSerializer):
+class CandidateAttachmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     file_url = serializers.SerializerMethodField()
     download_url = serializers.SerializerMethodField()
     preview_url = serializers.SerializerMethodField()
@@ -45,12 +47,12 @@ class CandidateAttachmentSerializer(serializers.ModelSerializer):
         else:
             return "File"
 
-class InterviewConversationSerializer(serializers.ModelSerializer):
+class InterviewConversationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = InterviewConversation
         fields = '__all__'
 
-class InterviewSerializer(serializers.ModelSerializer):
+class InterviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     candidate_name = serializers.CharField(source='candidate.name', read_only=True)
     candidate_email = serializers.CharField(source='candidate.email', read_only=True)
     recruiter_name = serializers.CharField(source='recruiter.get_full_name', read_only=True)
@@ -143,7 +145,7 @@ class InterviewUpdateSerializer(InterviewSerializer):
                     })
         return data
 
-class InterviewListSerializer(serializers.ModelSerializer):
+class InterviewListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     candidate_name = serializers.CharField(source='candidate.name', read_only=True)
     job_title = serializers.CharField(source='job.job_title', read_only=True)
     company_name = serializers.CharField(source='company.company_name', read_only=True)
@@ -201,7 +203,7 @@ class InterviewCompanyChoiceSerializer(serializers.ModelSerializer):
         model = Company
         fields = ['value', 'label']
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     company_name = serializers.CharField(source='company.company_name', read_only=True)
     company_id = serializers.IntegerField(source='company.company_id', read_only=True)
     
@@ -216,6 +218,7 @@ class JobSerializer(serializers.ModelSerializer):
             'job_description', 
             'generated_job_summary', 
             'state', 
+            'is_active',
             'posted_at', 
             'expired_at',  
             'created_at'
@@ -226,7 +229,7 @@ class JobSerializer(serializers.ModelSerializer):
             'generated_job_summary': {'read_only': True},
         }
 
-class CandidateSerializer(serializers.ModelSerializer):
+class CandidateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     job_title = serializers.CharField(source='job.job_title', read_only=True)
     company_name = serializers.CharField(source='job.company.company_name', read_only=True)
 
@@ -234,7 +237,7 @@ class CandidateSerializer(serializers.ModelSerializer):
         model = Candidate
         fields = [
             'candidate_id', 'job', 'job_title', 'company_name', 'odoo_candidate_id',
-            'name', 'email', 'phone', 'generated_skill_summary', 'state',
+            'name', 'email', 'phone', 'generated_skill_summary', 'state', 'is_active',
             'partner_id', 'date_open', 'date_last_stage_update',
             'created_at', 'updated_at'
         ]
@@ -278,7 +281,7 @@ class ResetPasswordSerializer(serializers.Serializer):
             raise serializers.ValidationError("Passwords do not match.")
         return attrs
 
-class OdooCredentialsSerializer(serializers.ModelSerializer):
+class OdooCredentialsSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = OdooCredentials
         fields = ['credentials_id', 'odoo_user_id', 'email_address', 'db_name', 'db_url', 'created_at', 'updated_at']
@@ -292,7 +295,7 @@ class OdooCredentialsSerializer(serializers.ModelSerializer):
         representation.pop('api_key', None)
         return representation
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     recruiter_email = serializers.CharField(source='recruiter.email', read_only=True)
     recruiter_id = serializers.IntegerField(source='recruiter.id', read_only=True)
     class Meta:
@@ -310,7 +313,7 @@ class CompanySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['recruiter', 'created_at', 'updated_at']
 
-class AIReportSerializer(serializers.ModelSerializer):
+class AIReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = AIReport
         fields = '__all__'
@@ -329,4 +332,13 @@ class AIReportCreateSerializer(serializers.ModelSerializer):
             'skills_breakdown',
             'initial_analysis',
             'performance_analysis',
-        ]
\ No newline at end of file
+        ]
+
+class SyncJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SyncJob
+        fields = [
+            'sync_job_id', 'kind', 'params', 'status', 'stage', 'progress',
+            'message', 'error', 'attempts', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,55 @@
+import hashlib
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+
+
+class ResponseCacheService:
+    """
+    Cache-aside for per-recruiter read endpoints. Each cached payload is keyed by the request path
+    and query string plus the current version of every scope it depends on, so invalidating a
+    scope only has to replace its version; stale payloads are never read again and expire by TTL.
+    """
+    SCOPE_COMPANIES = 'companies'
+    SCOPE_ODOO_CREDENTIALS = 'odoo_credentials'
+    SCOPE_COMPANY_JOBS = 'company_jobs'
+    SCOPE_JOB_CANDIDATES = 'job_candidates'
+
+    @staticmethod
+    def get_or_build(request, scopes, build):
+        """Return the cached payload for this request, or build() it and cache it for API_RESPONSE_CACHE_TTL"""
+        ttl = getattr(settings, 'API_RESPONSE_CACHE_TTL', 300)
+        if ttl <= 0:
+            return build()
+        path_digest = hashlib.sha256(request.get_full_path().encode()).hexdigest()[:32]
+        versions = ResponseCacheService._versions(scopes)
+        cache_key = f"api_response:{request.user.pk}:{path_digest}:{'.'.join(versions)}"
+        payload = cache.get(cache_key)
+        if payload is None:
+            payload = build()
+            cache.set(cache_key, payload, ttl)
+        return payload
+
+    @staticmethod
+    def invalidate(scope, ids):
+        """Make every cached payload that depends on scope for any of ids unreachable"""
+        keys = {ResponseCacheService._version_key(scope, scope_id): uuid.uuid4().hex[:12] for scope_id in ids}
+        if keys:
+            cache.set_many(keys, timeout=None)
+
+    @staticmethod
+    def _versions(scopes):
+        keys = [ResponseCacheService._version_key(scope, scope_id) for scope, scope_id in scopes]
+        found = cache.get_many(keys)
+        versions = []
+        for key in keys:
+            if key not in found:
+                version = uuid.uuid4().hex[:12]
+                cache.add(key, version, timeout=None)
+                found[key] = cache.get(key) or version
+            versions.append(found[key])
+        return versions
+
+    @staticmethod
+    def _version_key(scope, scope_id):
+        return f"api_scope:{scope}:{scope_id}"
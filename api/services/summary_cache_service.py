@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+from api.models import AISummaryCache
+
+logger = logging.getLogger(__name__)
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+class SummaryCacheService:
+    @staticmethod
+    def make_key(kind, template_version, model_name, *inputs):
+        """SHA-256 of everything that shapes the prompt, so unchanged inputs map to the same entry"""
+        payload = json.dumps([kind, template_version, model_name, *inputs], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_or_generate(kind, template_version, model_name, inputs, generate):
+        """
+        Return the cached summary for these inputs, or call generate() and store its result.
+        generate() should raise on failure so error messages are never cached.
+        """
+        cache_key = SummaryCacheService.make_key(kind, template_version, model_name, *inputs)
+        cached = SummaryCacheService.lookup([cache_key])
+        if cache_key in cached:
+            return cached[cache_key]
+
+        summary = generate()
+        SummaryCacheService.store(cache_key, kind, model_name, summary)
+        return summary
+
+    @staticmethod
+    def lookup(cache_keys):
+        """Return {cache_key: summary} for the unexpired entries among cache_keys, counting hits and misses"""
+        cache_keys = set(cache_keys)
+        now = timezone.now()
+        entries = dict(
+            AISummaryCache.objects.filter(cache_key__in=cache_keys, expires_at__gt=now).values_list('cache_key', 'summary')
+        )
+        if entries:
+            AISummaryCache.objects.filter(cache_key__in=entries.keys()).update(hit_count=F('hit_count') + 1, last_used_at=now)
+        SummaryCacheService._record('hits', len(entries))
+        SummaryCacheService._record('misses', len(cache_keys) - len(entries))
+        return entries
+
+    @staticmethod
+    def lookup_first(key_groups):
+        """
+        Return {group: summary} for groups of interchangeable cache keys, taking each group's first
+        unexpired entry in order. Counts one hit or miss per group rather than per key.
+        """
+        key_groups = list(dict.fromkeys(key_groups))
+        now = timezone.now()
+        entries = dict(
+            AISummaryCache.objects.filter(
+                cache_key__in={cache_key for group in key_groups for cache_key in group},
+                expires_at__gt=now
+            ).values_list('cache_key', 'summary')
+        )
+        found = {}
+        used_keys = []
+        for group in key_groups:
+            cache_key = next((cache_key for cache_key in group if cache_key in entries), None)
+            if cache_key is not None:
+                found[group] = entries[cache_key]
+                used_keys.append(cache_key)
+        if used_keys:
+            AISummaryCache.objects.filter(cache_key__in=used_keys).update(hit_count=F('hit_count') + 1, last_used_at=now)
+        SummaryCacheService._record('hits', len(found))
+        SummaryCacheService._record('misses', len(key_groups) - len(found))
+        return found
+
+    @staticmethod
+    def store(cache_key, kind, model_name, summary):
+        now = timezone.now()
+        ttl = getattr(settings, 'AI_SUMMARY_CACHE_TTL', 30 * 24 * 60 * 60)
+        try:
+            AISummaryCache.objects.update_or_create(
+                cache_key=cache_key,
+                defaults={
+                    'kind': kind,
+                    'model_name': model_name,
+                    'summary': summary,
+                    'last_used_at': now,
+                    'expires_at': now + timedelta(seconds=ttl),
+                }
+            )
+        except IntegrityError:
+            logger.info(f"Summary cache entry {cache_key[:12]} was stored concurrently")
+
+    @staticmethod
+    def evict_expired():
+        """Delete expired entries, then the least recently used ones above AI_SUMMARY_CACHE_MAX_ENTRIES"""
+        deleted, _ = AISummaryCache.objects.filter(expires_at__lte=timezone.now()).delete()
+
+        max_entries = getattr(settings, 'AI_SUMMARY_CACHE_MAX_ENTRIES', None)
+        if max_entries:
+            stale_ids = list(
+                AISummaryCache.objects.order_by('-last_used_at').values_list('pk', flat=True)[max_entries:]
+            )
+            if stale_ids:
+                trimmed, _ = AISummaryCache.objects.filter(pk__in=stale_ids).delete()
+                deleted += trimmed
+        return deleted
+
+    @staticmethod
+    def stats():
+        """Hit/miss counters for this process"""
+        with _stats_lock:
+            return dict(_stats)
+
+    @staticmethod
+    def reset_stats():
+        with _stats_lock:
+            for key in _stats:
+                _stats[key] = 0
+
+    @staticmethod
+    def _record(counter, count=1):
+        with _stats_lock:
+            _stats[counter] += count
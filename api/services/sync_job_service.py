@@ -0,0 +1,231 @@
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from api.models import SyncJob
+from candidate.models import Candidate, CandidateAttachment
+from companies.models import Company
+from job.models import Job
+from companies.services.company_sync_service import CompanySyncService
+from job.services.job_sync_service import JobSyncService
+from candidate.services.candidate_sync_service import CandidateSyncService
+from recos.concurrency import run_concurrently
+
+logger = logging.getLogger(__name__)
+
+_progress_lock = threading.Lock()
+
+
+class SyncJobService:
+    STAGES = ['companies', 'jobs', 'candidates', 'attachments', 'summaries']
+
+    @staticmethod
+    def enqueue(recruiter, kind, **params):
+        """Queue a sync for the recruiter, reusing an identical sync that is already queued or running"""
+        existing = SyncJob.objects.filter(
+            recruiter=recruiter,
+            kind=kind,
+            params=params,
+            status__in=SyncJob.ACTIVE_STATUSES
+        ).first()
+        if existing:
+            return existing, False
+        sync_job = SyncJob.objects.create(
+            recruiter=recruiter,
+            kind=kind,
+            params=params,
+            progress={stage: 0 for stage in SyncJobService.STAGES}
+        )
+        return sync_job, True
+
+    @staticmethod
+    def claim_next():
+        """
+        Atomically take the oldest queued sync (or one abandoned by a dead worker) and mark it running.
+        Abandoned syncs that already ran SYNC_JOB_MAX_ATTEMPTS times are marked failed instead, so a
+        sync that keeps killing its worker is not picked up forever.
+        """
+        stale_after = getattr(settings, 'SYNC_JOB_STALE_AFTER', 60 * 60)
+        max_attempts = getattr(settings, 'SYNC_JOB_MAX_ATTEMPTS', 3)
+        now = timezone.now()
+        stale_before = now - timedelta(seconds=stale_after)
+        with transaction.atomic():
+            sync_job = (
+                SyncJob.objects.select_for_update(skip_locked=True)
+                .filter(status=SyncJob.STATUS_QUEUED)
+                .order_by('created_at')
+                .first()
+            )
+            if not sync_job:
+                stale = SyncJob.objects.filter(status=SyncJob.STATUS_RUNNING, updated_at__lt=stale_before)
+                stale.filter(attempts__gte=max_attempts).update(
+                    status=SyncJob.STATUS_FAILED,
+                    error=f'Sync was abandoned {max_attempts} times by its worker',
+                    finished_at=now,
+                    updated_at=now
+                )
+                sync_job = stale.select_for_update(skip_locked=True).order_by('created_at').first()
+            if not sync_job:
+                return None
+            sync_job.status = SyncJob.STATUS_RUNNING
+            sync_job.started_at = timezone.now()
+            sync_job.attempts += 1
+            sync_job.error = ''
+            sync_job.save(update_fields=['status', 'started_at', 'attempts', 'error', 'updated_at'])
+            return sync_job
+
+    @staticmethod
+    def run_next():
+        """Claim and run one queued sync. Returns the sync that ran, or None if the queue was empty"""
+        sync_job = SyncJobService.claim_next()
+        if sync_job:
+            SyncJobService.run(sync_job)
+        return sync_job
+
+    @staticmethod
+    def run(sync_job):
+        runners = {
+            SyncJob.KIND_ALL: SyncJobService._run_all,
+            SyncJob.KIND_CANDIDATES_ALL: SyncJobService._run_candidates_all,
+            SyncJob.KIND_CANDIDATES_COMPANY: SyncJobService._run_candidates_company,
+        }
+        try:
+            runner = runners.get(sync_job.kind)
+            if not runner:
+                raise ValueError(f"Unknown sync kind: {sync_job.kind}")
+            with SyncJobService._keep_alive(sync_job):
+                sync_job.message = runner(sync_job)
+            SyncJobService._record_ingestion(sync_job)
+            sync_job.status = SyncJob.STATUS_COMPLETED
+            sync_job.stage = ''
+        except Exception as e:
+            logger.error(f"Sync job {sync_job.sync_job_id} failed: {str(e)}")
+            SyncJobService._record_ingestion(sync_job)
+            sync_job.status = SyncJob.STATUS_FAILED
+            sync_job.error = str(e)
+        sync_job.finished_at = timezone.now()
+        sync_job.save()
+        return sync_job
+
+    @staticmethod
+    def heartbeat(sync_job):
+        """Mark a running sync as alive so claim_next does not hand it to another worker as abandoned"""
+        SyncJob.objects.filter(pk=sync_job.pk, status=SyncJob.STATUS_RUNNING).update(updated_at=timezone.now())
+
+    @staticmethod
+    @contextmanager
+    def _keep_alive(sync_job):
+        """Send a heartbeat every SYNC_JOB_HEARTBEAT_INTERVAL seconds from a background thread while the sync runs"""
+        interval = getattr(settings, 'SYNC_JOB_HEARTBEAT_INTERVAL', 60)
+        stopped = threading.Event()
+
+        def beat():
+            try:
+                while not stopped.wait(interval):
+                    try:
+                        SyncJobService.heartbeat(sync_job)
+                    except Exception as e:
+                        logger.warning(f"Heartbeat for sync job {sync_job.sync_job_id} failed: {str(e)}")
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=beat, name=f'recos-sync-heartbeat-{sync_job.pk}', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+    @staticmethod
+    def _update_progress(sync_job, stage=None, **counts):
+        # Safe to call from concurrent sync tasks, which report counts as they finish.
+        with _progress_lock:
+            for key, value in counts.items():
+                sync_job.progress[key] = sync_job.progress.get(key, 0) + value
+            if stage is not None:
+                sync_job.stage = stage
+            SyncJob.objects.filter(pk=sync_job.pk).update(
+                progress=dict(sync_job.progress),
+                stage=sync_job.stage,
+                updated_at=timezone.now()
+            )
+
+    @staticmethod
+    def _summary_reporter(sync_job):
+        """Callback for the candidate sync that adds regenerated skill summaries to progress"""
+        def report(regenerated):
+            if regenerated:
+                SyncJobService._update_progress(sync_job, summaries=regenerated)
+        return report
+
+    @staticmethod
+    def _record_ingestion(sync_job):
+        """
+        Attachments stored since the sync started, read back from the database. Regenerated skill
+        summaries are counted by the candidate sync itself, through _summary_reporter.
+        """
+        started_at = sync_job.started_at or sync_job.created_at
+        candidates = Candidate.objects.filter(job__company__recruiter=sync_job.recruiter)
+        params = sync_job.params or {}
+        if params.get('company_id'):
+            candidates = candidates.filter(job__company_id=params['company_id'])
+        sync_job.progress['attachments'] = CandidateAttachment.objects.filter(
+            candidate__in=candidates,
+            created_at__gte=started_at
+        ).count()
+
+    @staticmethod
+    def _run_all(sync_job):
+        recruiter = sync_job.recruiter
+        SyncJobService._update_progress(sync_job, stage='companies')
+        synced_companies = CompanySyncService.sync_recruiter_companies(recruiter)
+        SyncJobService._update_progress(sync_job, stage='jobs', companies=len(synced_companies))
+
+        synced_jobs = JobSyncService.sync_jobs_for_user(recruiter)
+        SyncJobService._update_progress(sync_job, stage='candidates', jobs=len(synced_jobs))
+
+        # Jobs created locally have no Odoo job to fetch applicants from.
+        jobs = list(
+            Job.objects.filter(company__in=synced_companies, odoo_job_id__isnull=False)
+            .select_related('company__recruiter')
+        )
+        report_summaries = SyncJobService._summary_reporter(sync_job)
+        candidate_results = run_concurrently(
+            lambda job: CandidateSyncService.sync_candidates_for_job(job, on_summaries=report_summaries),
+            jobs
+        )
+        for job, synced_candidates, error in candidate_results:
+            if error:
+                raise Exception(f'Failed to sync candidates for job {job.job_title}: {str(error)}')
+        total_candidates = sum(len(synced_candidates) for job, synced_candidates, error in candidate_results)
+        SyncJobService._update_progress(sync_job, candidates=total_candidates)
+
+        return f'Successfully synced {len(synced_companies)} companies and {total_candidates} candidates'
+
+    @staticmethod
+    def _run_candidates_all(sync_job):
+        SyncJobService._update_progress(sync_job, stage='candidates')
+        total_synced = CandidateSyncService.sync_all_candidates_for_recruiter(
+            sync_job.recruiter,
+            on_summaries=SyncJobService._summary_reporter(sync_job)
+        )
+        SyncJobService._update_progress(sync_job, candidates=total_synced)
+        return f'Successfully synced {total_synced} candidates across all companies'
+
+    @staticmethod
+    def _run_candidates_company(sync_job):
+        company = Company.objects.get(
+            company_id=sync_job.params.get('company_id'),
+            recruiter=sync_job.recruiter
+        )
+        SyncJobService._update_progress(sync_job, stage='candidates')
+        synced_count = CandidateSyncService.sync_candidates_for_company(
+            company,
+            on_summaries=SyncJobService._summary_reporter(sync_job)
+        )
+        SyncJobService._update_progress(sync_job, candidates=synced_count)
+        return f'Successfully synced {synced_count} candidates for {company.company_name}'
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from users.models import OdooCredentials
+from companies.models import Company
+from job.models import Job
+from candidate.models import Candidate
+from api.services.response_cache_service import ResponseCacheService
+
+# Single-row writes (admin, API CRUD) invalidate here; the sync services write in bulk, which
+# sends no signals, so they invalidate explicitly.
+
+
+@receiver([post_save, post_delete], sender=Company)
+def invalidate_company_responses(sender, instance, **kwargs):
+    ResponseCacheService.invalidate(ResponseCacheService.SCOPE_COMPANIES, [instance.recruiter_id])
+    ResponseCacheService.invalidate(ResponseCacheService.SCOPE_COMPANY_JOBS, [instance.company_id])
+
+
+@receiver([post_save, post_delete], sender=OdooCredentials)
+def invalidate_credentials_responses(sender, instance, **kwargs):
+    ResponseCacheService.invalidate(ResponseCacheService.SCOPE_ODOO_CREDENTIALS, [instance.recruiter_id])
+
+
+@receiver([post_save, post_delete], sender=Job)
+def invalidate_job_responses(sender, instance, **kwargs):
+    ResponseCacheService.invalidate(ResponseCacheService.SCOPE_COMPANY_JOBS, [instance.company_id])
+    ResponseCacheService.invalidate(ResponseCacheService.SCOPE_JOB_CANDIDATES, [instance.job_id])
+
+
+@receiver([post_save, post_delete], sender=Candidate)
+def invalidate_candidate_responses(sender, instance, **kwargs):
+    ResponseCacheService.invalidate(ResponseCacheService.SCOPE_JOB_CANDIDATES, [instance.job_id])
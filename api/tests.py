@@ -1,4 +1,38 @@
-from django.test import SimpleTestCase
+import hashlib
+import io
+import json
+import re
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import skipUnless
+from unittest.mock import MagicMock, patch
+from PIL import Image
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from users.models import Recruiter, OdooCredentials
+from companies.models import Company
+from job.models import Job
+from candidate.models import Candidate, CandidateAttachment
+from interview.models import Interview
+from api.models import SyncJob, AISummaryCache
+from api.services.sync_job_service import SyncJobService
+from api.services.summary_cache_service import SummaryCacheService
+from google.genai import errors as genai_errors
+from job.services.ai_service import (
+    JOB_SUMMARY_PACKED_PROMPT_VERSION, generate_job_summary, generate_job_summaries, _rate_limit_backoff
+)
+from recos.ai_providers import FakeAIClient, get_ai_client
+from recos.concurrency import iter_concurrently, run_concurrently
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
 
 class MockJob:
     def __init__(self, job_title, job_description, generated_job_summary, expired_at):
@@ -173,4 +207,635 @@ class AIReportAPITestCase(SimpleTestCase):
             performance_analysis={"Attention": "High"}
         )
         invalid_score = 150.0
-        self.assertTrue(invalid_score > 100.0)
\ No newline at end of file
+        self.assertTrue(invalid_score > 100.0)
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SyncJobQueueTests(TestCase):
+    def setUp(self):
+        self.recruiter = Recruiter.objects.create_user(
+            email='queue@example.com',
+            first_name='Queue',
+            last_name='Tester',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter)
+
+    def test_sync_all_candidates_is_queued(self):
+        response = self.client.post('/api/sync/candidates/all/')
+        self.assertEqual(response.status_code, 202)
+        sync_job = SyncJob.objects.get(sync_job_id=response.data['sync_job_id'])
+        self.assertEqual(sync_job.status, SyncJob.STATUS_QUEUED)
+        self.assertEqual(sync_job.kind, SyncJob.KIND_CANDIDATES_ALL)
+
+        repeat = self.client.post('/api/sync/candidates/all/')
+        self.assertEqual(repeat.data['sync_job_id'], sync_job.sync_job_id)
+
+    @patch('api.services.sync_job_service.CandidateSyncService.sync_all_candidates_for_recruiter')
+    def test_worker_runs_queued_sync_and_reports_progress(self, mock_sync):
+        def sync(recruiter, on_summaries):
+            on_summaries(2)
+            on_summaries(0)
+            return 4
+        mock_sync.side_effect = sync
+        sync_job, created = SyncJobService.enqueue(self.recruiter, SyncJob.KIND_CANDIDATES_ALL)
+
+        SyncJobService.run_next()
+
+        response = self.client.get(f'/api/sync/status/{sync_job.sync_job_id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], SyncJob.STATUS_COMPLETED)
+        self.assertEqual(response.data['progress']['candidates'], 4)
+        self.assertEqual(response.data['progress']['summaries'], 2)
+        self.assertIsNone(SyncJobService.run_next())
+
+    @patch('api.services.sync_job_service.CandidateSyncService.sync_all_candidates_for_recruiter', side_effect=Exception('Odoo down'))
+    def test_failed_sync_records_error(self, mock_sync):
+        sync_job, created = SyncJobService.enqueue(self.recruiter, SyncJob.KIND_CANDIDATES_ALL)
+
+        SyncJobService.run_next()
+
+        sync_job.refresh_from_db()
+        self.assertEqual(sync_job.status, SyncJob.STATUS_FAILED)
+        self.assertEqual(sync_job.error, 'Odoo down')
+
+    @override_settings(SYNC_JOB_HEARTBEAT_INTERVAL=0.01)
+    @patch('api.services.sync_job_service.SyncJobService.heartbeat')
+    @patch('api.services.sync_job_service.CandidateSyncService.sync_all_candidates_for_recruiter')
+    def test_long_running_sync_sends_heartbeats(self, mock_sync, mock_heartbeat):
+        mock_sync.side_effect = lambda recruiter, on_summaries: threading.Event().wait(0.1) and 0
+        SyncJobService.enqueue(self.recruiter, SyncJob.KIND_CANDIDATES_ALL)
+
+        SyncJobService.run_next()
+
+        self.assertGreater(mock_heartbeat.call_count, 1)
+
+    @override_settings(SYNC_JOB_STALE_AFTER=60)
+    def test_heartbeat_keeps_a_running_sync_from_being_reclaimed(self):
+        sync_job, created = SyncJobService.enqueue(self.recruiter, SyncJob.KIND_CANDIDATES_ALL)
+        self.assertEqual(SyncJobService.claim_next().pk, sync_job.pk)
+        SyncJob.objects.filter(pk=sync_job.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+
+        SyncJobService.heartbeat(sync_job)
+
+        self.assertIsNone(SyncJobService.claim_next())
+
+    @override_settings(SYNC_JOB_STALE_AFTER=60, SYNC_JOB_MAX_ATTEMPTS=2)
+    def test_sync_abandoned_too_often_is_failed_instead_of_reclaimed(self):
+        sync_job, created = SyncJobService.enqueue(self.recruiter, SyncJob.KIND_CANDIDATES_ALL)
+        for attempt in range(2):
+            self.assertEqual(SyncJobService.claim_next().pk, sync_job.pk)
+            SyncJob.objects.filter(pk=sync_job.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+
+        self.assertIsNone(SyncJobService.claim_next())
+        sync_job.refresh_from_db()
+        self.assertEqual((sync_job.status, sync_job.attempts), (SyncJob.STATUS_FAILED, 2))
+        self.assertIn('abandoned', sync_job.error)
+
+
+class RunConcurrentlyTests(SimpleTestCase):
+    def test_results_keep_input_order_and_capture_errors(self):
+        def double(value):
+            if value == 3:
+                raise ValueError('bad value')
+            return value * 2
+
+        results = run_concurrently(double, [1, 2, 3, 4], max_workers=2)
+
+        self.assertEqual([item for item, result, error in results], [1, 2, 3, 4])
+        self.assertEqual([result for item, result, error in results], [2, 4, None, 8])
+        self.assertIsInstance(results[2][2], ValueError)
+
+    def test_items_run_in_parallel_up_to_the_bound(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        results = run_concurrently(lambda item: barrier.wait() >= 0, ['a', 'b', 'c'], max_workers=3)
+
+        self.assertTrue(all(result for item, result, error in results))
+
+    def test_iter_yields_results_as_they_finish_within_the_bound(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def fetch(item):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            threading.Event().wait(0.01)
+            with lock:
+                state['running'] -= 1
+            return item * 10
+
+        results = list(iter_concurrently(fetch, range(12), max_workers=3))
+
+        self.assertEqual(sorted(result for item, result, error in results), [item * 10 for item in range(12)])
+        self.assertLessEqual(state['peak'], 3)
+
+
+class SummaryCacheTests(TestCase):
+    def setUp(self):
+        SummaryCacheService.reset_stats()
+
+    @patch('job.services.ai_service.get_genai_client')
+    def test_unchanged_description_is_served_from_cache(self, mock_client):
+        client = MagicMock()
+        client.models.generate_content.return_value.text = '{"job_summary": "Builds APIs"}'
+        mock_client.return_value = client
+        description = 'Backend engineer building REST APIs'
+
+        self.assertEqual(generate_job_summary(description), 'Builds APIs')
+        self.assertEqual(generate_job_summary(description), 'Builds APIs')
+        generate_job_summary(description + ' and workers')
+
+        self.assertEqual(client.models.generate_content.call_count, 2)
+        self.assertEqual(SummaryCacheService.stats(), {'hits': 1, 'misses': 2})
+        self.assertEqual(AISummaryCache.objects.get(hit_count=1).kind, AISummaryCache.KIND_JOB_SUMMARY)
+
+    @patch('job.services.ai_service.get_genai_client')
+    def test_failed_generation_is_not_cached(self, mock_client):
+        client = MagicMock()
+        client.models.generate_content.return_value.text = 'not json'
+        mock_client.return_value = client
+
+        summary = generate_job_summary('Backend engineer building REST APIs')
+
+        self.assertEqual(summary, '')
+        self.assertFalse(AISummaryCache.objects.exists())
+
+    @override_settings(AI_SUMMARY_CACHE_MAX_ENTRIES=1)
+    def test_evict_expired_drops_expired_and_least_recently_used(self):
+        now = timezone.now()
+        for cache_key, expires_at in [('expired', now - timedelta(days=1)), ('old', now + timedelta(days=1)),
+                                      ('recent', now + timedelta(days=1))]:
+            AISummaryCache.objects.create(
+                cache_key=cache_key,
+                kind=AISummaryCache.KIND_JOB_SUMMARY,
+                model_name='model',
+                summary='summary',
+                expires_at=expires_at
+            )
+        AISummaryCache.objects.filter(cache_key='old').update(last_used_at=now - timedelta(days=2))
+
+        self.assertEqual(SummaryCacheService.evict_expired(), 2)
+        self.assertEqual(list(AISummaryCache.objects.values_list('cache_key', flat=True)), ['recent'])
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+class JobSummaryBatchTests(TestCase):
+    def setUp(self):
+        SummaryCacheService.reset_stats()
+        self.lock = threading.Lock()
+        self.state = {'active': 0, 'peak': 0}
+        self.client = MagicMock()
+        self.client.models.generate_content.side_effect = self._generate
+        patcher = patch('job.services.ai_service.get_genai_client', return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _generate(self, model, contents, config):
+        with self.lock:
+            self.state['active'] += 1
+            self.state['peak'] = max(self.state['peak'], self.state['active'])
+        try:
+            threading.Event().wait(0.02)
+            jobs = re.findall(r'Job (\d+):\n(.*)', contents)
+            if jobs:
+                text = json.dumps({'summaries': [{'id': int(index), 'job_summary': f'{body} summary'} for index, body in jobs]})
+            else:
+                body = contents.split('Job Description:')[1].split('Return the response')[0].strip()
+                text = json.dumps({'job_summary': f'{body} summary'})
+            return MagicMock(text=text)
+        finally:
+            with self.lock:
+                self.state['active'] -= 1
+
+    @override_settings(AI_SUMMARY_PACK_SIZE=3)
+    def test_descriptions_are_packed_and_cached(self):
+        descriptions = [f'Engineer number {index}' for index in range(7)]
+        generate_job_summary(descriptions[0])
+
+        summaries = generate_job_summaries(descriptions + ['short'])
+
+        self.assertEqual(summaries['short'], '')
+        self.assertEqual([summaries[description] for description in descriptions], [f'{d} summary' for d in descriptions])
+        self.assertEqual(self.client.models.generate_content.call_count, 3)
+        self.assertEqual(SummaryCacheService.stats(), {'hits': 1, 'misses': 7})
+        self.assertEqual(AISummaryCache.objects.count(), 7)
+
+    @override_settings(AI_SUMMARY_PACK_SIZE=1, AI_SUMMARY_CONCURRENCY=3)
+    def test_requests_run_concurrently_within_the_limit(self):
+        summaries = generate_job_summaries([f'Designer number {index}' for index in range(9)])
+
+        self.assertEqual(len(summaries), 9)
+        self.assertGreater(self.state['peak'], 1)
+        self.assertLessEqual(self.state['peak'], 3)
+
+    @override_settings(AI_SUMMARY_PACK_SIZE=2)
+    def test_descriptions_missing_from_a_packed_answer_are_requested_alone(self):
+        self.client.models.generate_content.side_effect = [
+            MagicMock(text=json.dumps({'summaries': [{'id': 1, 'job_summary': 'second summary'}]})),
+            MagicMock(text=json.dumps({'job_summary': 'first summary'})),
+        ]
+
+        summaries = generate_job_summaries(['First job description', 'Second job description'])
+
+        self.assertEqual(summaries, {'First job description': 'first summary', 'Second job description': 'second summary'})
+
+    @override_settings(AI_SUMMARY_PACK_SIZE=2)
+    def test_packed_answers_are_cached_under_their_own_prompt_version(self):
+        descriptions = ['First job description', 'Second job description']
+        generate_job_summaries(descriptions)
+
+        packed_keys = {
+            SummaryCacheService.make_key(
+                AISummaryCache.KIND_JOB_SUMMARY, f"packed-{JOB_SUMMARY_PACKED_PROMPT_VERSION}", 'gemini-2.0-flash', description
+            )
+            for description in descriptions
+        }
+        self.assertEqual(set(AISummaryCache.objects.values_list('cache_key', flat=True)), packed_keys)
+        self.assertEqual(generate_job_summary(descriptions[0]), 'First job description summary')
+        self.assertEqual(self.client.models.generate_content.call_count, 1)
+
+    @patch('recos.concurrency.time.sleep')
+    def test_rate_limited_requests_back_off_and_retry(self, mock_sleep):
+        self.addCleanup(setattr, _rate_limit_backoff, 'retry_at', 0)
+        self.client.models.generate_content.side_effect = [
+            genai_errors.APIError(429, {'error': {'code': 429, 'message': 'Quota exceeded', 'status': 'RESOURCE_EXHAUSTED'}}),
+            MagicMock(text=json.dumps({'job_summary': 'Builds APIs'})),
+        ]
+
+        self.assertEqual(generate_job_summary('Backend engineer building REST APIs'), 'Builds APIs')
+        mock_sleep.assert_called_once()
+        self.assertEqual(_rate_limit_backoff.failures, 0)
+
+
+class FakeAIProviderTests(TestCase):
+    def test_answers_are_deterministic_and_match_the_requested_schema(self):
+        client = FakeAIClient()
+        packed = client.models.generate_content(model='any', contents='Job 0:\nA\n\nJob 1:\nB "summaries"')
+
+        self.assertEqual([item['id'] for item in json.loads(packed.text)['summaries']], [0, 1])
+        self.assertEqual(
+            client.models.generate_content(model='any', contents='"job_summary" prompt').text,
+            FakeAIClient().models.generate_content(model='any', contents='"job_summary" prompt').text
+        )
+
+    def test_injected_errors_look_like_rate_limits(self):
+        client = FakeAIClient(error_rate=1.0)
+        with self.assertRaises(genai_errors.APIError) as context:
+            client.models.generate_content(model='any', contents='"job_summary"')
+        self.assertEqual((context.exception.code, client.failures), (429, 1))
+
+    @override_settings(AI_PROVIDER='fake')
+    def test_fake_provider_summaries_are_cached_under_their_own_model(self):
+        self.assertIsInstance(get_ai_client(), FakeAIClient)
+
+        summary = generate_job_summary('Backend engineer building REST APIs')
+
+        self.assertTrue(summary.startswith('Summary '))
+        self.assertEqual(AISummaryCache.objects.get().model_name, FakeAIClient.model_name)
+
+
+@override_settings(ODOO_API_ENCRYPTION_KEY='this_is_a_test_key_for_encryption_32bytes')
+class BenchmarkSyncCommandTests(TestCase):
+    def test_full_sync_against_fakes_reports_stages_and_cleans_up(self):
+        out = io.StringIO()
+
+        call_command(
+            'benchmark_sync', companies=1, jobs=2, candidates=2, odoo_latency=0, ai_latency=0, stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn('Sync completed', output)
+        self.assertIn('1 companies, 2 jobs, 4 candidates, 4 attachments', output)
+        self.assertRegex(output, r'skill summaries\s+2\s')
+        self.assertFalse(Recruiter.objects.exists())
+        self.assertFalse(AISummaryCache.objects.exists())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, CACHES=LOCMEM_CACHES)
+class AttachmentDownloadTests(TestCase):
+    content = b'%PDF-1.4 ' + bytes(range(256)) * 4
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        recruiter = Recruiter.objects.create_user(
+            email='download@example.com',
+            first_name='Down',
+            last_name='Loader',
+            password='testpass123'
+        )
+        company = Company.objects.create(company_name='Download Co', recruiter=recruiter)
+        job = Job.objects.create(company=company, job_title='Designer', job_description='Pixels', posted_at=timezone.now())
+        candidate = Candidate.objects.create(job=job, odoo_candidate_id=41, name='Viewer', email='viewer@example.com')
+        self.attachment = CandidateAttachment(
+            candidate=candidate,
+            odoo_attachment_id=401,
+            name='cv.pdf',
+            original_filename='cv.pdf',
+            file_type='application/pdf',
+            checksum=hashlib.sha256(self.content).hexdigest()
+        )
+        self.attachment.file.save('cv.pdf', ContentFile(self.content))
+        self.url = f'/api/candidates/{candidate.candidate_id}/attachments/download/{self.attachment.attachment_id}/'
+        self.client = APIClient()
+        self.client.force_authenticate(user=recruiter)
+
+    def test_full_download_carries_validators(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['ETag'], f'"{self.attachment.checksum}"')
+        self.assertEqual(response['Content-Length'], str(len(self.content)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('Last-Modified', response)
+
+    def test_matching_etag_returns_not_modified(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{self.attachment.checksum}"')
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], f'"{self.attachment.checksum}"')
+
+    def test_range_request_returns_partial_content(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=9-18')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.content[9:19])
+        self.assertEqual(response['Content-Range'], f'bytes 9-18/{len(self.content)}')
+
+        suffix = self.client.get(self.url, HTTP_RANGE='bytes=-4')
+        self.assertEqual(b''.join(suffix.streaming_content), self.content[-4:])
+
+        stale = self.client.get(self.url, HTTP_RANGE='bytes=9-18', HTTP_IF_RANGE='"old"')
+        self.assertEqual(stale.status_code, 200)
+
+        beyond = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(beyond.status_code, 416)
+
+    @override_settings(ATTACHMENT_SENDFILE_HEADER='X-Accel-Redirect', ATTACHMENT_ACCEL_REDIRECT_PREFIX='/protected/')
+    def test_offloaded_download_has_no_body(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected/{self.attachment.file.name}')
+
+    def test_preview_is_served_inline_with_long_cache(self):
+        image = io.BytesIO()
+        Image.new('RGB', (900, 600), 'white').save(image, 'PNG')
+        photo = CandidateAttachment(
+            candidate=self.attachment.candidate,
+            odoo_attachment_id=402,
+            name='photo.png',
+            file_type='image/png',
+            checksum=hashlib.sha256(image.getvalue()).hexdigest()
+        )
+        photo.file.save('photo.png', ContentFile(image.getvalue()))
+        url = f'/api/candidate-attachments/{photo.attachment_id}/preview/'
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertTrue(response['Content-Disposition'].startswith('inline'))
+        self.assertIn('max-age=', response['Cache-Control'])
+        self.assertLess(int(response['Content-Length']), len(image.getvalue()))
+
+        revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class QueryBudgetTests(TestCase):
+    """List endpoints must run a fixed number of queries however many rows they return."""
+    BUDGETS = {
+        'candidates': 1,
+        'jobs': 1,
+        'interviews': 1,
+        'companies': 1,
+        'jobs_by_company': 2,
+        'candidates_by_job': 2,
+        'candidate_attachments': 2,
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.recruiter = Recruiter.objects.create_user(
+            email='budget@example.com',
+            first_name='Query',
+            last_name='Budget',
+            password='testpass123'
+        )
+        self.company = Company.objects.create(company_name='Budget Co', recruiter=self.recruiter)
+        self.job = Job.objects.create(company=self.company, job_title='Analyst', job_description='Numbers', posted_at=timezone.now())
+        self.candidate = Candidate.objects.create(job=self.job, odoo_candidate_id=60, name='Counted', email='counted@example.com')
+        self.urls = {
+            'candidates': '/api/candidates/',
+            'jobs': '/api/jobs/',
+            'interviews': '/api/interview/',
+            'companies': '/api/companies/',
+            'jobs_by_company': f'/api/companies/{self.company.company_id}/jobs/',
+            'candidates_by_job': f'/api/jobs/{self.job.job_id}/candidates/',
+            'candidate_attachments': f'/api/candidates/{self.candidate.candidate_id}/attachments/',
+        }
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.recruiter)
+        self.rows = 0
+
+    def _add_rows(self, count):
+        for _ in range(count):
+            self.rows += 1
+            Company.objects.create(company_name=f'Budget Co {self.rows}', recruiter=self.recruiter)
+            Job.objects.create(company=self.company, job_title=f'Job {self.rows}', job_description='', posted_at=timezone.now())
+            candidate = Candidate.objects.create(
+                job=self.job, odoo_candidate_id=600 + self.rows, name=f'Candidate {self.rows}', email=f'c{self.rows}@example.com'
+            )
+            CandidateAttachment.objects.create(
+                candidate=self.candidate, odoo_attachment_id=600 + self.rows, name=f'cv{self.rows}.pdf', file_type='application/pdf'
+            )
+            Interview.objects.create(
+                candidate=candidate, recruiter=self.recruiter, title='Screening',
+                scheduled_at=timezone.now() + timedelta(days=1)
+            )
+
+    def _query_counts(self):
+        counts = {}
+        for name, url in self.urls.items():
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, name)
+            counts[name] = [query['sql'] for query in context.captured_queries]
+        return counts
+
+    def test_list_endpoints_stay_within_query_budget(self):
+        self._add_rows(1)
+        few = self._query_counts()
+        self._add_rows(10)
+        many = self._query_counts()
+
+        for name, budget in self.BUDGETS.items():
+            with self.subTest(endpoint=name):
+                self.assertEqual(len(many[name]), len(few[name]), '\n'.join(many[name]))
+                self.assertLessEqual(len(many[name]), budget, '\n'.join(many[name]))
+
+    def test_cursor_pages_cover_every_row_once(self):
+        self._add_rows(7)
+        seen = []
+        url = f'{self.urls["candidates_by_job"]}?page_size=3'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 3)
+            seen.extend(row['candidate_id'] for row in response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(len(seen), 8)
+        self.assertEqual(sorted(seen), sorted(set(seen)))
+
+    @patch('api.views.CandidateSyncService.sync_candidates_for_job')
+    def test_sync_response_is_a_summary_with_list_link(self, mock_sync):
+        mock_sync.return_value = [self.candidate] * 300
+
+        response = self.client.post(f'/api/sync/candidates/job/{self.job.job_id}/')
+
+        self.assertEqual(response.data['synced_count'], 300)
+        self.assertNotIn('candidates', response.data)
+        self.assertTrue(response.data['candidates_url'].endswith(self.urls['candidates_by_job']))
+
+    def test_sparse_fieldsets_skip_unrequested_columns(self):
+        self._add_rows(3)
+        Candidate.objects.update(generated_skill_summary='x' * 5000)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/candidates/?fields=candidate_id,name,state')
+        self.assertEqual(set(response.data['results'][0]), {'candidate_id', 'name', 'state'})
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn('generated_skill_summary', context.captured_queries[0]['sql'])
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'{self.urls["candidates_by_job"]}?exclude=generated_skill_summary')
+        row = response.data['results'][0]
+        self.assertNotIn('generated_skill_summary', row)
+        self.assertEqual((row['job_title'], row['company_name']), ('Analyst', 'Budget Co'))
+        self.assertEqual(len(context.captured_queries), self.BUDGETS['candidates_by_job'])
+        self.assertNotIn('generated_skill_summary', context.captured_queries[-1]['sql'])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = Recruiter.objects.create_user(
+            email='cached@example.com',
+            first_name='Cache',
+            last_name='Aside',
+            password='testpass123'
+        )
+        self.company = Company.objects.create(company_name='Cached Co', recruiter=self.recruiter)
+        self.job = Job.objects.create(company=self.company, odoo_job_id=70, job_title='Analyst', job_description='', posted_at=timezone.now())
+        self.candidate = Candidate.objects.create(job=self.job, odoo_candidate_id=71, name='First', email='first@example.com')
+        self.url = f'/api/jobs/{self.job.job_id}/candidates/'
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.recruiter)
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+
+    def test_repeated_read_is_served_from_cache(self):
+        first, first_queries = self._get(self.url)
+        second, second_queries = self._get(self.url)
+
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second_queries, 1)
+        self.assertLess(second_queries, first_queries)
+
+    def test_saving_a_candidate_invalidates_its_job(self):
+        self._get(self.url)
+        Candidate.objects.create(job=self.job, odoo_candidate_id=72, name='Second', email='second@example.com')
+
+        response, _ = self._get(self.url)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_sync_bulk_writes_invalidate_cached_lists(self):
+        from candidate.services.candidate_sync_service import CandidateSyncService
+        self._get(self.url)
+        CandidateSyncService._archive_missing_candidates([], Candidate.objects.filter(job=self.job))
+
+        response, _ = self._get(self.url)
+        self.assertEqual(response.data['results'][0]['is_active'], False)
+
+    def test_cache_is_per_recruiter(self):
+        other = Recruiter.objects.create_user(
+            email='other@example.com', first_name='Other', last_name='Recruiter', password='testpass123'
+        )
+        self._get('/api/companies/')
+        self.client.force_authenticate(user=other)
+
+        response, _ = self._get('/api/companies/')
+        self.assertEqual(response.data, [])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN plans are only checked on PostgreSQL')
+class IndexUsageTests(TestCase):
+    """
+    Hot sync and list lookups must be answerable from an index. Sequential scans are disabled so
+    the planner picks an index whenever one fits, since on tiny test tables it would scan anyway.
+    """
+
+    @override_settings(ODOO_API_ENCRYPTION_KEY='this_is_a_test_key_for_encryption_32bytes')
+    def setUp(self):
+        self.recruiter = Recruiter.objects.create_user(
+            email='explain@example.com',
+            first_name='Ex',
+            last_name='Plain',
+            password='testpass123'
+        )
+        OdooCredentials.objects.create(
+            odoo_user_id=1, recruiter=self.recruiter, api_key='key', email_address='odoo@example.com',
+            db_name='explain_db', db_url='https://explain.odoo.com'
+        )
+        self.company = Company.objects.create(company_name='Explain Co', recruiter=self.recruiter, odoo_company_id=3)
+        self.job = Job.objects.create(
+            company=self.company, odoo_job_id=7, job_title='Analyst', job_description='', posted_at=timezone.now()
+        )
+        self.candidate = Candidate.objects.create(job=self.job, odoo_candidate_id=9, name='Planned', email='p@example.com')
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+        self.assertNotIn('Seq Scan', plan, plan)
+
+    def test_sync_lookups_use_indexes(self):
+        self.assertUsesIndex(
+            Company.objects.filter(recruiter=self.recruiter, odoo_company_id=3), 'company_recruiter_odoo_id_idx'
+        )
+        self.assertUsesIndex(Job.objects.filter(company=self.company, odoo_job_id=7), 'job_company_odoo_id_idx')
+        self.assertUsesIndex(Job.objects.filter(company=self.company, job_title='Analyst'), 'job_company_title_idx')
+        self.assertUsesIndex(
+            OdooCredentials.objects.filter(recruiter=self.recruiter).order_by('-created_at')[:1],
+            'odoo_creds_recr_created_idx'
+        )
+
+    def test_list_queries_use_ordering_indexes(self):
+        self.assertUsesIndex(
+            CandidateAttachment.objects.filter(candidate=self.candidate).order_by('-created_at'),
+            'attach_cand_created_idx'
+        )
+        self.assertUsesIndex(
+            Candidate.objects.filter(job=self.job).order_by('-created_at', '-candidate_id')[:50],
+            'candidate_c_job_id_a02ed9_idx'
+        )
+        self.assertUsesIndex(
+            Job.objects.filter(company=self.company).order_by('-created_at', '-job_id')[:50],
+            'job_job_company_ba2975_idx'
+        )
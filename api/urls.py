@@ -31,10 +31,13 @@ urlpatterns = [
     path('sync/candidates/job/<int:job_id>/', views.sync_candidates_for_job, name='sync_candidates_for_job'),
     path('sync/candidates/company/<int:company_id>/', views.sync_candidates_for_company, name='sync_candidates_for_company'),
     path('sync/candidates/all/', views.sync_all_candidates, name='sync_all_candidates'),
+    path('sync/all/', views.sync_all_data, name='sync_all_data'),
+    path('sync/status/<int:sync_job_id>/', views.sync_job_status, name='sync_job_status'),
     path('companies/<int:company_id>/jobs/', views.get_jobs_by_company, name='get_jobs_by_company'),
     path('candidates/<int:candidate_id>/attachments/', views.get_candidate_attachments, name='get_candidate_attachments'),
     path('sync/jobs/user/', views.sync_jobs_for_user, name='sync_jobs_for_user'),
     path('candidates/<int:candidate_id>/attachments/download/<int:attachment_id>/', views.download_candidate_attachment, name='download_candidate_attachment'),
+    path('candidate-attachments/<int:attachment_id>/preview/', views.preview_candidate_attachment, name='preview_candidate_attachment'),
     path('sync/candidates/<int:candidate_id>/attachments/', views.sync_candidate_attachments, name='sync_candidate_attachments'),
     path('interviews/create/', views.create_interview, name='create-interview'),
     path('interviews/<int:interview_id>/create-calendar-event/', views.create_interview_event, name='create-calendar-event'),
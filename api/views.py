@@ -9,7 +9,7 @@ from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
 from django.utils import timezone
 from datetime import timedelta
-from django.http import HttpResponse, FileResponse
+from django.http import HttpResponse
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from io import BytesIO
@@ -18,6 +18,9 @@ import logging
 import random
 import requests
 from django.core.cache import cache
+from recos.downloads import file_download_response
+from api.pagination import StableCursorPagination, InterviewCursorPagination
+from api.fieldsets import SparseFieldsetViewMixin, sparse_queryset
 
 from users.models import Recruiter, OdooCredentials
 from companies.models import Company
@@ -28,6 +31,7 @@ from interviewConversation.models import InterviewConversation
 from job.models import Job
 from job.services.ai_service import generate_job_summary
 from candidate.services.ai_service import generate_candidate_skill_summary
+from candidate.services.attachment_preview_service import AttachmentPreviewService
 from api.serializers import (
     InterviewConversationSerializer, 
     JobSerializer, 
@@ -44,10 +48,14 @@ from api.serializers import (
     CandidateAttachmentSerializer,
     ForgotPasswordSerializer,
     VerifyCodeSerializer,
-    ResetPasswordSerializer
+    ResetPasswordSerializer,
+    SyncJobSerializer
 )
+from api.models import SyncJob
+from api.services.sync_job_service import SyncJobService
+from api.services.response_cache_service import ResponseCacheService
 
-from users.services.odoo_service import OdooService
+from users.services.odoo_service import OdooService, get_odoo_service
 from companies.services.company_sync_service import CompanySyncService
 from job.services.job_sync_service import JobSyncService
 from candidate.services.candidate_sync_service import CandidateSyncService
@@ -67,6 +75,7 @@ User = get_user_model()
 code_storage = {}
 
 logger = logging.getLogger(__name__)
+SKIPPED_JOBS_REPORTED = 50
 
 
 class ForgotPasswordView(APIView):
@@ -340,13 +349,17 @@ def get_candidate_attachments(request, candidate_id):
             job__company__recruiter=request.user
         )
         
-        attachments = CandidateAttachment.objects.filter(candidate=candidate)
-        serializer = CandidateAttachmentSerializer(attachments, many=True)
+        attachments = sparse_queryset(
+            request,
+            CandidateAttachment.objects.filter(candidate=candidate),
+            CandidateAttachmentSerializer
+        )
+        serializer = CandidateAttachmentSerializer(attachments, many=True, context={'request': request})
         
         return Response({
             'candidate_id': candidate.candidate_id,
             'candidate_name': candidate.name,
-            'attachments_count': attachments.count(),
+            'attachments_count': len(serializer.data),
             'attachments': serializer.data
         })
         
@@ -368,17 +381,14 @@ def download_candidate_attachment(request, candidate_id, attachment_id):
         )
         
         if attachment.file:
-            if hasattr(attachment, 'get_download_filename'):
-                filename = attachment.get_download_filename()
-            else:
-                filename = f"{attachment.name or 'attachment'}_{attachment_id}"
-                if attachment.file and hasattr(attachment.file, 'name'):
-                    filename = os.path.basename(attachment.file.name)
-            
-            response = FileResponse(attachment.file.open('rb'))
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            response['Content-Type'] = attachment.file_type or 'application/octet-stream'
-            return response
+            return file_download_response(
+                request,
+                attachment.file,
+                content_type=attachment.file_type or 'application/octet-stream',
+                filename=attachment.get_download_filename(),
+                etag=attachment.checksum or None,
+                last_modified=attachment.updated_at,
+            )
         else:
             return Response(
                 {'error': 'File not found'}, 
@@ -390,6 +400,38 @@ def download_candidate_attachment(request, candidate_id, attachment_id):
             {'error': 'Attachment not found or access denied'}, 
             status=status.HTTP_404_NOT_FOUND
         )
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def preview_candidate_attachment(request, attachment_id):
+    try:
+        attachment = CandidateAttachment.objects.get(
+            attachment_id=attachment_id,
+            candidate__job__company__recruiter=request.user
+        )
+    except CandidateAttachment.DoesNotExist:
+        return Response(
+            {'error': 'Attachment not found or access denied'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    preview = AttachmentPreviewService.get_preview(attachment)
+    if preview is None:
+        return Response(
+            {'error': 'No preview available for this attachment'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    # Previews are keyed by content checksum, so a given URL+ETag never changes meaning.
+    return file_download_response(
+        request,
+        preview.image,
+        content_type=preview.content_type,
+        filename=f"preview_{attachment.attachment_id}{AttachmentPreviewService.EXTENSION}",
+        etag=f"preview-{preview.checksum}",
+        last_modified=preview.created_at,
+        cache_control=f"private, max-age={getattr(settings, 'ATTACHMENT_PREVIEW_CACHE_SECONDS', 604800)}",
+        disposition='inline',
+    )
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def sync_candidate_attachments(request, candidate_id):
@@ -409,14 +451,9 @@ def sync_candidate_attachments(request, candidate_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        odoo_service = OdooService(
-            db_url=odoo_creds.db_url,
-            db_name=odoo_creds.db_name,
-            email=odoo_creds.email_address,
-            api_key=odoo_creds.get_api_key()
-        )
+        odoo_service = get_odoo_service(odoo_creds)
         
-        if not odoo_service.authenticate():
+        if not odoo_service:
             return Response(
                 {'error': 'Failed to authenticate with Odoo'}, 
                 status=status.HTTP_401_UNAUTHORIZED
@@ -430,7 +467,7 @@ def sync_candidate_attachments(request, candidate_id):
         
         return Response({
             'message': f'Synced attachments for candidate {candidate.name}',
-            'attachments_synced': attachments.count(),
+            'attachments_synced': len(serializer.data),
             'attachments': serializer.data
         })
         
@@ -445,9 +482,10 @@ def sync_candidate_attachments(request, candidate_id):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-class InterviewViewSet(viewsets.ModelViewSet):
+class InterviewViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Interview.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = InterviewCursorPagination
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -478,9 +516,9 @@ class InterviewViewSet(viewsets.ModelViewSet):
             raise serializer.ValidationError({"job": "Job not found or access denied"})
     
     def get_queryset(self):
-        return Interview.objects.filter(recruiter=self.request.user)
+        return Interview.objects.filter(recruiter=self.request.user).select_related('candidate', 'recruiter')
 
-class InterviewConversationViewSet(viewsets.ModelViewSet):
+class InterviewConversationViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = InterviewConversation.objects.all()
     serializer_class = InterviewConversationSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -488,12 +526,13 @@ class InterviewConversationViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return InterviewConversation.objects.filter(interview__recruiter=self.request.user)
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StableCursorPagination
     
     def get_queryset(self):
-        queryset = Job.objects.filter(company__recruiter=self.request.user)
+        queryset = Job.objects.filter(company__recruiter=self.request.user).select_related('company')
         company_id = self.request.query_params.get('company_id', None)
         if company_id is not None:
             queryset = queryset.filter(company_id=company_id)
@@ -522,12 +561,13 @@ class JobViewSet(viewsets.ModelViewSet):
             serializer.save()
 
 
-class CandidateViewSet(viewsets.ModelViewSet):
+class CandidateViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = CandidateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StableCursorPagination
     
     def get_queryset(self):
-        queryset = Candidate.objects.filter(job__company__recruiter=self.request.user)
+        queryset = Candidate.objects.filter(job__company__recruiter=self.request.user).select_related('job__company')
         job_id = self.request.query_params.get('job_id', None)
         if job_id is not None:
             queryset = queryset.filter(job_id=job_id)
@@ -549,6 +589,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
         if candidate.attachments.exists():
             skill_summary = generate_candidate_skill_summary(candidate)
             candidate.generated_skill_summary = skill_summary
+            candidate.skill_summary_dirty = not skill_summary
             candidate.save()
     
     def perform_update(self, serializer):
@@ -557,6 +598,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
         if candidate.attachments.exists():
             skill_summary = generate_candidate_skill_summary(candidate)
             candidate.generated_skill_summary = skill_summary
+            candidate.skill_summary_dirty = not skill_summary
             candidate.save()
 
 
@@ -655,7 +697,7 @@ def logout_view(request):
 def verify_companies(request):
     try:
         recruiter = request.user
-        companies = Company.objects.filter(recruiter=recruiter)
+        companies = Company.objects.filter(recruiter=recruiter).select_related('recruiter')
         queries = connection.queries
         data = {
             'recruiter': {
@@ -711,18 +753,6 @@ def reset_company_sequence(request):
     except Exception as e:
         return Response({'error': str(e)}, status=500)
     
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def get_companies(request):
-    try:
-        recruiter = request.user
-        companies = Company.objects.filter(recruiter=recruiter)
-        serializer = CompanySerializer(companies, many=True)
-        return Response(serializer.data)
-    except Exception as e:
-        return Response({'error': f'Failed to retrieve companies: {str(e)}'},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def add_odoo_credentials(request):
@@ -802,6 +832,7 @@ def update_profile(request):
                         status=status.HTTP_400_BAD_REQUEST
                     )
             serializer.save()
+            ResponseCacheService.invalidate(ResponseCacheService.SCOPE_COMPANIES, [user.pk])
             return Response({
                 'message': 'Profile updated successfully',
                 'user': serializer.data
@@ -836,17 +867,33 @@ def delete_account(request):
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def get_odoo_credentials(request):
-    credentials = OdooCredentials.objects.filter(recruiter=request.user)
-    serializer = OdooCredentialsSerializer(credentials, many=True)
-    return Response(serializer.data)
+    def build():
+        credentials = sparse_queryset(
+            request,
+            OdooCredentials.objects.filter(recruiter=request.user),
+            OdooCredentialsSerializer
+        )
+        return OdooCredentialsSerializer(credentials, many=True, context={'request': request}).data
+
+    return Response(ResponseCacheService.get_or_build(
+        request, [(ResponseCacheService.SCOPE_ODOO_CREDENTIALS, request.user.pk)], build
+    ))
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def get_companies(request):
+    def build():
+        companies = sparse_queryset(
+            request,
+            Company.objects.filter(recruiter=request.user).select_related('recruiter'),
+            CompanySerializer
+        )
+        return CompanySerializer(companies, many=True, context={'request': request}).data
+
     try:
-        companies = Company.objects.filter(recruiter=request.user)
-        serializer = CompanySerializer(companies, many=True)
-        return Response(serializer.data)
+        return Response(ResponseCacheService.get_or_build(
+            request, [(ResponseCacheService.SCOPE_COMPANIES, request.user.pk)], build
+        ))
     except Exception as e:
         return Response({'error': f'Failed to retrieve companies: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -858,9 +905,21 @@ def get_jobs_by_company(request, company_id):
     except Company.DoesNotExist:
         return Response({'error': 'Company not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    jobs = Job.objects.filter(company=company)
-    serializer = JobSerializer(jobs, many=True)
-    return Response(serializer.data)
+    def build():
+        jobs = sparse_queryset(
+            request,
+            Job.objects.filter(company=company).select_related('company'),
+            JobSerializer,
+            StableCursorPagination.ordering
+        )
+        paginator = StableCursorPagination()
+        page = paginator.paginate_queryset(jobs, request)
+        serializer = JobSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data).data
+
+    return Response(ResponseCacheService.get_or_build(
+        request, [(ResponseCacheService.SCOPE_COMPANY_JOBS, company.company_id)], build
+    ))
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
@@ -870,9 +929,27 @@ def get_candidates_by_job(request, job_id):
     except Job.DoesNotExist:
         return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    candidates = Candidate.objects.filter(job=job)
-    serializer = CandidateSerializer(candidates, many=True)
-    return Response(serializer.data)
+    def build():
+        candidates = sparse_queryset(
+            request,
+            Candidate.objects.filter(job=job).select_related('job__company'),
+            CandidateSerializer,
+            StableCursorPagination.ordering
+        )
+        paginator = StableCursorPagination()
+        page = paginator.paginate_queryset(candidates, request)
+        serializer = CandidateSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data).data
+
+    # Candidate rows also show the company name, so a company change invalidates them too.
+    return Response(ResponseCacheService.get_or_build(
+        request,
+        [
+            (ResponseCacheService.SCOPE_JOB_CANDIDATES, job.job_id),
+            (ResponseCacheService.SCOPE_COMPANY_JOBS, job.company_id),
+        ],
+        build
+    ))
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
@@ -889,10 +966,10 @@ def sync_jobs_for_company(request, company_id):
     
     try:
         synced_jobs = JobSyncService.sync_jobs_for_company(company)
-        serializer = JobSerializer(synced_jobs, many=True)
         return Response({
             'message': f'Successfully synced {len(synced_jobs)} jobs',
-            'jobs': serializer.data
+            'synced_count': len(synced_jobs),
+            'jobs_url': reverse('get_jobs_by_company', args=[company.company_id], request=request)
         })
     except Exception as e:
         return Response({'error': f'Failed to sync jobs: {str(e)}'},
@@ -904,10 +981,10 @@ def sync_jobs_for_user(request):
     try:
         from job.services.job_sync_service import JobSyncService
         synced_jobs = JobSyncService.sync_jobs_for_user(request.user)
-        serializer = JobSerializer(synced_jobs, many=True)
         return Response({
             'message': f'Successfully synced {len(synced_jobs)} jobs',
-            'jobs': serializer.data
+            'synced_count': len(synced_jobs),
+            'jobs_url': reverse('job-list', request=request)
         })
     except Exception as e:
         return Response({'error': f'Failed to sync jobs: {str(e)}'},
@@ -924,14 +1001,9 @@ def sync_jobs_handle_duplicates(request):
         if not odoo_creds:
             return Response({'error': 'No Odoo credentials found'}, status=status.HTTP_400_BAD_REQUEST)
         
-        odoo_service = OdooService(
-            db_url=odoo_creds.db_url,
-            db_name=odoo_creds.db_name,
-            email=odoo_creds.email_address,
-            api_key=odoo_creds.get_api_key()
-        )
+        odoo_service = get_odoo_service(odoo_creds)
         
-        if not odoo_service.authenticate():
+        if not odoo_service:
             return Response({'error': 'Failed to authenticate with Odoo'}, status=status.HTTP_400_BAD_REQUEST)
         
         odoo_jobs = odoo_service.get_jobs(user_id=odoo_creds.odoo_user_id)
@@ -996,9 +1068,12 @@ def sync_jobs_handle_duplicates(request):
         
         return Response({
             'message': f'Successfully synced {len(synced_jobs)} jobs, skipped {len(skipped_jobs)} jobs',
-            'synced_jobs': JobSerializer([item['job'] for item in synced_jobs], many=True).data,
-            'sync_details': synced_jobs,
-            'skipped_jobs': skipped_jobs
+            'synced_count': len(synced_jobs),
+            'created_count': sum(1 for item in synced_jobs if item['created']),
+            'duplicate_company_count': sum(1 for item in synced_jobs if item['is_duplicate_company']),
+            'skipped_count': len(skipped_jobs),
+            'skipped_jobs': skipped_jobs[:SKIPPED_JOBS_REPORTED],
+            'jobs_url': reverse('job-list', request=request)
         })
     except Exception as e:
         return Response({'error': f'Failed to sync jobs: {str(e)}'},
@@ -1014,85 +1089,62 @@ def sync_candidates_for_job(request, job_id):
     
     try:
         synced_candidates = CandidateSyncService.sync_candidates_for_job(job)
-        serializer = CandidateSerializer(synced_candidates, many=True)
         return Response({
             'message': f'Successfully synced {len(synced_candidates)} candidates',
-            'candidates': serializer.data
+            'synced_count': len(synced_candidates),
+            'candidates_url': reverse('get_candidates_by_job', args=[job.job_id], request=request)
         })
     except Exception as e:
         return Response({'error': f'Failed to sync candidates: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
 
+def _queued_sync_response(request, sync_job, created):
+    return Response({
+        'message': 'Sync queued' if created else 'A matching sync is already in progress',
+        'sync_job_id': sync_job.sync_job_id,
+        'status_url': reverse('sync_job_status', args=[sync_job.sync_job_id], request=request),
+        'candidates_url': reverse('candidate-list', request=request),
+        'sync_job': SyncJobSerializer(sync_job).data
+    }, status=status.HTTP_202_ACCEPTED)
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def sync_candidates_for_company(request, company_id):
-    """Sync all candidates for a company (all jobs)"""
+    """Queue a candidate sync for a company (all jobs)"""
     try:
-        company = Company.objects.get(company_id=company_id, company__recruiter=request.user)
+        company = Company.objects.get(company_id=company_id, recruiter=request.user)
     except Company.DoesNotExist:
         return Response({'error': 'Company not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    try:
-        from candidate.services.candidate_sync_service import CandidateSyncService
-        synced_count = CandidateSyncService.sync_candidates_for_company(company)
-        
-        candidates = Candidate.objects.filter(job__company=company)
-        serializer = CandidateSerializer(candidates, many=True)
-        
-        return Response({
-            'message': f'Successfully synced {synced_count} candidates for {company.company_name}',
-            'candidates_count': candidates.count(),
-            'candidates': serializer.data
-        })
-    except Exception as e:
-        return Response({'error': f'Failed to sync candidates: {str(e)}'}, 
-                       status=status.HTTP_400_BAD_REQUEST)
+    sync_job, created = SyncJobService.enqueue(
+        request.user,
+        SyncJob.KIND_CANDIDATES_COMPANY,
+        company_id=company.company_id
+    )
+    return _queued_sync_response(request, sync_job, created)
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def sync_all_candidates(request):
-    """Sync candidates for all companies of the current recruiter"""
-    try:
-        from candidate.services.candidate_sync_service import CandidateSyncService
-        total_synced = CandidateSyncService.sync_all_candidates_for_recruiter(request.user)
-        
-        candidates = Candidate.objects.filter(job__company__recruiter=request.user)
-        serializer = CandidateSerializer(candidates, many=True)
-        
-        return Response({
-            'message': f'Successfully synced {total_synced} candidates across all companies',
-            'total_candidates': candidates.count(),
-            'candidates': serializer.data
-        })
-    except Exception as e:
-        return Response({'error': f'Failed to sync candidates: {str(e)}'}, 
-                       status=status.HTTP_400_BAD_REQUEST)
+    """Queue a candidate sync for all companies of the current recruiter"""
+    sync_job, created = SyncJobService.enqueue(request.user, SyncJob.KIND_CANDIDATES_ALL)
+    return _queued_sync_response(request, sync_job, created)
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def sync_all_data(request):
+    """Queue a full companies, jobs and candidates sync for the current recruiter"""
+    sync_job, created = SyncJobService.enqueue(request.user, SyncJob.KIND_ALL)
+    return _queued_sync_response(request, sync_job, created)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def sync_job_status(request, sync_job_id):
     try:
-        synced_companies = CompanySyncService.sync_recruiter_companies(request.user)
-        
-        all_candidates = []
-        for company in synced_companies:
-            JobSyncService.sync_jobs_for_company(company)
-            
-            for job in company.jobs.all():
-                try:
-                    synced_candidates = CandidateSyncService.sync_candidates_for_job(job)
-                    all_candidates.extend(synced_candidates)
-                except Exception as e:
-                    raise Exception(f'Failed to sync candidates for job {job.job_title}: {str(e)}')
-        companies_data = CompanySerializer(synced_companies, many=True).data
-        candidates_data = CandidateSerializer(all_candidates, many=True).data
-        
-        return Response({
-            'message': f'Successfully synced {len(synced_companies)} companies and {len(all_candidates)} candidates',
-            'companies': companies_data,
-            'candidates': candidates_data
-        })
-    except Exception as e:
-        return Response({'error': f'Failed to sync data: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+        sync_job = SyncJob.objects.get(sync_job_id=sync_job_id, recruiter=request.user)
+    except SyncJob.DoesNotExist:
+        return Response({'error': 'Sync job not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(SyncJobSerializer(sync_job).data)
+
 @api_view(['GET'])
 def api_root(request, format=None):
     return Response({
@@ -1138,7 +1190,7 @@ def draw_wrapped_text(p, text, x, y, max_width, font_name="Helvetica", font_size
         y -= line_height
     return y
 
-class AIReportViewSet(viewsets.ModelViewSet):
+class AIReportViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = AIReport.objects.all()
     
     def get_serializer_class(self):
@@ -1,4 +1,7 @@
 from django.contrib import admin
-from .models import Candidate
+from .models import Candidate, AttachmentText, AttachmentBlob, AttachmentPreview
 
 admin.site.register(Candidate)
+admin.site.register(AttachmentText)
+admin.site.register(AttachmentBlob)
+admin.site.register(AttachmentPreview)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from candidate.models import CandidateAttachment, AttachmentText
+from candidate.services.attachment_text_service import AttachmentTextService
+
+
+class Command(BaseCommand):
+    help = "Compute checksums and extract text for stored attachments that are not in the text store yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='Attachments loaded per query')
+        parser.add_argument(
+            '--retry-errors',
+            action='store_true',
+            help='Drop stored texts that have an extraction error so their files are parsed again'
+        )
+
+    def handle(self, *args, **options):
+        if options['retry_errors']:
+            dropped, _ = AttachmentText.objects.exclude(error='').delete()
+            self.stdout.write(f"Dropped {dropped} stored texts with extraction errors")
+
+        attachments = (
+            CandidateAttachment.objects.exclude(file='')
+            .exclude(sync_status='failed')
+            .order_by('attachment_id')
+        )
+        parsed = 0
+        batch = []
+        for attachment in attachments.iterator(chunk_size=options['batch_size']):
+            batch.append(attachment)
+            if len(batch) >= options['batch_size']:
+                parsed += AttachmentTextService.store_for_attachments(batch)
+                batch = []
+        parsed += AttachmentTextService.store_for_attachments(batch)
+
+        failed = AttachmentText.objects.exclude(error='').count()
+        limited = AttachmentText.objects.filter(error='').exclude(limits_hit=[]).count()
+        self.stdout.write(
+            f"Parsed {parsed} new files; {failed} stored texts have extraction errors, {limited} were cut at a limit"
+        )
@@ -0,0 +1,41 @@
+import os
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from candidate.models import CandidateAttachment
+from candidate.services.attachment_blob_service import AttachmentBlobService
+from candidate.services.attachment_text_service import AttachmentTextService
+
+
+class Command(BaseCommand):
+    help = "Move stored attachment files into content-addressed blobs, deleting duplicate copies"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='Attachments loaded per query')
+
+    def handle(self, *args, **options):
+        moved = 0
+        freed = 0
+        attachments = (
+            CandidateAttachment.objects.filter(blob__isnull=True)
+            .exclude(file='')
+            .order_by('attachment_id')
+        )
+        for attachment in attachments.iterator(chunk_size=options['batch_size']):
+            storage = attachment.file.storage
+            old_name = attachment.file.name
+            try:
+                checksum = attachment.checksum or AttachmentTextService.compute_checksum(attachment)
+                size = storage.size(old_name)
+                with storage.open(old_name, 'rb') as content, transaction.atomic():
+                    AttachmentBlobService.attach(attachment, checksum, content, size, os.path.basename(old_name))
+                    attachment.save(update_fields=['blob', 'checksum', 'file_size', 'file', 'updated_at'])
+            except Exception as e:
+                self.stderr.write(f"Attachment {attachment.attachment_id} ({attachment.name}): {str(e)}")
+                continue
+            if attachment.file.name != old_name:
+                storage.delete(old_name)
+                if attachment.blob.ref_count > 1:
+                    freed += size
+            moved += 1
+
+        self.stdout.write(f"Moved {moved} attachments into blobs, freed {freed} bytes")
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.24 on 2026-10-17 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("candidate", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="candidate",
+            name="is_active",
+            field=models.BooleanField(default=True),
+        ),
+    ]
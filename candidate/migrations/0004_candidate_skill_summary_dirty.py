@@ -0,0 +1,18 @@
+# Generated by Django 4.2.24 on 2026-10-17 14:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("candidate", "0003_candidate_is_active"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="candidate",
+            name="skill_summary_dirty",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.24 on 2026-10-17 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("candidate", "0004_candidate_skill_summary_dirty"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttachmentText",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("checksum", models.CharField(max_length=64, unique=True)),
+                ("text", models.TextField(blank=True, default="")),
+                ("error", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="candidateattachment",
+            name="checksum",
+            field=models.CharField(
+                blank=True, db_index=True, default="", max_length=64
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.24 on 2026-10-17 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("candidate", "0005_attachment_text"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attachmenttext",
+            name="limits_hit",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
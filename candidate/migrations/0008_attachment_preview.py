@@ -0,0 +1,43 @@
+# Generated by Django 4.2.24 on 2026-10-17 15:13
+
+import candidate.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("candidate", "0007_attachment_blob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttachmentPreview",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("checksum", models.CharField(max_length=64, unique=True)),
+                (
+                    "image",
+                    models.FileField(
+                        blank=True, upload_to=candidate.models.preview_upload_to
+                    ),
+                ),
+                (
+                    "content_type",
+                    models.CharField(blank=True, default="", max_length=50),
+                ),
+                ("width", models.PositiveIntegerField(default=0)),
+                ("height", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
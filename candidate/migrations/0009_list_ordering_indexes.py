@@ -0,0 +1,27 @@
+# Generated by Django 4.2.24 on 2026-10-17 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("candidate", "0008_attachment_preview"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="candidate",
+            index=models.Index(
+                fields=["job", "-created_at", "-candidate_id"],
+                name="candidate_c_job_id_a02ed9_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="candidate",
+            index=models.Index(
+                fields=["-created_at", "-candidate_id"],
+                name="candidate_c_created_830429_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.24 on 2026-10-17 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("candidate", "0009_list_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="candidateattachment",
+            index=models.Index(
+                fields=["candidate", "-created_at"], name="attach_cand_created_idx"
+            ),
+        ),
+    ]
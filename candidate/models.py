@@ -18,17 +18,39 @@ class Candidate(models.Model):
     email = models.EmailField(max_length=100)
     phone = models.CharField(max_length=20, blank=True, null=True)  
     generated_skill_summary = models.TextField(null=True, blank=True)
+    skill_summary_dirty = models.BooleanField(default=False)
     state = models.CharField(max_length=50, choices=CANDIDATE_STATES, default='applied')
     partner_id = models.IntegerField(null=True, blank=True)  
     date_open = models.DateTimeField(null=True, blank=True)  
     date_last_stage_update = models.DateTimeField(null=True, blank=True)  
+    is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     class Meta:
         unique_together = ('job', 'odoo_candidate_id') 
+        indexes = [
+            models.Index(fields=['job', '-created_at', '-candidate_id']),
+            models.Index(fields=['-created_at', '-candidate_id']),
+        ]
     
     def __str__(self):
         return self.name
+def blob_upload_to(instance, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    return f"attachment_blobs/{instance.checksum[:2]}/{instance.checksum[2:4]}/{instance.checksum}{extension}"
+
+
+class AttachmentBlob(models.Model):
+    checksum = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to=blob_upload_to)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Blob {self.checksum[:12]} ({self.ref_count} refs)"
+
+
 class CandidateAttachment(models.Model):
     attachment_id = models.AutoField(primary_key=True)
     candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='attachments')
@@ -38,6 +60,8 @@ class CandidateAttachment(models.Model):
     file = models.FileField(upload_to='candidate_attachments/%Y/%m/%d/')
     file_type = models.CharField(max_length=100)
     file_size = models.IntegerField(default=0)
+    checksum = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    blob = models.ForeignKey(AttachmentBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='attachments')
     sync_status = models.CharField(max_length=20, choices=[
         ('pending', 'Pending'),
         ('completed', 'Completed'),
@@ -71,5 +95,40 @@ class CandidateAttachment(models.Model):
     def is_document(self):
         return self.get_file_extension() in ['.doc', '.docx', '.pdf', '.txt']
     
+    def is_spreadsheet(self):
+        return self.get_file_extension() in ['.xls', '.xlsx', '.csv']
+    
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['candidate', '-created_at'], name='attach_cand_created_idx'),
+        ]
+
+
+class AttachmentText(models.Model):
+    checksum = models.CharField(max_length=64, unique=True)
+    text = models.TextField(blank=True, default='')
+    error = models.TextField(blank=True, default='')
+    limits_hit = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Text for {self.checksum[:12]}"
+
+
+def preview_upload_to(instance, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    return f"attachment_previews/{instance.checksum[:2]}/{instance.checksum}{extension}"
+
+
+class AttachmentPreview(models.Model):
+    checksum = models.CharField(max_length=64, unique=True)
+    image = models.FileField(upload_to=preview_upload_to, blank=True)
+    content_type = models.CharField(max_length=50, blank=True, default='')
+    width = models.PositiveIntegerField(default=0)
+    height = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Preview for {self.checksum[:12]}"
@@ -1,35 +1,34 @@
-import google.genai as genai
 from google.genai import types
 from django.conf import settings
 import logging
 import json
 import os
-from .utils import extract_text_from_file
+from .attachment_text_service import AttachmentTextService
+from api.models import AISummaryCache
+from api.services.summary_cache_service import SummaryCacheService
+from recos.ai_providers import ai_model_name, get_ai_client
 
 logger = logging.getLogger(__name__)
 
+GEMINI_MODEL = "gemini-2.0-flash"
+SKILL_SUMMARY_PROMPT_VERSION = 1
+
 def get_genai_client():
-    try:
-        api_key = getattr(settings, 'GEMINI_API_KEY', None)
-        if not api_key:
-            logger.error("GEMINI_API_KEY is not configured in settings")
-            return None
-            
-        return genai.Client(api_key=api_key)
-    except Exception as e:
-        logger.error(f"Failed to initialize GenAI client: {str(e)}")
-        return None
+    """Return the process-wide client of the configured AI provider"""
+    return get_ai_client()
     
 def generate_candidate_skill_summary(candidate):
     """
-    Generate a skill summary for a candidate based on their resume attachments
+    Generate a skill summary for a candidate based on their resume attachments, reusing the
+    cached summary when the resume text and job are unchanged. Returns an empty string when
+    the summary could not be generated, so callers can keep the candidate queued for a retry.
     """
     try:
         resume_text = ""
         for attachment in candidate.attachments.all():
             if attachment.is_document():
                 try:
-                    text = extract_text_from_file(attachment.file.path)
+                    text = AttachmentTextService.get_text(attachment)
                     resume_text += f"\n\n--- Document: {attachment.name} ---\n{text}"
                 except Exception as e:
                     logger.warning(f"Failed to extract text from {attachment.name}: {str(e)}")
@@ -40,68 +39,78 @@ def generate_candidate_skill_summary(candidate):
         
         client = get_genai_client()
         if not client:
-            return "AI service is not available. Please check API configuration."
-        
-        
-        prompt = f"""
-        Analyze this candidate's resume and extract a comprehensive skill summary relevant to the job they're applying for.
-        
-        CANDIDATE NAME: {candidate.name}
-        JOB TITLE: {candidate.job.job_title}
-        JOB DESCRIPTION: {candidate.job.job_description}
-        
-        RESUME TEXT:
-        {resume_text}
-        
-        Provide a detailed skill summary in valid JSON format only. Focus on skills relevant to the job type, whether technical, professional, creative, administrative, or any other field. Include both hard skills and soft skills.
-        
-        {{
-            "skills_summary": "A 2-3 sentence paragraph summarizing the candidate's most relevant skills and experience for this position",
-            "key_skills": {{
-                "technical_professional_skills": ["List specific technical or professional skills relevant to the job"],
-                "soft_skills": ["List interpersonal and soft skills"],
-                "industry_knowledge": ["List industry-specific knowledge or expertise"],
-                "tools_software_equipment": ["List relevant tools, software, or equipment"],
-                "certifications_licenses": ["List relevant certifications or licenses"]
-            }},
-            "experience": {{
-                "total_years": "Estimated total years of relevant experience",
-                "relevant_experience": "Brief description of most relevant experience",
-                "career_level": "entry-level/mid-level/senior-level/executive-level"
-            }},
-            "education": {{
-                "highest_degree": "Highest degree obtained",
-                "field_of_study": "Field of study",
-                "relevant_education": "Any education particularly relevant to the job"
-            }},
-            "languages": ["List languages and proficiency levels if mentioned"],
-            "additional_qualifications": ["Any other relevant qualifications or achievements"]
-        }}
-        """
-        
-        config = types.GenerateContentConfig(
-            temperature=0.2,
-            top_p=0.95,
-            top_k=40,
-            max_output_tokens=2048,
-            response_mime_type="application/json",
+            logger.error("AI service is not available, skill summary was not generated")
+            return ''
+        
+        return SummaryCacheService.get_or_generate(
+            AISummaryCache.KIND_SKILL_SUMMARY,
+            SKILL_SUMMARY_PROMPT_VERSION,
+            ai_model_name(client, GEMINI_MODEL),
+            [candidate.name, candidate.job.job_title, candidate.job.job_description, resume_text],
+            lambda: request_skill_summary(client, candidate, resume_text)
         )
         
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt,
-            config=config,
-        )
-        
-        skill_data = parse_gemini_response(response.text)
-        
-        summary = format_skill_summary(skill_data)
-        
-        return summary
-        
     except Exception as e:
         logger.error(f"Error generating skill summary for candidate {candidate.name}: {str(e)}")
-        return f"Skill summary generation failed: {str(e)}"
+        return ''
+
+def request_skill_summary(client, candidate, resume_text):
+    """Ask Gemini for a candidate skill summary; raises when the response cannot be parsed"""
+    prompt = f"""
+    Analyze this candidate's resume and extract a comprehensive skill summary relevant to the job they're applying for.
+    
+    CANDIDATE NAME: {candidate.name}
+    JOB TITLE: {candidate.job.job_title}
+    JOB DESCRIPTION: {candidate.job.job_description}
+    
+    RESUME TEXT:
+    {resume_text}
+    
+    Provide a detailed skill summary in valid JSON format only. Focus on skills relevant to the job type, whether technical, professional, creative, administrative, or any other field. Include both hard skills and soft skills.
+    
+    {{
+        "skills_summary": "A 2-3 sentence paragraph summarizing the candidate's most relevant skills and experience for this position",
+        "key_skills": {{
+            "technical_professional_skills": ["List specific technical or professional skills relevant to the job"],
+            "soft_skills": ["List interpersonal and soft skills"],
+            "industry_knowledge": ["List industry-specific knowledge or expertise"],
+            "tools_software_equipment": ["List relevant tools, software, or equipment"],
+            "certifications_licenses": ["List relevant certifications or licenses"]
+        }},
+        "experience": {{
+            "total_years": "Estimated total years of relevant experience",
+            "relevant_experience": "Brief description of most relevant experience",
+            "career_level": "entry-level/mid-level/senior-level/executive-level"
+        }},
+        "education": {{
+            "highest_degree": "Highest degree obtained",
+            "field_of_study": "Field of study",
+            "relevant_education": "Any education particularly relevant to the job"
+        }},
+        "languages": ["List languages and proficiency levels if mentioned"],
+        "additional_qualifications": ["Any other relevant qualifications or achievements"]
+    }}
+    """
+    
+    config = types.GenerateContentConfig(
+        temperature=0.2,
+        top_p=0.95,
+        top_k=40,
+        max_output_tokens=2048,
+        response_mime_type="application/json",
+    )
+    
+    response = client.models.generate_content(
+        model=GEMINI_MODEL,
+        contents=prompt,
+        config=config,
+    )
+    
+    skill_data = parse_gemini_response(response.text)
+    if 'raw_response' in skill_data:
+        raise Exception("Unexpected response format")
+    
+    return format_skill_summary(skill_data)
 
 def parse_gemini_response(response_text):
     """Parse Gemini response and extract JSON"""
@@ -0,0 +1,61 @@
+import logging
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from candidate.models import AttachmentBlob
+from .attachment_preview_service import AttachmentPreviewService
+
+logger = logging.getLogger(__name__)
+
+
+class AttachmentBlobService:
+    @staticmethod
+    def acquire(checksum, content, size, filename):
+        """
+        Return the blob holding this content, storing content only if no blob has this checksum yet,
+        and take one reference on it. content is an open file positioned at its start.
+        """
+        for attempt in range(2):
+            updated = AttachmentBlob.objects.filter(checksum=checksum).update(ref_count=F('ref_count') + 1)
+            if updated:
+                return AttachmentBlob.objects.get(checksum=checksum)
+            try:
+                with transaction.atomic():
+                    blob = AttachmentBlob(checksum=checksum, size=size, ref_count=1)
+                    blob.file.save(filename, File(content), save=False)
+                    blob.save()
+                    return blob
+            except IntegrityError:
+                # Another worker stored the same content first; the file we wrote is orphaned.
+                if blob.file.name:
+                    blob.file.storage.delete(blob.file.name)
+                content.seek(0)
+        raise Exception(f"Could not store attachment blob {checksum[:12]}")
+
+    @staticmethod
+    def attach(attachment, checksum, content, size, filename):
+        """Point an unsaved attachment at the shared blob for its content"""
+        blob = AttachmentBlobService.acquire(checksum, content, size, filename)
+        attachment.blob = blob
+        attachment.checksum = checksum
+        attachment.file_size = size
+        attachment.file.name = blob.file.name
+        return attachment
+
+    @staticmethod
+    def release(blob_id):
+        """Drop one reference; the last one deletes the blob row and its preview and, after commit, their files"""
+        with transaction.atomic():
+            blob = AttachmentBlob.objects.select_for_update().filter(pk=blob_id).first()
+            if blob is None:
+                return
+            if blob.ref_count > 1:
+                AttachmentBlob.objects.filter(pk=blob_id).update(ref_count=F('ref_count') - 1)
+                return
+            if blob.attachments.exists():
+                logger.warning(f"Blob {blob.checksum[:12]} reached zero references but is still in use")
+                return
+            storage, file_name = blob.file.storage, blob.file.name
+            blob.delete()
+            AttachmentPreviewService.discard(blob.checksum)
+            transaction.on_commit(lambda: storage.delete(file_name))
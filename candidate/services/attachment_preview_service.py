@@ -0,0 +1,120 @@
+import io
+import logging
+from concurrent.futures import BrokenExecutor
+from PIL import Image, ImageOps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from candidate.models import AttachmentPreview
+from .attachment_text_service import AttachmentTextService
+from .text_extraction_service import TextExtractionService
+from .utils import ExtractionTimeout, render_pdf_first_page
+
+logger = logging.getLogger(__name__)
+
+
+class AttachmentPreviewService:
+    FORMAT = 'WEBP'
+    CONTENT_TYPE = 'image/webp'
+    EXTENSION = '.webp'
+    QUALITY = 80
+
+    @staticmethod
+    def can_preview(attachment):
+        return bool(attachment.file) and (attachment.is_pdf() or attachment.is_image())
+
+    @staticmethod
+    def get_preview(attachment):
+        """
+        Return the stored preview for an attachment, rendering it now if ingestion did not.
+        Returns None for file types without previews and for files that could not be rendered.
+        """
+        if not AttachmentPreviewService.can_preview(attachment):
+            return None
+        if not attachment.checksum:
+            attachment.checksum = AttachmentTextService.compute_checksum(attachment)
+            attachment.save(update_fields=['checksum', 'updated_at'])
+
+        preview = AttachmentPreview.objects.filter(checksum=attachment.checksum).first()
+        if preview is None:
+            preview = AttachmentPreviewService._generate(attachment.checksum, attachment)
+        return preview if preview.image else None
+
+    @staticmethod
+    def store_for_attachments(attachments):
+        """Render previews at ingestion for content not seen before; failures are recorded, not raised"""
+        pending = {}
+        for attachment in attachments:
+            if AttachmentPreviewService.can_preview(attachment) and attachment.checksum:
+                pending.setdefault(attachment.checksum, attachment)
+
+        known = set(
+            AttachmentPreview.objects.filter(checksum__in=pending.keys()).values_list('checksum', flat=True)
+        )
+        rendered = 0
+        for checksum, attachment in pending.items():
+            if checksum not in known:
+                AttachmentPreviewService._generate(checksum, attachment)
+                rendered += 1
+        return rendered
+
+    @staticmethod
+    def render(file_path, is_pdf, max_size):
+        """
+        Return the first page of a PDF, or an image, as a PIL image that fits in max_size x max_size.
+        PDFs are rendered on the extraction pool, since PDFium must not run on concurrent threads.
+        """
+        if is_pdf:
+            image = TextExtractionService.run_in_pool(render_pdf_first_page, file_path, max_size)
+        else:
+            image = Image.open(file_path)
+            image.draft('RGB', (max_size, max_size))
+            image = ImageOps.exif_transpose(image)
+
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+        image.thumbnail((max_size, max_size))
+        return image
+
+    @staticmethod
+    def discard(checksum):
+        """Delete the preview for content that is no longer stored; its file goes after commit"""
+        preview = AttachmentPreview.objects.filter(checksum=checksum).first()
+        if preview is None:
+            return
+        storage, image_name = preview.image.storage, preview.image.name
+        preview.delete()
+        if image_name:
+            transaction.on_commit(lambda: storage.delete(image_name))
+
+    @staticmethod
+    def _generate(checksum, attachment):
+        preview = AttachmentPreview(checksum=checksum, content_type=AttachmentPreviewService.CONTENT_TYPE)
+        try:
+            image = AttachmentPreviewService.render(
+                attachment.file.path,
+                attachment.is_pdf(),
+                getattr(settings, 'ATTACHMENT_PREVIEW_MAX_SIZE', 480)
+            )
+            output = io.BytesIO()
+            image.save(output, AttachmentPreviewService.FORMAT, quality=AttachmentPreviewService.QUALITY)
+            preview.width, preview.height = image.size
+            preview.image.save(checksum + AttachmentPreviewService.EXTENSION, ContentFile(output.getvalue()), save=False)
+        except (ExtractionTimeout, BrokenExecutor) as e:
+            # Timeouts and pool failures may not recur, so they are not remembered.
+            logger.warning(f"Preview for {attachment.name} will be retried: {str(e) or e.__class__.__name__}")
+            preview.error = str(e) or e.__class__.__name__
+            return preview
+        except Exception as e:
+            logger.warning(f"Failed to render preview for {attachment.name}: {str(e)}")
+            preview.error = str(e) or e.__class__.__name__
+
+        try:
+            with transaction.atomic():
+                preview.save()
+        except IntegrityError:
+            # Another worker rendered the same content first; drop our copy of the image.
+            if preview.image.name:
+                preview.image.storage.delete(preview.image.name)
+            preview = AttachmentPreview.objects.get(checksum=checksum)
+        return preview
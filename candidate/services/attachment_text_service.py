@@ -0,0 +1,102 @@
+import hashlib
+import logging
+from django.db import IntegrityError
+from candidate.models import AttachmentText
+from .text_extraction_service import TextExtractionService
+
+logger = logging.getLogger(__name__)
+
+
+class AttachmentTextService:
+    CHUNK_SIZE = 64 * 1024
+
+    @staticmethod
+    def compute_checksum(attachment):
+        """SHA-256 of the stored file, read in chunks"""
+        digest = hashlib.sha256()
+        with attachment.file.open('rb') as stored_file:
+            for chunk in stored_file.chunks(AttachmentTextService.CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_text(attachment):
+        """
+        Return the extracted text for a document attachment, parsing the file only the first time
+        its content is seen. Raises if extraction failed, now or on a previous attempt; timeouts and
+        pool failures are not stored, so the next call parses the file again.
+        """
+        if not attachment.checksum:
+            attachment.checksum = AttachmentTextService.compute_checksum(attachment)
+            attachment.save(update_fields=['checksum', 'updated_at'])
+
+        stored = AttachmentText.objects.filter(checksum=attachment.checksum).first()
+        if stored is None:
+            stored = AttachmentTextService._extract(attachment)
+
+        if stored.error:
+            raise Exception(stored.error)
+        return stored.text
+
+    @staticmethod
+    def store_for_attachment(attachment):
+        """Populate the text store at ingestion; failures are recorded, not raised"""
+        return AttachmentTextService.store_for_attachments([attachment])
+
+    @staticmethod
+    def store_for_attachments(attachments):
+        """
+        Populate the text store for many attachments, parsing every document whose content has not
+        been seen before in parallel on the extraction pool. Returns the number of files parsed.
+        """
+        pending = {}
+        for attachment in attachments:
+            if not attachment.file or not attachment.is_document():
+                continue
+            try:
+                if not attachment.checksum:
+                    attachment.checksum = AttachmentTextService.compute_checksum(attachment)
+                    attachment.save(update_fields=['checksum', 'updated_at'])
+            except Exception as e:
+                logger.warning(f"Failed to read {attachment.name}: {str(e)}")
+                continue
+            pending.setdefault(attachment.checksum, attachment)
+
+        known = set(
+            AttachmentText.objects.filter(checksum__in=pending.keys()).values_list('checksum', flat=True)
+        )
+        pending = {checksum: attachment for checksum, attachment in pending.items() if checksum not in known}
+        if not pending:
+            return 0
+
+        results = TextExtractionService.extract_many(attachment.file.path for attachment in pending.values())
+        for checksum, attachment in pending.items():
+            AttachmentTextService._store(checksum, attachment, results[attachment.file.path])
+        return len(pending)
+
+    @staticmethod
+    def _extract(attachment):
+        result = TextExtractionService.extract(attachment.file.path)
+        return AttachmentTextService._store(attachment.checksum, attachment, result)
+
+    @staticmethod
+    def _store(checksum, attachment, result):
+        if result.get('transient'):
+            logger.warning(f"Text extraction for {attachment.name} will be retried: {result['error']}")
+            return AttachmentText(checksum=checksum, text='', error=result['error'], limits_hit=result['limits_hit'])
+        if result['error']:
+            logger.warning(f"Failed to extract text from {attachment.name}: {result['error']}")
+        elif result['limits_hit']:
+            logger.info(f"Text extraction for {attachment.name} hit limits: {', '.join(result['limits_hit'])}")
+        try:
+            stored, created = AttachmentText.objects.get_or_create(
+                checksum=checksum,
+                defaults={
+                    'text': result['text'],
+                    'error': result['error'],
+                    'limits_hit': result['limits_hit'],
+                }
+            )
+        except IntegrityError:
+            stored = AttachmentText.objects.get(checksum=checksum)
+        return stored
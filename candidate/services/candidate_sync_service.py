@@ -1,66 +1,84 @@
-from users.models import OdooCredentials
-from users.services.odoo_service import OdooService
+from users.models import OdooCredentials, OdooSyncWatermark
+from users.services.odoo_service import get_odoo_service
 from django.utils.dateparse import parse_datetime
-import base64
+from django.utils import timezone
+from django.db import transaction
+from django.conf import settings
+import tempfile
 from candidate.models import Candidate, CandidateAttachment
-from django.core.files.base import ContentFile
 import mimetypes
 import os
 from job.models import Job 
-from datetime import timezone, timedelta
+from datetime import timedelta, timezone as datetime_timezone
 from candidate.services.ai_service import generate_candidate_skill_summary
+from candidate.services.attachment_text_service import AttachmentTextService
+from candidate.services.attachment_blob_service import AttachmentBlobService
+from candidate.services.attachment_preview_service import AttachmentPreviewService
+from recos.concurrency import iter_concurrently, run_concurrently
+from recos.streams import HashingWriter
+from api.services.response_cache_service import ResponseCacheService
 
 class CandidateSyncService:
     @staticmethod
-    def sync_candidates_for_job(job, odoo_service=None):
+    def sync_candidates_for_job(job, odoo_service=None, on_summaries=None):
         """Sync candidates from Odoo for a given job including attachments"""
         try:            
+            recruiter = job.company.recruiter
+            odoo_creds = CandidateSyncService._get_odoo_credentials(recruiter)
+            
             if not odoo_service:
-                recruiter = job.company.recruiter
-                
-                odoo_creds = OdooCredentials.objects.filter(
-                    recruiter=recruiter
-                ).order_by('-created_at').first()
-                
                 if not odoo_creds:
                     raise ValueError("No Odoo credentials found for this recruiter")
                 
-                odoo_service = OdooService(
-                    db_url=odoo_creds.db_url,
-                    db_name=odoo_creds.db_name,
-                    email=odoo_creds.email_address,
-                    api_key=odoo_creds.get_api_key()
-                )
+                odoo_service = get_odoo_service(odoo_creds)
                 
-                if not odoo_service.authenticate():
+                if not odoo_service:
                     raise Exception("Failed to authenticate with Odoo")
             
-            odoo_candidates = odoo_service.get_candidates(job_id=job.job_id)
+            if not job.odoo_job_id:
+                raise ValueError(f"Job {job.job_title} is not linked to an Odoo job")
 
-            synced_candidates = []
-            for odoo_candidate in odoo_candidates:
-                try:
-                    candidate = CandidateSyncService._process_single_candidate(odoo_candidate, job)
-                    
-                    CandidateSyncService.sync_attachments_for_candidate(candidate, odoo_service)
+            scope = f"job:{job.job_id}"
+            since = OdooSyncWatermark.get_since(odoo_creds, 'hr.applicant', scope)
+            odoo_candidates = odoo_service.get_candidates(job_id=job.odoo_job_id, since=since)
 
-                    if candidate.attachments.exists():
-                        skill_summary = generate_candidate_skill_summary(candidate)
-                        candidate.generated_skill_summary = skill_summary
-                        candidate.save()
-                    
-                    synced_candidates.append(candidate)
-                except Exception as e:
-                    continue
+            synced_candidates = CandidateSyncService._bulk_upsert_candidates(
+                [(job, odoo_candidate) for odoo_candidate in odoo_candidates]
+            )
+            
+            CandidateSyncService._archive_missing_candidates(
+                odoo_service.get_candidate_ids(job_id=job.odoo_job_id),
+                Candidate.objects.filter(job=job)
+            )
+            
+            CandidateSyncService._sync_changed_attachments(
+                Candidate.objects.filter(job=job, is_active=True),
+                synced_candidates,
+                odoo_service,
+                odoo_creds,
+                scope
+            )
+            
+            regenerated = CandidateSyncService.regenerate_dirty_skill_summaries(Candidate.objects.filter(job=job))
+            if on_summaries:
+                on_summaries(regenerated)
+            
+            OdooSyncWatermark.advance(odoo_creds, 'hr.applicant', scope, odoo_candidates)
             
             return synced_candidates
             
         except Exception as e:
             raise
 
+    BULK_BATCH_SIZE = 500
+    CANDIDATE_SYNC_FIELDS = [
+        'name', 'email', 'phone', 'state', 'is_active',
+        'partner_id', 'date_open', 'date_last_stage_update',
+    ]
+
     @staticmethod
-    def _process_single_candidate(odoo_candidate, job):
-        """Process a single candidate from Odoo"""
+    def _candidate_data(odoo_candidate):
+        """Map a single Odoo applicant to Candidate field values"""
         
         candidate_name = odoo_candidate.get('partner_name', 'Unknown Candidate')
         
@@ -77,6 +95,7 @@ class CandidateSyncService:
             'email': odoo_candidate.get('email_from', ''),
             'phone': odoo_candidate.get('phone', '') or odoo_candidate.get('partner_phone', ''),
             'state': state,
+            'is_active': True,
         }
         
         partner_id_data = odoo_candidate.get('partner_id', [False])
@@ -91,43 +110,96 @@ class CandidateSyncService:
             odoo_candidate.get('date_last_stage_update')
         )
         
-        candidate, created = Candidate.objects.update_or_create(
-            job=job,
-            odoo_candidate_id=odoo_candidate['id'],
-            defaults=candidate_data
-        )
+        return candidate_data
+
+    @staticmethod
+    def _bulk_upsert_candidates(job_candidate_pairs):
+        """
+        Reconcile (job, odoo_candidate) pairs against the database with a constant number of
+        statements: one lookup of existing rows, then chunked bulk_create/bulk_update in one transaction.
+        Unchanged rows are not written. Returns the candidates in Odoo order.
+        """
+        incoming = {}
+        for job, odoo_candidate in job_candidate_pairs:
+            try:
+                key = (job.job_id, odoo_candidate['id'])
+                incoming[key] = (job, CandidateSyncService._candidate_data(odoo_candidate))
+            except Exception as e:
+                continue
+        if not incoming:
+            return []
+        
+        existing = {}
+        job_ids = {job_id for job_id, odoo_candidate_id in incoming}
+        odoo_ids = [odoo_candidate_id for job_id, odoo_candidate_id in incoming]
+        for start in range(0, len(odoo_ids), CandidateSyncService.BULK_BATCH_SIZE):
+            for candidate in Candidate.objects.filter(
+                job_id__in=job_ids,
+                odoo_candidate_id__in=odoo_ids[start:start + CandidateSyncService.BULK_BATCH_SIZE]
+            ):
+                existing[(candidate.job_id, candidate.odoo_candidate_id)] = candidate
+        
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        candidates = []
+        for key, (job, candidate_data) in incoming.items():
+            candidate = existing.get(key)
+            if candidate is None:
+                candidate = Candidate(job=job, odoo_candidate_id=key[1], **candidate_data)
+                to_create.append(candidate)
+            else:
+                candidate.job = job
+                changed = False
+                for field, value in candidate_data.items():
+                    if getattr(candidate, field) != value:
+                        setattr(candidate, field, value)
+                        changed = True
+                if changed:
+                    candidate.updated_at = now
+                    to_update.append(candidate)
+            candidates.append(candidate)
+        
+        if not to_create and not to_update:
+            return candidates
+        
+        with transaction.atomic():
+            if to_create:
+                Candidate.objects.bulk_create(to_create, batch_size=CandidateSyncService.BULK_BATCH_SIZE)
+            if to_update:
+                Candidate.objects.bulk_update(
+                    to_update,
+                    CandidateSyncService.CANDIDATE_SYNC_FIELDS + ['updated_at'],
+                    batch_size=CandidateSyncService.BULK_BATCH_SIZE
+                )
+        ResponseCacheService.invalidate(ResponseCacheService.SCOPE_JOB_CANDIDATES, job_ids)
         
-        return candidate
+        return candidates
 
     @staticmethod
-    def sync_candidates_for_company(company, odoo_service=None):
+    def sync_candidates_for_company(company, odoo_service=None, odoo_candidates=None, on_summaries=None):
         """Sync all candidates for a company (all jobs)"""
         try:
+            odoo_creds = CandidateSyncService._get_odoo_credentials(company.recruiter)
+            
             if not odoo_service:
-                recruiter = company.recruiter
-                odoo_creds = OdooCredentials.objects.filter(
-                    recruiter=recruiter
-                ).order_by('-created_at').first()
-                
                 if not odoo_creds:
                     raise ValueError("No Odoo credentials found for this recruiter")
                 
-                odoo_service = OdooService(
-                    db_url=odoo_creds.db_url,
-                    db_name=odoo_creds.db_name,
-                    email=odoo_creds.email_address,
-                    api_key=odoo_creds.get_api_key()
-                )
+                odoo_service = get_odoo_service(odoo_creds)
                 
-                if not odoo_service.authenticate():
+                if not odoo_service:
                     raise Exception("Failed to authenticate with Odoo")
             
             company_jobs = Job.objects.filter(company=company)
             job_titles = [job.job_title for job in company_jobs]
             
-            odoo_candidates = odoo_service.get_candidates(company_id=company.odoo_company_id)
+            scope = f"company:{company.company_id}"
+            if odoo_candidates is None:
+                since = OdooSyncWatermark.get_since(odoo_creds, 'hr.applicant', scope)
+                odoo_candidates = odoo_service.get_candidates(company_id=company.odoo_company_id, since=since)
             
-            synced_count = 0
+            job_candidate_pairs = []
             for odoo_candidate in odoo_candidates:
                 try:
                     job_id_data = odoo_candidate.get('job_id', [False, 'Unknown Job'])
@@ -155,61 +227,113 @@ class CandidateSyncService:
                             defaults={
                                 'job_description': f"Auto-created for candidate sync: {job_title}",
                                 'state': 'open',
+                                'posted_at': timezone.now(),
                                 'expired_at': timezone.now() + timedelta(days=365)
                             }
                         )
                         company_jobs = Job.objects.filter(company=company)  
                     
-                    candidate = CandidateSyncService._process_single_candidate(odoo_candidate, matching_job)
-                    CandidateSyncService.sync_attachments_for_candidate(candidate, odoo_service)
-                    
-                    synced_count += 1
+                    job_candidate_pairs.append((matching_job, odoo_candidate))
                     
                 except Exception as e:
                     continue
             
-            return synced_count
+            synced_candidates = CandidateSyncService._bulk_upsert_candidates(job_candidate_pairs)
+            
+            if company.odoo_company_id:
+                CandidateSyncService._archive_missing_candidates(
+                    odoo_service.get_candidate_ids(company_id=company.odoo_company_id),
+                    Candidate.objects.filter(job__company=company)
+                )
+            
+            CandidateSyncService._sync_changed_attachments(
+                Candidate.objects.filter(job__company=company, is_active=True),
+                synced_candidates,
+                odoo_service,
+                odoo_creds,
+                scope
+            )
+            regenerated = CandidateSyncService.regenerate_dirty_skill_summaries(
+                Candidate.objects.filter(job__company=company)
+            )
+            if on_summaries:
+                on_summaries(regenerated)
+            
+            OdooSyncWatermark.advance(odoo_creds, 'hr.applicant', scope, odoo_candidates)
+            
+            return len(synced_candidates)
             
         except Exception as e:
             raise
 
     @staticmethod
-    def sync_all_candidates_for_recruiter(recruiter):
-        """Sync candidates for all companies of a recruiter"""
+    def sync_all_candidates_for_recruiter(recruiter, on_summaries=None):
+        """
+        Sync candidates for all companies of a recruiter. on_summaries, if given, is called from the
+        company tasks with the number of skill summaries each one regenerated.
+        """
         try:
-            odoo_creds = OdooCredentials.objects.filter(
-                recruiter=recruiter
-            ).order_by('-created_at').first()
+            odoo_creds = CandidateSyncService._get_odoo_credentials(recruiter)
             
             if not odoo_creds:
                 raise ValueError("No Odoo credentials found for this recruiter")
             
-            odoo_service = OdooService(
-                db_url=odoo_creds.db_url,
-                db_name=odoo_creds.db_name,
-                email=odoo_creds.email_address,
-                api_key=odoo_creds.get_api_key()
-            )
+            odoo_service = get_odoo_service(odoo_creds)
             
-            if not odoo_service.authenticate():
+            if not odoo_service:
                 raise Exception("Failed to authenticate with Odoo")
             
             from companies.models import Company
             companies = Company.objects.filter(recruiter=recruiter)
             
-            total_synced = 0
-            for company in companies:
-                try:
-                    synced_count = CandidateSyncService.sync_candidates_for_company(company, odoo_service)
-                    total_synced += synced_count
-                except Exception as e:
-                    continue
+            odoo_company_ids = [company.odoo_company_id for company in companies if company.odoo_company_id]
+            since_by_company = {
+                company.odoo_company_id: OdooSyncWatermark.get_since(
+                    odoo_creds, 'hr.applicant', f"company:{company.company_id}"
+                )
+                for company in companies
+                if company.odoo_company_id
+            }
+            candidates_by_company = odoo_service.get_candidates_batch(
+                company_ids=odoo_company_ids,
+                since=since_by_company
+            )
+            
+            results = run_concurrently(
+                lambda company: CandidateSyncService.sync_candidates_for_company(
+                    company,
+                    odoo_service,
+                    odoo_candidates=candidates_by_company.get(company.odoo_company_id),
+                    on_summaries=on_summaries
+                ),
+                companies
+            )
             
-            return total_synced
+            return sum(synced_count for company, synced_count, error in results if not error)
             
         except Exception as e:
             raise
     
+    @staticmethod
+    def _get_odoo_credentials(recruiter):
+        return OdooCredentials.objects.filter(
+            recruiter=recruiter
+        ).order_by('-created_at').first()
+    
+    @staticmethod
+    def _archive_missing_candidates(active_odoo_ids, candidates):
+        """Mark candidates that were deleted or archived in Odoo as inactive"""
+        archived = candidates.filter(
+            odoo_candidate_id__isnull=False,
+            is_active=True
+        ).exclude(
+            odoo_candidate_id__in=active_odoo_ids
+        )
+        job_ids = set(archived.values_list('job_id', flat=True))
+        updated = archived.update(is_active=False)
+        ResponseCacheService.invalidate(ResponseCacheService.SCOPE_JOB_CANDIDATES, job_ids)
+        return updated
+    
     @staticmethod
     def _map_odoo_stage(odoo_stage_name):
         """Map Odoo stage names to our state choices"""
@@ -231,60 +355,164 @@ class CandidateSyncService:
         if not odoo_date_string:
             return None
         try:
-            return parse_datetime(odoo_date_string)
+            parsed = parse_datetime(odoo_date_string)
         except (ValueError, TypeError):
             return None
+        if parsed and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed, datetime_timezone.utc)
+        return parsed
     
     @staticmethod
     def sync_attachments_for_candidate(candidate, odoo_service):
         """Sync attachments for a single candidate"""
         try:
-            attachments = odoo_service.get_attachments(
-                res_model='hr.applicant',
-                res_id=candidate.odoo_candidate_id
+            CandidateSyncService.sync_attachments_for_candidates([candidate], odoo_service)
+            CandidateSyncService.regenerate_dirty_skill_summaries(
+                Candidate.objects.filter(candidate_id=candidate.candidate_id)
             )
             
-            has_new_attachments = False
-            
-            for attachment_data in attachments:
-                try:
-                    if not CandidateAttachment.objects.filter(
-                        candidate=candidate, 
-                        odoo_attachment_id=attachment_data['id']
-                    ).exists():
-                        CandidateSyncService._process_single_attachment(candidate, attachment_data, odoo_service)
-                        has_new_attachments = True
-                except Exception as e:
-                    continue   
-
-            if has_new_attachments:
-                skill_summary = generate_candidate_skill_summary(candidate)
-                candidate.generated_skill_summary = skill_summary
-                candidate.save()
-            
         except Exception as e:
             return f"Error syncing attachments for candidate {candidate.name}: {str(e)}"
 
     @staticmethod
-    def _process_single_attachment(candidate, attachment_data, odoo_service):
-        """Process a single attachment with base64 decoding"""
+    def sync_attachments_for_candidates(candidates, odoo_service):
+        """
+        Sync attachments for many candidates with one metadata query to Odoo and one
+        lookup of already-stored attachments; file content is only downloaded for new ones.
+        Returns the candidates that received new attachments.
+        """
+        candidates_by_odoo_id = CandidateSyncService._index_by_odoo_id(candidates)
+        if not candidates_by_odoo_id:
+            return []
+        
+        attachments = odoo_service.get_attachments_for_records(
+            res_model='hr.applicant',
+            res_ids=candidates_by_odoo_id.keys()
+        )
+        return CandidateSyncService._store_new_attachments(candidates_by_odoo_id, attachments, odoo_service)
+
+    @staticmethod
+    def _sync_changed_attachments(candidates, synced_candidates, odoo_service, odoo_creds, scope):
+        """
+        Incremental attachment sync: only attachments written since the last watermark are listed,
+        except for candidates synced in this run, whose attachments are always listed in full.
+        """
+        candidates_by_odoo_id = CandidateSyncService._index_by_odoo_id(candidates)
+        if not candidates_by_odoo_id:
+            return []
+        
+        since = OdooSyncWatermark.get_since(odoo_creds, 'ir.attachment', scope)
+        attachments = odoo_service.get_attachments_for_records(
+            res_model='hr.applicant',
+            res_ids=candidates_by_odoo_id.keys(),
+            since=since,
+            include_res_ids=[candidate.odoo_candidate_id for candidate in synced_candidates]
+        )
+        updated_candidates = CandidateSyncService._store_new_attachments(
+            candidates_by_odoo_id, attachments, odoo_service
+        )
+        OdooSyncWatermark.advance(odoo_creds, 'ir.attachment', scope, attachments)
+        return updated_candidates
+
+    @staticmethod
+    def _index_by_odoo_id(candidates):
+        return {
+            candidate.odoo_candidate_id: candidate
+            for candidate in candidates
+            if candidate.odoo_candidate_id
+        }
+
+    @staticmethod
+    def _store_new_attachments(candidates_by_odoo_id, attachments, odoo_service):
+        existing_ids = set(
+            CandidateAttachment.objects.filter(
+                odoo_attachment_id__in=[attachment_data['id'] for attachment_data in attachments]
+            ).values_list('odoo_attachment_id', flat=True)
+        )
+        
+        to_fetch = []
+        for attachment_data in attachments:
+            if attachment_data['id'] in existing_ids:
+                continue
+            candidate = candidates_by_odoo_id.get(attachment_data.get('res_id'))
+            if not candidate:
+                continue
+            existing_ids.add(attachment_data['id'])
+            to_fetch.append((candidate, attachment_data))
+        
+        updated_candidates = {}
+        stored_attachments = []
+        downloads = iter_concurrently(
+            lambda item: CandidateSyncService._download_attachment(item[1], odoo_service),
+            to_fetch,
+            max_workers=getattr(settings, 'ATTACHMENT_DOWNLOAD_CONCURRENCY', 8)
+        )
+        for (candidate, attachment_data), download, error in downloads:
+            try:
+                stored_attachments.append(
+                    CandidateSyncService._process_single_attachment(candidate, attachment_data, download)
+                )
+                updated_candidates[candidate.candidate_id] = candidate
+            except Exception as e:
+                continue
+            finally:
+                if download:
+                    download[1].close()
+        
+        AttachmentTextService.store_for_attachments(stored_attachments)
+        AttachmentPreviewService.store_for_attachments(stored_attachments)
+        if updated_candidates:
+            Candidate.objects.filter(candidate_id__in=updated_candidates.keys()).update(skill_summary_dirty=True)
+        return list(updated_candidates.values())
+
+    @staticmethod
+    def regenerate_dirty_skill_summaries(candidates):
+        """
+        Regenerate the skill summary once for every candidate that attachment ingestion marked
+        dirty, after all of its attachments are stored. Candidates whose summary could not be
+        generated stay dirty so the next sync retries them. Returns the number regenerated.
+        """
+        regenerated = 0
+        for candidate in candidates.filter(skill_summary_dirty=True).select_related('job'):
+            try:
+                summary = generate_candidate_skill_summary(candidate)
+            except Exception as e:
+                continue
+            if not summary:
+                continue
+            candidate.generated_skill_summary = summary
+            candidate.skill_summary_dirty = False
+            candidate.save(update_fields=['generated_skill_summary', 'skill_summary_dirty', 'updated_at'])
+            regenerated += 1
+        return regenerated
+
+    @staticmethod
+    def _download_attachment(attachment_data, odoo_service):
+        """
+        Stream one attachment's content into a temporary file. Runs on the download pool, so it
+        must not touch the database. Returns (detail, file, writer); detail is None without content.
+        """
+        buffer = tempfile.TemporaryFile()
+        try:
+            writer = HashingWriter(buffer)
+            attachment_detail = odoo_service.stream_attachment_content(attachment_data['id'], writer)
+            buffer.seek(0)
+            return attachment_detail, buffer, writer
+        except Exception as e:
+            buffer.close()
+            raise
+
+    @staticmethod
+    def _process_single_attachment(candidate, attachment_data, download):
+        """Store a downloaded attachment (or record a failed one) against its shared blob"""
         attachment_id = attachment_data['id']
         attachment_name = attachment_data.get('name', f'attachment_{attachment_id}')
         attachment_type = attachment_data.get('mimetype', 'application/octet-stream')
         
-        if CandidateAttachment.objects.filter(
-            candidate=candidate, 
-            odoo_attachment_id=attachment_id
-        ).exists():
-            return
-        
         try:
-            attachment_detail = odoo_service.get_attachment_content(attachment_id)
+            attachment_detail, buffer, writer = download or (None, None, None)
             
-            if attachment_detail and 'datas' in attachment_detail:
-                base64_data = attachment_detail['datas']
-                file_content = base64.b64decode(base64_data)
-                
+            if attachment_detail:
                 original_filename = attachment_detail.get('datas_fname', attachment_detail.get('name', f'attachment_{attachment_id}'))
                 
                 file_extension = CandidateSyncService._get_file_extension(
@@ -303,25 +531,26 @@ class CandidateSyncService:
                     odoo_attachment_id=attachment_id,
                     name=attachment_name,
                     file_type=attachment_type,
-                    file_size=len(file_content),
+                    file_size=writer.size,
+                    checksum=writer.checksum,
                     original_filename=original_filename
                 )
                 
-                attachment.file.save(file_name, ContentFile(file_content))
-                attachment.save()
+                with transaction.atomic():
+                    AttachmentBlobService.attach(attachment, writer.checksum, buffer, writer.size, file_name)
+                    attachment.save()
+                return attachment
                                 
-            else:
-
-                attachment = CandidateAttachment(
-                    candidate=candidate,
-                    odoo_attachment_id=attachment_id,
-                    name=attachment_name,
-                    file_type=attachment_type,
-                    file_size=0,
-                    sync_status='failed',
-                    original_filename=attachment_name  
-                )
-                attachment.save()
+            attachment = CandidateAttachment(
+                candidate=candidate,
+                odoo_attachment_id=attachment_id,
+                name=attachment_name,
+                file_type=attachment_type,
+                file_size=0,
+                sync_status='failed',
+                original_filename=attachment_name  
+            )
+            attachment.save()
                 
         except Exception as e:
             attachment = CandidateAttachment(
@@ -334,12 +563,7 @@ class CandidateSyncService:
                 original_filename=attachment_name 
             )
             attachment.save()
-        try:
-            skill_summary = generate_candidate_skill_summary(candidate)
-            candidate.generated_skill_summary = skill_summary
-            candidate.save()
-        except Exception as e:
-            return f"Failed to regenerate skill summary after adding attachment: {str(e)}"
+        return attachment
 
     @staticmethod
     def _get_file_extension(mimetype, original_filename):
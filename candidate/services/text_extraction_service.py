@@ -0,0 +1,199 @@
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from django.conf import settings
+from .utils import ExtractionTimeout, extract_text_with_limits, extract_text_with_timeout
+
+logger = logging.getLogger(__name__)
+
+_pool_lock = threading.Lock()
+_pool = None
+
+
+class TextExtractionService:
+    """
+    Runs document parsers in a process pool so CPU-heavy parsing never blocks web or sync
+    threads, with a wall-clock timeout per format, page/row caps and a token budget on the output.
+    """
+    DEFAULT_TIMEOUT = 15
+    FORMAT_TIMEOUTS = {
+        '.pdf': 30,
+        '.txt': 5,
+    }
+    CHARS_PER_TOKEN = 4
+
+    @staticmethod
+    def extract(file_path):
+        """
+        Extract one file. Returns {'text', 'limits_hit', 'error', 'transient'}; transient errors
+        (timeouts, a broken pool) may not recur and should not be stored as the file's result.
+        """
+        return TextExtractionService.extract_many([file_path])[file_path]
+
+    @staticmethod
+    def extract_many(file_paths):
+        """
+        Extract several files in parallel on the pool and return results keyed by path.
+        Files that time out or fail to parse get an error instead of text.
+        """
+        file_paths = list(dict.fromkeys(file_paths))
+        if not file_paths:
+            return {}
+        limits = TextExtractionService._limits()
+
+        pool, workers = TextExtractionService._get_pool()
+        if pool is None:
+            return {file_path: TextExtractionService._inline(file_path, limits) for file_path in file_paths}
+
+        try:
+            futures = [
+                (file_path, pool.submit(
+                    extract_text_with_timeout,
+                    file_path,
+                    TextExtractionService.timeout_for(file_path),
+                    *limits
+                ))
+                for file_path in file_paths
+            ]
+        except BrokenExecutor as e:
+            logger.warning(f"Text extraction pool is broken, starting a new one on next use: {str(e)}")
+            TextExtractionService._discard_pool(pool)
+            return {
+                file_path: TextExtractionService._failure('Text extraction pool failed', transient=True)
+                for file_path in file_paths
+            }
+
+        # Workers enforce each file's timeout themselves; this backstop only fires if a worker
+        # stops responding altogether (e.g. stuck in C code that ignores the alarm).
+        rounds = math.ceil(len(file_paths) / workers) + 1
+        deadline = time.monotonic() + rounds * max(TextExtractionService.timeout_for(path) for path in file_paths)
+
+        results = {}
+        pool_stuck = False
+        for file_path, future in futures:
+            try:
+                text, limits_hit = future.result(timeout=max(deadline - time.monotonic(), 0))
+                results[file_path] = TextExtractionService._finish(text, limits_hit)
+            except (ExtractionTimeout, FutureTimeoutError) as e:
+                if isinstance(e, FutureTimeoutError):
+                    pool_stuck = True
+                logger.warning(f"Text extraction timed out for {file_path}")
+                results[file_path] = TextExtractionService._failure(
+                    'Text extraction timed out', limits_hit=['timeout'], transient=True
+                )
+            except BrokenExecutor as e:
+                pool_stuck = True
+                logger.warning(f"Text extraction pool failed on {file_path}: {str(e)}")
+                results[file_path] = TextExtractionService._failure('Text extraction pool failed', transient=True)
+            except Exception as e:
+                results[file_path] = TextExtractionService._failure(str(e) or e.__class__.__name__)
+
+        if pool_stuck:
+            TextExtractionService._discard_pool(pool)
+        return results
+
+    @staticmethod
+    def run_in_pool(func, file_path, *args):
+        """
+        Call func(file_path, *args) on the pool, or inline when TEXT_EXTRACTION_WORKERS is 0, and
+        return its result. Raises ExtractionTimeout after the file's timeout, discarding the pool
+        if the call was already running; a broken pool is discarded and its error re-raised.
+        """
+        pool, workers = TextExtractionService._get_pool()
+        if pool is None:
+            return func(file_path, *args)
+        try:
+            future = pool.submit(func, file_path, *args)
+            return future.result(timeout=TextExtractionService.timeout_for(file_path))
+        except FutureTimeoutError:
+            if not future.cancel():
+                TextExtractionService._discard_pool(pool)
+            raise ExtractionTimeout(f"Processing {os.path.basename(file_path)} timed out")
+        except BrokenExecutor:
+            TextExtractionService._discard_pool(pool)
+            raise
+
+    @staticmethod
+    def timeout_for(file_path):
+        file_ext = os.path.splitext(file_path)[1].lower()
+        timeouts = {**TextExtractionService.FORMAT_TIMEOUTS, **getattr(settings, 'TEXT_EXTRACTION_TIMEOUTS', {})}
+        return timeouts.get(file_ext, TextExtractionService.DEFAULT_TIMEOUT)
+
+    @staticmethod
+    def truncate_to_budget(text, max_tokens=None):
+        """Cut text to roughly max_tokens (about four characters each), on a word boundary when possible"""
+        if max_tokens is None:
+            max_tokens = getattr(settings, 'TEXT_EXTRACTION_TOKEN_BUDGET', 8000)
+        max_chars = max_tokens * TextExtractionService.CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text, False
+        cut = text[:max_chars]
+        boundary = cut.rfind(' ')
+        if boundary > max_chars * 0.8:
+            cut = cut[:boundary]
+        return cut, True
+
+    @staticmethod
+    def _limits():
+        """(max_pages, max_rows, max_chars) passed to the parsers"""
+        token_budget = getattr(settings, 'TEXT_EXTRACTION_TOKEN_BUDGET', 8000)
+        return (
+            getattr(settings, 'TEXT_EXTRACTION_MAX_PAGES', 20),
+            getattr(settings, 'TEXT_EXTRACTION_MAX_ROWS', 2000),
+            token_budget * TextExtractionService.CHARS_PER_TOKEN,
+        )
+
+    @staticmethod
+    def _finish(text, limits_hit):
+        text, truncated = TextExtractionService.truncate_to_budget(text or '')
+        limits_hit = list(limits_hit)
+        if truncated:
+            limits_hit.append('tokens')
+        return {'text': text, 'limits_hit': limits_hit, 'error': '', 'transient': False}
+
+    @staticmethod
+    def _failure(error, limits_hit=None, transient=False):
+        return {'text': '', 'limits_hit': limits_hit or [], 'error': error, 'transient': transient}
+
+    @staticmethod
+    def _inline(file_path, limits):
+        try:
+            text, limits_hit = extract_text_with_limits(file_path, *limits)
+            return TextExtractionService._finish(text, limits_hit)
+        except Exception as e:
+            return TextExtractionService._failure(str(e) or e.__class__.__name__)
+
+    @staticmethod
+    def _get_pool():
+        """Shared (pool, workers), or (None, 0) when TEXT_EXTRACTION_WORKERS is 0 and parsing runs inline"""
+        global _pool
+        workers = getattr(settings, 'TEXT_EXTRACTION_WORKERS', None)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 0:
+            return None, 0
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return _pool, workers
+
+    @staticmethod
+    def _discard_pool(pool):
+        """
+        ProcessPoolExecutor cannot cancel a running task, so terminate the stuck pool's processes
+        and start a fresh pool on next use.
+        """
+        global _pool
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        for process in list((getattr(pool, '_processes', None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
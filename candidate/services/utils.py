@@ -1,5 +1,9 @@
 import os
-from pdfminer.high_level import extract_text as extract_pdf_text
+import signal
+import threading
+import pypdfium2
+from pdfminer.high_level import extract_text as pdfminer_extract_text
+from pdfminer.pdfpage import PDFPage
 from docx import Document
 import openpyxl
 import pptx
@@ -9,28 +13,83 @@ def extract_text_from_file(file_path):
     """
     Extract text from various file types
     """
+    text, limits_hit = extract_text_with_limits(file_path)
+    return text
+
+class ExtractionTimeout(Exception):
+    pass
+
+# PDFium is not thread-safe, so every use of it in a process goes through this lock.
+_pdfium_lock = threading.Lock()
+
+def render_pdf_first_page(file_path, max_size):
+    """Render the first page of a PDF as a PIL image whose longer side is max_size"""
+    with _pdfium_lock:
+        pdf = pypdfium2.PdfDocument(file_path)
+        try:
+            if len(pdf) == 0:
+                raise Exception("PDF has no pages")
+            page = pdf[0]
+            width, height = page.get_size()
+            image = page.render(scale=max_size / max(width, height, 1)).to_pil()
+            page.close()
+        finally:
+            pdf.close()
+    return image
+
+def extract_text_with_timeout(file_path, timeout, max_pages=None, max_rows=None, max_chars=None):
+    """
+    Run extract_text_with_limits under a SIGALRM wall-clock limit. Meant for the main thread of
+    an extraction worker process; without SIGALRM the limit is left to the caller.
+    """
+    if not hasattr(signal, 'setitimer'):
+        return extract_text_with_limits(file_path, max_pages, max_rows, max_chars)
+
+    def on_timeout(signum, frame):
+        raise ExtractionTimeout(f"Text extraction exceeded {timeout}s")
+
+    previous_handler = signal.signal(signal.SIGALRM, on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_text_with_limits(file_path, max_pages, max_rows, max_chars)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+def extract_text_with_limits(file_path, max_pages=None, max_rows=None, max_chars=None):
+    """
+    Extract text, reading at most max_pages PDF pages or slides, max_rows spreadsheet rows and
+    max_chars characters of plain text. Returns (text, limits_hit)
+    """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
-    
+
     file_ext = os.path.splitext(file_path)[1].lower()
-    
+
     if file_ext == '.pdf':
-        return extract_pdf_text(file_path)
+        return extract_pdf_text(file_path, max_pages)
     elif file_ext in ['.doc', '.docx']:
-        return extract_docx_text(file_path)
+        return extract_docx_text(file_path), []
     elif file_ext == '.txt':
-        return extract_txt_text(file_path)
+        return extract_txt_text(file_path, max_chars)
     elif file_ext in ['.xls', '.xlsx']:
-        return extract_excel_text(file_path)
+        return extract_excel_text(file_path, max_rows)
     elif file_ext in ['.ppt', '.pptx']:
-        return extract_pptx_text(file_path)
+        return extract_pptx_text(file_path, max_pages)
     else:
         raise ValueError(f"Unsupported file type: {file_ext}")
 
-def extract_pdf_text(file_path):
+def extract_pdf_text(file_path, max_pages=None):
     """Extract text from PDF files"""
     try:
-        return extract_pdf_text(file_path)
+        limits_hit = []
+        if max_pages:
+            with open(file_path, 'rb') as pdf_file:
+                for page_count, page in enumerate(PDFPage.get_pages(pdf_file), start=1):
+                    if page_count > max_pages:
+                        limits_hit.append('pages')
+                        break
+        return pdfminer_extract_text(file_path, maxpages=max_pages or 0), limits_hit
     except Exception as e:
         raise
 
@@ -42,40 +101,48 @@ def extract_docx_text(file_path):
     except Exception as e:
         raise
 
-def extract_txt_text(file_path):
+def extract_txt_text(file_path, max_chars=None):
     """Extract text from TXT files"""
+    read_size = max_chars + 1 if max_chars else -1
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
+            text = file.read(read_size)
     except UnicodeDecodeError:
         try:
             with open(file_path, 'r', encoding='latin-1') as file:
-                return file.read()
+                text = file.read(read_size)
         except Exception as e:
             raise
+    if max_chars and len(text) > max_chars:
+        return text[:max_chars], ['chars']
+    return text, []
 
-def extract_excel_text(file_path):
+def extract_excel_text(file_path, max_rows=None):
     """Extract text from Excel files"""
     try:
         workbook = openpyxl.load_workbook(file_path, read_only=True)
         text = []
         for sheet in workbook:
             for row in sheet.iter_rows(values_only=True):
+                if max_rows and len(text) >= max_rows:
+                    return "\n".join(text), ['rows']
                 row_text = [str(cell) if cell is not None else "" for cell in row]
                 text.append("\t".join(row_text))
-        return "\n".join(text)
+        return "\n".join(text), []
     except Exception as e:
         raise
 
-def extract_pptx_text(file_path):
+def extract_pptx_text(file_path, max_pages=None):
     """Extract text from PowerPoint files"""
     try:
         prs = pptx.Presentation(file_path)
         text = []
-        for slide in prs.slides:
+        for slide_number, slide in enumerate(prs.slides, start=1):
+            if max_pages and slide_number > max_pages:
+                return "\n".join(text), ['pages']
             for shape in slide.shapes:
                 if hasattr(shape, "text"):
                     text.append(shape.text)
-        return "\n".join(text)
+        return "\n".join(text), []
     except Exception as e:
-        raise
\ No newline at end of file
+        raise
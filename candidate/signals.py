@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from candidate.models import CandidateAttachment
+from candidate.services.attachment_blob_service import AttachmentBlobService
+
+
+@receiver(post_delete, sender=CandidateAttachment)
+def release_attachment_blob(sender, instance, **kwargs):
+    if instance.blob_id:
+        AttachmentBlobService.release(instance.blob_id)
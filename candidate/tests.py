@@ -0,0 +1,458 @@
+import hashlib
+import os
+import threading
+import shutil
+import tempfile
+import io
+import openpyxl
+from unittest.mock import MagicMock, patch
+from PIL import Image
+from reportlab.pdfgen import canvas
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from users.models import Recruiter, OdooCredentials, OdooSyncWatermark
+from companies.models import Company
+from job.models import Job
+from candidate.models import Candidate, CandidateAttachment, AttachmentText, AttachmentBlob, AttachmentPreview
+from candidate.services.candidate_sync_service import CandidateSyncService
+from candidate.services.attachment_text_service import AttachmentTextService
+from candidate.services.attachment_preview_service import AttachmentPreviewService
+from candidate.services.text_extraction_service import TextExtractionService
+from candidate.services import utils as extraction_utils
+from recos.concurrency import run_concurrently
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def _streamed_content(content, name):
+    def stream_attachment_content(attachment_id, destination):
+        destination.write(content)
+        return {'name': name, 'mimetype': 'text/plain'}
+    return stream_attachment_content
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, TEXT_EXTRACTION_WORKERS=0)
+class CandidateAttachmentSyncTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.recruiter = Recruiter.objects.create_user(
+            email='sync@example.com',
+            first_name='Sync',
+            last_name='Tester',
+            password='testpass123'
+        )
+        self.company = Company.objects.create(company_name='Sync Co', recruiter=self.recruiter)
+        self.job = Job.objects.create(
+            company=self.company,
+            job_title='Backend Developer',
+            job_description='Build APIs',
+            posted_at=timezone.now()
+        )
+        self.first = Candidate.objects.create(job=self.job, odoo_candidate_id=11, name='First', email='first@example.com')
+        self.second = Candidate.objects.create(job=self.job, odoo_candidate_id=12, name='Second', email='second@example.com')
+        CandidateAttachment.objects.create(
+            candidate=self.first,
+            odoo_attachment_id=100,
+            name='existing.pdf',
+            file_type='application/pdf'
+        )
+
+    @patch('candidate.services.candidate_sync_service.generate_candidate_skill_summary', return_value='summary')
+    def test_bulk_sync_only_downloads_new_attachments(self, mock_summary):
+        odoo_service = MagicMock()
+        odoo_service.get_attachments_for_records.return_value = [
+            {'id': 100, 'res_id': 11, 'name': 'existing.pdf', 'mimetype': 'application/pdf'},
+            {'id': 101, 'res_id': 12, 'name': 'cv.txt', 'mimetype': 'text/plain'},
+        ]
+        odoo_service.stream_attachment_content.side_effect = _streamed_content(b'Python developer', 'cv.txt')
+
+        updated = CandidateSyncService.sync_attachments_for_candidates([self.first, self.second], odoo_service)
+
+        odoo_service.get_attachments_for_records.assert_called_once()
+        self.assertEqual(odoo_service.stream_attachment_content.call_args[0][0], 101)
+        odoo_service.stream_attachment_content.assert_called_once()
+        self.assertEqual(updated, [self.second])
+        attachment = CandidateAttachment.objects.get(odoo_attachment_id=101)
+        self.assertEqual(attachment.candidate, self.second)
+        self.assertEqual(attachment.file_size, len(b'Python developer'))
+        self.assertEqual(attachment.checksum, hashlib.sha256(b'Python developer').hexdigest())
+        self.assertEqual(attachment.file.read(), b'Python developer')
+
+    @patch('candidate.services.candidate_sync_service.generate_candidate_skill_summary', return_value='summary')
+    def test_summary_regenerated_once_after_all_new_attachments(self, mock_summary):
+        odoo_service = MagicMock()
+        odoo_service.get_attachments_for_records.return_value = [
+            {'id': attachment_id, 'res_id': 12, 'name': f'doc{attachment_id}.txt', 'mimetype': 'text/plain'}
+            for attachment_id in range(201, 206)
+        ]
+        odoo_service.stream_attachment_content.side_effect = _streamed_content(b'Experience', 'doc.txt')
+
+        CandidateSyncService.sync_attachments_for_candidate(self.second, odoo_service)
+
+        self.assertEqual(odoo_service.stream_attachment_content.call_count, 5)
+        mock_summary.assert_called_once()
+        self.second.refresh_from_db()
+        self.assertEqual(self.second.generated_skill_summary, 'summary')
+        self.assertFalse(self.second.skill_summary_dirty)
+
+    @patch('candidate.services.candidate_sync_service.generate_candidate_skill_summary', return_value='')
+    def test_failed_summary_is_not_saved_and_stays_dirty(self, mock_summary):
+        Candidate.objects.filter(pk=self.second.pk).update(skill_summary_dirty=True, generated_skill_summary='old summary')
+
+        regenerated = CandidateSyncService.regenerate_dirty_skill_summaries(Candidate.objects.filter(pk=self.second.pk))
+
+        self.assertEqual(regenerated, 0)
+        self.second.refresh_from_db()
+        self.assertEqual(self.second.generated_skill_summary, 'old summary')
+        self.assertTrue(self.second.skill_summary_dirty)
+
+    @patch('candidate.services.candidate_sync_service.generate_candidate_skill_summary', return_value='summary')
+    def test_identical_files_share_one_blob_until_last_reference_goes(self, mock_summary):
+        odoo_service = MagicMock()
+        odoo_service.get_attachments_for_records.return_value = [
+            {'id': 401, 'res_id': 11, 'name': 'cv.txt', 'mimetype': 'text/plain'},
+            {'id': 402, 'res_id': 12, 'name': 'cv.txt', 'mimetype': 'text/plain'},
+        ]
+        odoo_service.stream_attachment_content.side_effect = _streamed_content(b'Same CV', 'cv.txt')
+
+        CandidateSyncService.sync_attachments_for_candidates([self.first, self.second], odoo_service)
+
+        first, second = CandidateAttachment.objects.filter(odoo_attachment_id__in=[401, 402]).order_by('odoo_attachment_id')
+        blob = AttachmentBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(first.blob, blob)
+
+        first.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(AttachmentBlob.objects.exists())
+        self.assertFalse(blob.file.storage.exists(blob.file.name))
+
+
+class CandidateIncrementalSyncTests(TestCase):
+    @override_settings(ODOO_API_ENCRYPTION_KEY='this_is_a_test_key_for_encryption_32bytes')
+    def setUp(self):
+        self.recruiter = Recruiter.objects.create_user(
+            email='delta@example.com',
+            first_name='Delta',
+            last_name='Tester',
+            password='testpass123'
+        )
+        self.credentials = OdooCredentials.objects.create(
+            odoo_user_id=3,
+            recruiter=self.recruiter,
+            api_key='key',
+            email_address='odoo@example.com',
+            db_name='delta_db',
+            db_url='https://delta.odoo.com'
+        )
+        self.company = Company.objects.create(company_name='Delta Co', recruiter=self.recruiter)
+        self.job = Job.objects.create(
+            company=self.company,
+            odoo_job_id=42,
+            job_title='Data Engineer',
+            job_description='Pipelines',
+            posted_at=timezone.now()
+        )
+        self.removed = Candidate.objects.create(job=self.job, odoo_candidate_id=21, name='Removed', email='removed@example.com')
+
+    def test_job_without_odoo_link_is_not_synced(self):
+        self.job.odoo_job_id = None
+        self.job.save()
+        odoo_service = MagicMock()
+
+        with self.assertRaisesMessage(ValueError, 'not linked to an Odoo job'):
+            CandidateSyncService.sync_candidates_for_job(self.job, odoo_service)
+
+        odoo_service.get_candidates.assert_not_called()
+        self.assertIsNone(OdooSyncWatermark.get_since(self.credentials, 'hr.applicant', f"job:{self.job.job_id}"))
+
+    @patch('candidate.services.candidate_sync_service.generate_candidate_skill_summary', return_value='summary')
+    def test_job_sync_uses_watermark_and_archives_missing(self, mock_summary):
+        OdooSyncWatermark.advance(self.credentials, 'hr.applicant', f"job:{self.job.job_id}", [
+            {'id': 20, 'write_date': '2025-03-01 12:00:00'},
+        ])
+        odoo_service = MagicMock()
+        odoo_service.get_candidates.return_value = [
+            {'id': 22, 'partner_name': 'Changed', 'email_from': 'changed@example.com', 'write_date': '2025-03-02 09:00:00'},
+        ]
+        odoo_service.get_candidate_ids.return_value = [22]
+        odoo_service.get_attachments_for_records.return_value = []
+
+        synced = CandidateSyncService.sync_candidates_for_job(self.job, odoo_service)
+
+        odoo_service.get_candidates.assert_called_once_with(job_id=42, since='2025-03-01 12:00:00')
+        self.assertEqual([candidate.odoo_candidate_id for candidate in synced], [22])
+        self.removed.refresh_from_db()
+        self.assertFalse(self.removed.is_active)
+        self.assertEqual(
+            OdooSyncWatermark.get_since(self.credentials, 'hr.applicant', f"job:{self.job.job_id}"),
+            '2025-03-02 09:00:00'
+        )
+
+
+class CandidateBulkUpsertTests(TestCase):
+    def setUp(self):
+        recruiter = Recruiter.objects.create_user(
+            email='bulk@example.com',
+            first_name='Bulk',
+            last_name='Tester',
+            password='testpass123'
+        )
+        company = Company.objects.create(company_name='Bulk Co', recruiter=recruiter)
+        self.job = Job.objects.create(
+            company=company,
+            job_title='QA Engineer',
+            job_description='Testing',
+            posted_at=timezone.now()
+        )
+        self.existing = Candidate.objects.create(
+            job=self.job, odoo_candidate_id=1, name='Old Name', email='one@example.com'
+        )
+
+    def _odoo_candidate(self, odoo_id, name):
+        return {
+            'id': odoo_id,
+            'partner_name': name,
+            'email_from': f'{odoo_id}@example.com',
+            'stage_id': [1, 'Qualified'],
+            'date_open': '2025-02-01 09:00:00',
+        }
+
+    def test_upsert_uses_constant_number_of_queries(self):
+        pairs = [(self.job, self._odoo_candidate(odoo_id, f'Candidate {odoo_id}')) for odoo_id in range(1, 51)]
+
+        with self.assertNumQueries(5):
+            candidates = CandidateSyncService._bulk_upsert_candidates(pairs)
+
+        self.assertEqual(len(candidates), 50)
+        self.assertEqual(Candidate.objects.filter(job=self.job).count(), 50)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.name, 'Candidate 1')
+        self.assertEqual(self.existing.state, 'qualified')
+
+    def test_unchanged_candidates_are_not_written(self):
+        pairs = [(self.job, self._odoo_candidate(1, 'Same'))]
+        CandidateSyncService._bulk_upsert_candidates(pairs)
+
+        with self.assertNumQueries(1):
+            CandidateSyncService._bulk_upsert_candidates(pairs)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, TEXT_EXTRACTION_WORKERS=0)
+class AttachmentTextStoreTests(TestCase):
+    def setUp(self):
+        recruiter = Recruiter.objects.create_user(
+            email='text@example.com',
+            first_name='Text',
+            last_name='Tester',
+            password='testpass123'
+        )
+        company = Company.objects.create(company_name='Text Co', recruiter=recruiter)
+        job = Job.objects.create(
+            company=company,
+            job_title='Analyst',
+            job_description='Numbers',
+            posted_at=timezone.now()
+        )
+        candidate = Candidate.objects.create(job=job, odoo_candidate_id=31, name='Reader', email='reader@example.com')
+        self.attachments = []
+        for odoo_attachment_id in (301, 302):
+            attachment = CandidateAttachment(
+                candidate=candidate,
+                odoo_attachment_id=odoo_attachment_id,
+                name='cv.txt',
+                file_type='text/plain'
+            )
+            attachment.file.save(f'cv_{odoo_attachment_id}.txt', ContentFile(b'Spreadsheets and SQL'))
+            self.attachments.append(attachment)
+
+    def test_identical_files_are_extracted_once(self):
+        with patch(
+            'candidate.services.attachment_text_service.TextExtractionService.extract',
+            return_value={'text': 'Spreadsheets and SQL', 'limits_hit': [], 'error': ''}
+        ) as mock_extract:
+            texts = [AttachmentTextService.get_text(attachment) for attachment in self.attachments * 2]
+
+        self.assertEqual(texts, ['Spreadsheets and SQL'] * 4)
+        mock_extract.assert_called_once()
+        self.assertEqual(AttachmentText.objects.count(), 1)
+
+    def test_backfill_command_populates_store(self):
+        call_command('backfill_attachment_text', stdout=MagicMock())
+
+        self.attachments[0].refresh_from_db()
+        self.assertEqual(len(self.attachments[0].checksum), 64)
+        self.assertEqual(AttachmentText.objects.get(checksum=self.attachments[0].checksum).text, 'Spreadsheets and SQL')
+
+    def test_timed_out_extraction_is_not_stored(self):
+        timed_out = {'text': '', 'limits_hit': ['timeout'], 'error': 'Text extraction timed out', 'transient': True}
+        parsed = {'text': 'Spreadsheets and SQL', 'limits_hit': [], 'error': '', 'transient': False}
+        with patch(
+            'candidate.services.attachment_text_service.TextExtractionService.extract',
+            side_effect=[timed_out, parsed]
+        ):
+            with self.assertRaisesMessage(Exception, 'Text extraction timed out'):
+                AttachmentTextService.get_text(self.attachments[0])
+            self.assertFalse(AttachmentText.objects.exists())
+
+            self.assertEqual(AttachmentTextService.get_text(self.attachments[0]), 'Spreadsheets and SQL')
+
+    def test_backfill_command_can_retry_stored_errors(self):
+        AttachmentTextService.store_for_attachments(self.attachments)
+        AttachmentText.objects.update(text='', error='Text extraction timed out')
+
+        call_command('backfill_attachment_text', retry_errors=True, stdout=MagicMock())
+
+        self.assertEqual(AttachmentText.objects.get().text, 'Spreadsheets and SQL')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, ATTACHMENT_PREVIEW_MAX_SIZE=64)
+class AttachmentPreviewTests(TestCase):
+    def setUp(self):
+        recruiter = Recruiter.objects.create_user(
+            email='preview@example.com',
+            first_name='Pre',
+            last_name='View',
+            password='testpass123'
+        )
+        company = Company.objects.create(company_name='Preview Co', recruiter=recruiter)
+        job = Job.objects.create(company=company, job_title='Designer', job_description='Pixels', posted_at=timezone.now())
+        self.candidate = Candidate.objects.create(job=job, odoo_candidate_id=51, name='Viewer', email='viewer@example.com')
+
+    def _attachment(self, odoo_attachment_id, filename, content):
+        attachment = CandidateAttachment(
+            candidate=self.candidate,
+            odoo_attachment_id=odoo_attachment_id,
+            name=filename,
+            file_type='application/octet-stream',
+            checksum=hashlib.sha256(content).hexdigest()
+        )
+        attachment.file.save(filename, ContentFile(content))
+        return attachment
+
+    def test_pdf_first_page_is_rendered_once_per_content(self):
+        document = io.BytesIO()
+        pdf = canvas.Canvas(document)
+        pdf.drawString(100, 700, 'Curriculum vitae')
+        pdf.showPage()
+        pdf.save()
+        attachments = [self._attachment(501 + offset, 'cv.pdf', document.getvalue()) for offset in range(2)]
+
+        self.assertEqual(AttachmentPreviewService.store_for_attachments(attachments), 1)
+
+        preview = AttachmentPreviewService.get_preview(attachments[1])
+        self.assertEqual(AttachmentPreview.objects.count(), 1)
+        self.assertEqual(max(preview.width, preview.height), 64)
+        with preview.image.open('rb') as image_file:
+            self.assertEqual(Image.open(image_file).format, 'WEBP')
+
+    def test_preview_is_rendered_lazily_and_failures_are_remembered(self):
+        image = io.BytesIO()
+        Image.new('P', (300, 150)).save(image, 'GIF')
+        photo = self._attachment(511, 'photo.gif', image.getvalue())
+        broken = self._attachment(512, 'broken.pdf', b'not a pdf')
+
+        self.assertEqual(AttachmentPreviewService.get_preview(photo).width, 64)
+        with patch.object(AttachmentPreviewService, 'render', side_effect=Exception('corrupt')) as mock_render:
+            self.assertIsNone(AttachmentPreviewService.get_preview(broken))
+            self.assertIsNone(AttachmentPreviewService.get_preview(broken))
+        mock_render.assert_called_once()
+        self.assertIsNone(AttachmentPreviewService.get_preview(self._attachment(513, 'notes.txt', b'notes')))
+
+
+class PreviewRenderingTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.path = os.path.join(self.directory, 'cv.pdf')
+        pdf = canvas.Canvas(self.path)
+        pdf.drawString(100, 700, 'Curriculum vitae')
+        pdf.showPage()
+        pdf.save()
+
+    def _render_from_threads(self):
+        results = run_concurrently(
+            lambda index: AttachmentPreviewService.render(self.path, True, 64),
+            range(6),
+            max_workers=6
+        )
+        self.assertEqual([error for index, image, error in results], [None] * 6)
+        return [image for index, image, error in results]
+
+    @override_settings(TEXT_EXTRACTION_WORKERS=0)
+    def test_inline_renders_from_many_threads_never_overlap(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+        original = extraction_utils.pypdfium2.PdfDocument
+
+        def open_document(*args, **kwargs):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            threading.Event().wait(0.02)
+            document = original(*args, **kwargs)
+            close = document.close
+
+            def close_document():
+                close()
+                with lock:
+                    state['active'] -= 1
+            document.close = close_document
+            return document
+
+        with patch.object(extraction_utils.pypdfium2, 'PdfDocument', side_effect=open_document):
+            images = self._render_from_threads()
+
+        self.assertEqual(state['peak'], 1)
+        self.assertEqual({max(image.size) for image in images}, {64})
+
+    @override_settings(TEXT_EXTRACTION_WORKERS=2)
+    def test_pool_renders_from_many_threads(self):
+        images = self._render_from_threads()
+
+        self.assertEqual({max(image.size) for image in images}, {64})
+
+
+class TextExtractionTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    @override_settings(TEXT_EXTRACTION_WORKERS=0, TEXT_EXTRACTION_MAX_ROWS=3, TEXT_EXTRACTION_TOKEN_BUDGET=5)
+    def test_reports_row_cap_and_token_budget(self):
+        workbook = openpyxl.Workbook()
+        for row in range(10):
+            workbook.active.append([f'skill {row}', 'python developer with ten years of experience'])
+        path = os.path.join(self.directory, 'skills.xlsx')
+        workbook.save(path)
+
+        result = TextExtractionService.extract(path)
+
+        self.assertEqual(result['limits_hit'], ['rows', 'tokens'])
+        self.assertLessEqual(len(result['text']), 5 * TextExtractionService.CHARS_PER_TOKEN)
+        self.assertEqual(result['error'], '')
+
+    @override_settings(TEXT_EXTRACTION_WORKERS=1, TEXT_EXTRACTION_TIMEOUTS={'.txt': 1})
+    def test_pool_worker_times_out_and_stays_usable(self):
+        blocked_path = os.path.join(self.directory, 'blocked.txt')
+        os.mkfifo(blocked_path)
+        readable_path = os.path.join(self.directory, 'cv.txt')
+        with open(readable_path, 'w') as readable:
+            readable.write('Go and Rust')
+
+        results = TextExtractionService.extract_many([blocked_path, readable_path])
+
+        self.assertEqual(results[blocked_path]['limits_hit'], ['timeout'])
+        self.assertTrue(results[blocked_path]['transient'])
+        self.assertEqual(results[readable_path]['text'], 'Go and Rust')
@@ -1,19 +1,21 @@
 import os
 import mimetypes
-import base64
-from django.core.files.base import ContentFile
+import tempfile
+from django.db import transaction
+from recos.streams import Base64StreamDecoder, HashingWriter
+from candidate.services.attachment_blob_service import AttachmentBlobService
+
+BASE64_SLICE = 64 * 1024
 
 def save_base64_attachment(candidate, attachment_data):
     """
-    Save base64 attachment data to file
+    Save base64 attachment data to file, decoding it slice by slice into a temporary file
     """
     try:
         base64_data = attachment_data.get('datas')
         if not base64_data:
             return None
         
-        file_content = base64.b64decode(base64_data)
-        
         original_filename = attachment_data.get('datas_fname', f"attachment_{attachment_data['id']}")
         mimetype = attachment_data.get('mimetype', 'application/octet-stream')
         
@@ -23,17 +25,27 @@ def save_base64_attachment(candidate, attachment_data):
         
         from candidate.models import CandidateAttachment
         
-        attachment = CandidateAttachment(
-            candidate=candidate,
-            odoo_attachment_id=attachment_data['id'],
-            name=attachment_data.get('name', original_filename),
-            original_filename=original_filename,
-            file_type=mimetype,
-            file_size=len(file_content)
-        )
-
-        attachment.file.save(safe_filename, ContentFile(file_content))
-        attachment.save()
+        with tempfile.TemporaryFile() as buffer:
+            writer = HashingWriter(buffer)
+            decoder = Base64StreamDecoder(writer.write)
+            for start in range(0, len(base64_data), BASE64_SLICE):
+                decoder.feed(base64_data[start:start + BASE64_SLICE])
+            decoder.close()
+            
+            attachment = CandidateAttachment(
+                candidate=candidate,
+                odoo_attachment_id=attachment_data['id'],
+                name=attachment_data.get('name', original_filename),
+                original_filename=original_filename,
+                file_type=mimetype,
+                file_size=writer.size,
+                checksum=writer.checksum
+            )
+            
+            buffer.seek(0)
+            with transaction.atomic():
+                AttachmentBlobService.attach(attachment, writer.checksum, buffer, writer.size, safe_filename)
+                attachment.save()
         
         return attachment
         
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.24 on 2026-10-17 15:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("companies", "0004_company_odoo_company_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="company",
+            index=models.Index(
+                fields=["recruiter", "odoo_company_id"],
+                name="company_recruiter_odoo_id_idx",
+            ),
+        ),
+    ]
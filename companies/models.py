@@ -13,5 +13,8 @@ class Company(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['recruiter', 'company_name'], name='unique_recruiter_company_name')
         ]
+        indexes = [
+            models.Index(fields=['recruiter', 'odoo_company_id'], name='company_recruiter_odoo_id_idx'),
+        ]
     def __str__(self):
         return self.company_name
\ No newline at end of file
@@ -1,5 +1,5 @@
 from users.models import OdooCredentials
-from users.services.odoo_service import OdooService
+from users.services.odoo_service import get_odoo_service
 from companies.models import Company
 from job.services.job_sync_service import JobSyncService
 class CompanySyncService:
@@ -9,13 +9,8 @@ class CompanySyncService:
             odoo_creds = OdooCredentials.objects.filter(recruiter=recruiter).last()
             if not odoo_creds:
                 raise ValueError("No Odoo credentials found for this recruiter")
-            odoo_service = OdooService(
-                db_url=odoo_creds.db_url,
-                db_name=odoo_creds.db_name,
-                email=odoo_creds.email_address,
-                api_key=odoo_creds.get_api_key()
-            )
-            if not odoo_service.authenticate():
+            odoo_service = get_odoo_service(odoo_creds)
+            if not odoo_service:
                 raise Exception("Failed to authenticate with Odoo")
             odoo_companies = odoo_service.get_user_companies()
             synced_companies = []
@@ -45,9 +40,8 @@ class CompanySyncService:
                             is_active=True
                         )
                 synced_companies.append(company)
-                if sync_jobs:
-                    from job.services.job_sync_service import JobSyncService
-                    JobSyncService.sync_jobs_for_company(company)
+            if sync_jobs:
+                JobSyncService.sync_jobs_for_companies(synced_companies, odoo_service, odoo_creds)
             return synced_companies
         except Exception as e:
             raise
\ No newline at end of file
@@ -1,8 +1,13 @@
-from django.test import TestCase
+from unittest.mock import patch
+from django.test import TestCase, override_settings
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
 from django.db import transaction
-from users.models import Recruiter
+from django.utils import timezone
+from users.models import Recruiter, OdooCredentials
+from job.models import Job
+from companies.services.company_sync_service import CompanySyncService
+from job.services.job_sync_service import JobSyncService
 from .models import Company
 
 class CompanyModelTests(TestCase):
@@ -149,4 +154,106 @@ class CompanyModelTests(TestCase):
             Company.objects.create(
                 company_name='Test Company',
                 recruiter=None
-            )
\ No newline at end of file
+            )
+
+
+class CompanyJobSyncTests(TestCase):
+    @override_settings(ODOO_API_ENCRYPTION_KEY='this_is_a_test_key_for_encryption_32bytes')
+    def setUp(self):
+        self.recruiter = Recruiter.objects.create_user(
+            email='jobs@example.com',
+            first_name='Job',
+            last_name='Sync',
+            password='testpass123'
+        )
+        OdooCredentials.objects.create(
+            odoo_user_id=5,
+            recruiter=self.recruiter,
+            api_key='key',
+            email_address='odoo@example.com',
+            db_name='jobs_db',
+            db_url='https://jobs.odoo.com'
+        )
+        self.alpha = Company.objects.create(company_name='Alpha', odoo_company_id=7, recruiter=self.recruiter)
+        self.legacy_job = Job.objects.create(
+            company=self.alpha,
+            job_title='Designer',
+            job_description='Old brief',
+            posted_at=timezone.now()
+        )
+
+    @patch('job.services.job_sync_service.generate_job_summaries', side_effect=lambda descriptions: dict.fromkeys(descriptions, 'summary'))
+    @patch('companies.services.company_sync_service.get_odoo_service')
+    def test_jobs_fetched_once_and_partitioned_by_odoo_company_id(self, mock_odoo_service, mock_summary):
+        odoo_service = mock_odoo_service.return_value
+        odoo_service.authenticate.return_value = True
+        odoo_service.get_user_companies.return_value = [
+            {'id': 7, 'name': 'Alpha'},
+            {'id': 8, 'name': 'Beta'},
+        ]
+        odoo_service.get_jobs.return_value = [
+            {'id': 101, 'name': 'Designer', 'description': 'Old brief', 'company_id': [7, 'Alpha Holdings']},
+            {'id': 102, 'name': 'Engineer', 'description': 'Build things', 'company_id': [8, 'Beta Ltd'],
+             'create_date': '2025-01-10 08:00:00', 'write_date': '2025-01-10 08:00:00'},
+            {'id': 103, 'name': 'Stranger', 'description': '', 'company_id': [9, 'Beta']},
+        ]
+        odoo_service.get_job_ids.return_value = [101, 102, 103]
+
+        companies = CompanySyncService.sync_recruiter_companies(self.recruiter, sync_jobs=True)
+
+        odoo_service.get_jobs.assert_called_once_with(company_id=None, user_id=5, since=None)
+        beta = Company.objects.get(recruiter=self.recruiter, odoo_company_id=8)
+        self.assertEqual(len(companies), 2)
+        self.legacy_job.refresh_from_db()
+        self.assertEqual(self.legacy_job.odoo_job_id, 101)
+        self.assertEqual(Job.objects.get(odoo_job_id=102).company, beta)
+        self.assertFalse(Job.objects.filter(odoo_job_id=103).exists())
+        mock_summary.assert_called_once_with(['Old brief', 'Build things'])
+        self.assertEqual(self.legacy_job.generated_job_summary, 'summary')
+
+    @patch('job.services.job_sync_service.generate_job_summaries')
+    @patch('job.services.job_sync_service.get_odoo_service')
+    def test_failed_summaries_are_left_empty_and_retried(self, mock_odoo_service, mock_summary):
+        odoo_service = mock_odoo_service.return_value
+        odoo_service.get_jobs.return_value = [
+            {'id': 101, 'name': 'Designer', 'description': 'Old brief', 'company_id': [7, 'Alpha'],
+             'write_date': '2025-01-10 08:00:00'},
+        ]
+        odoo_service.get_job_ids.return_value = [101]
+        mock_summary.side_effect = lambda descriptions: dict.fromkeys(descriptions, '')
+
+        JobSyncService.sync_jobs_for_user(self.recruiter)
+        self.legacy_job.refresh_from_db()
+        self.assertEqual(self.legacy_job.generated_job_summary, '')
+
+        odoo_service.get_jobs.return_value = []
+        mock_summary.side_effect = lambda descriptions: dict.fromkeys(descriptions, 'summary')
+        JobSyncService.sync_jobs_for_user(self.recruiter)
+
+        mock_summary.assert_called_with(['Old brief'])
+        self.legacy_job.refresh_from_db()
+        self.assertEqual(self.legacy_job.generated_job_summary, 'summary')
+
+    @patch('job.services.job_sync_service.generate_job_summaries', side_effect=lambda descriptions: dict.fromkeys(descriptions, 'summary'))
+    @patch('job.services.job_sync_service.get_odoo_service')
+    def test_company_linked_after_user_sync_gets_its_older_jobs(self, mock_odoo_service, mock_summary):
+        odoo_service = mock_odoo_service.return_value
+        odoo_service.get_jobs.return_value = [
+            {'id': 101, 'name': 'Designer', 'description': 'Old brief', 'company_id': [7, 'Alpha'],
+             'write_date': '2025-01-10 08:00:00'},
+            {'id': 104, 'name': 'Analyst', 'description': 'Crunch numbers', 'company_id': [8, 'Gamma'],
+             'write_date': '2025-01-05 08:00:00'},
+        ]
+        odoo_service.get_job_ids.return_value = [101, 104]
+
+        JobSyncService.sync_jobs_for_user(self.recruiter)
+        self.assertFalse(Job.objects.filter(odoo_job_id=104).exists())
+
+        JobSyncService.sync_jobs_for_user(self.recruiter)
+        self.assertEqual(odoo_service.get_jobs.call_args[1]['since'], '2025-01-10 08:00:00')
+
+        gamma = Company.objects.create(company_name='Gamma', odoo_company_id=8, recruiter=self.recruiter)
+        JobSyncService.sync_jobs_for_user(self.recruiter)
+
+        self.assertIsNone(odoo_service.get_jobs.call_args[1]['since'])
+        self.assertEqual(Job.objects.get(odoo_job_id=104).company, gamma)
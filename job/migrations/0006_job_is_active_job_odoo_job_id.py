@@ -0,0 +1,23 @@
+# Generated by Django 4.2.24 on 2026-10-17 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job", "0005_alter_job_posted_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="is_active",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="odoo_job_id",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.24 on 2026-10-17 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job", "0006_job_is_active_job_odoo_job_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["company", "-created_at", "-job_id"],
+                name="job_job_company_ba2975_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["-created_at", "-job_id"], name="job_job_created_bf2474_idx"
+            ),
+        ),
+    ]
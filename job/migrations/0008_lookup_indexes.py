@@ -0,0 +1,25 @@
+# Generated by Django 4.2.24 on 2026-10-17 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job", "0007_list_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["company", "odoo_job_id"], name="job_company_odoo_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["company", "job_title"], name="job_company_title_idx"
+            ),
+        ),
+    ]
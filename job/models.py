@@ -12,14 +12,24 @@ class Job(models.Model):
     
     job_id = models.AutoField(primary_key=True)
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='jobs')
+    odoo_job_id = models.IntegerField(null=True, blank=True)
     job_title = models.CharField(max_length=100)
     job_description = models.TextField()
     generated_job_summary = models.TextField(blank=True, null=True)
     state = models.CharField(max_length=50, choices=JOB_STATES, default='open') 
+    is_active = models.BooleanField(default=True)
     posted_at = models.DateTimeField()
     expired_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', '-created_at', '-job_id']),
+            models.Index(fields=['-created_at', '-job_id']),
+            models.Index(fields=['company', 'odoo_job_id'], name='job_company_odoo_id_idx'),
+            models.Index(fields=['company', 'job_title'], name='job_company_title_idx'),
+        ]
+
     def __str__(self):
         return self.job_title   
\ No newline at end of file
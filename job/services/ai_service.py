@@ -1,77 +1,240 @@
-import google.genai as genai
-from google.genai import types
+from google.genai import errors, types
 from django.conf import settings
 import logging
 import json
+import threading
+from api.models import AISummaryCache
+from api.services.summary_cache_service import SummaryCacheService
+from recos.ai_providers import ai_model_name, get_ai_client
+from recos.concurrency import HostBackoff, run_concurrently
 
 logger = logging.getLogger(__name__)
 
+GEMINI_MODEL = "gemini-2.0-flash"
+JOB_SUMMARY_PROMPT_VERSION = 1
+JOB_SUMMARY_PACKED_PROMPT_VERSION = 1
+RATE_LIMIT_STATUSES = {429, 503}
+
+_summary_slots = threading.BoundedSemaphore(max(1, getattr(settings, 'AI_SUMMARY_CONCURRENCY', 4)))
+_rate_limit_backoff = HostBackoff(base_delay=1, max_delay=60)
+
 def get_genai_client():
-    try:
-        api_key = getattr(settings, 'GEMINI_API_KEY', None)
-        if not api_key:
-            logger.error("GEMINI_API_KEY is not configured in settings")
-            return None
-            
-        return genai.Client(api_key=api_key)
-    except Exception as e:
-        logger.error(f"Failed to initialize GenAI client: {str(e)}")
-        return None
+    """Return the process-wide client of the configured AI provider"""
+    return get_ai_client()
     
 def generate_job_summary(job_description):
     """
-    Generate a concise job summary using Google's Generative AI
+    Generate a concise job summary using Google's Generative AI, reusing the cached
+    summary when the same description was already summarised. Returns an empty string
+    when no summary could be generated, so the job is summarised again on the next sync.
     """
     try:
+        return generate_job_summaries([job_description])[job_description]
+    except Exception as e:
+        logger.error(f"Error generating job summary: {str(e)}")
+        return ''
+
+def generate_job_summaries(job_descriptions):
+    """
+    Summarise many job descriptions and return {description: summary}. Cached summaries are
+    reused; the rest are requested concurrently, AI_SUMMARY_PACK_SIZE descriptions per prompt,
+    with at most AI_SUMMARY_CONCURRENCY requests in flight across the process. Descriptions
+    that could not be summarised map to an empty string. Packed and single-prompt answers are
+    cached under their own prompt versions and either is reused, preferring the single prompt.
+    """
+    summaries = {}
+    pending = []
+    for job_description in dict.fromkeys(job_descriptions):
         if not job_description or len(job_description.strip()) < 10:
-            return "Job description is too short to generate a summary."
-        
-        client = get_genai_client()
-        if not client:
-            return "AI service is not available. Please check API configuration."
-        
-        prompt = f"""
-        Please generate a concise and professional job summary based on the following job description.
-        The summary should highlight key responsibilities, requirements, and unique aspects of the role.
-        Keep it under 150 words.
+            summaries[job_description] = ''
+        else:
+            pending.append(job_description)
+    if not pending:
+        return summaries
 
-        Job Description:
-        {job_description}
-        
-        Return the response in valid JSON format only:
-        {{
-            "job_summary": "generated summary text here",
-            "key_responsibilities": ["responsibility 1", "responsibility 2"],
-            "required_qualifications": ["qualification 1", "qualification 2"],
-            "preferred_qualifications": ["qualification 1", "qualification 2"]
-        }}
-        """
-        
-        config = types.GenerateContentConfig(
-            temperature=0.2,
-            top_p=0.95,
-            top_k=40,
-            max_output_tokens=1024,
-            response_mime_type="application/json",
-        )
-        
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt,
-            config=config,
+    client = get_genai_client()
+    if not client:
+        logger.error("AI service is not available, job summaries were not generated")
+        summaries.update(dict.fromkeys(pending, ''))
+        return summaries
+
+    model_name = ai_model_name(client, GEMINI_MODEL)
+    cache_keys = {
+        job_description: (
+            SummaryCacheService.make_key(
+                AISummaryCache.KIND_JOB_SUMMARY, JOB_SUMMARY_PROMPT_VERSION, model_name, job_description
+            ),
+            SummaryCacheService.make_key(
+                AISummaryCache.KIND_JOB_SUMMARY, f"packed-{JOB_SUMMARY_PACKED_PROMPT_VERSION}", model_name,
+                job_description
+            ),
         )
-        
-        summary_data = parse_gemini_response(response.text)
-        
-        if isinstance(summary_data, dict) and 'job_summary' in summary_data:
-            return summary_data['job_summary'].strip()
+        for job_description in pending
+    }
+    cached = SummaryCacheService.lookup_first(cache_keys.values())
+    missing = []
+    for job_description in pending:
+        if cache_keys[job_description] in cached:
+            summaries[job_description] = cached[cache_keys[job_description]]
         else:
-            logger.error(f"Unexpected response format: {summary_data}")
-            return "Summary generation failed: Unexpected response format"
-            
-    except Exception as e:
-        logger.error(f"Error generating job summary: {str(e)}")
-        return f"Summary generation failed: {str(e)}"
+            missing.append(job_description)
+
+    pack_size = max(1, getattr(settings, 'AI_SUMMARY_PACK_SIZE', 5))
+    packs = [missing[start:start + pack_size] for start in range(0, len(missing), pack_size)]
+    results = run_concurrently(
+        lambda pack: _summarise_pack(client, pack),
+        packs,
+        max_workers=max(1, getattr(settings, 'AI_SUMMARY_CONCURRENCY', 4))
+    )
+    for pack, generated, error in results:
+        generated, packed = generated if error is None else ({}, set())
+        for job_description in pack:
+            summary = error or generated[job_description]
+            if isinstance(summary, Exception):
+                logger.error(f"Error generating job summary: {str(summary)}")
+                summaries[job_description] = ''
+                continue
+            single_key, packed_key = cache_keys[job_description]
+            SummaryCacheService.store(
+                packed_key if job_description in packed else single_key,
+                AISummaryCache.KIND_JOB_SUMMARY,
+                model_name,
+                summary
+            )
+            summaries[job_description] = summary
+    return summaries
+
+def _summarise_pack(client, job_descriptions):
+    """
+    (summaries, packed) for one pack: the summary or the exception for each description that could
+    not be summarised, and the descriptions answered by the packed prompt. Runs on a worker thread,
+    so it must not touch the database.
+    """
+    summaries = {}
+    if len(job_descriptions) > 1:
+        try:
+            summaries = _with_backoff(lambda: request_job_summaries(client, job_descriptions))
+        except Exception as e:
+            logger.warning(f"Packed job summary request failed, retrying one by one: {str(e)}")
+    packed = set(summaries)
+    for job_description in job_descriptions:
+        if job_description not in summaries:
+            try:
+                summaries[job_description] = _with_backoff(lambda: request_job_summary(client, job_description))
+            except Exception as e:
+                summaries[job_description] = e
+    return summaries, packed
+
+def _with_backoff(request):
+    """
+    Run one Gemini request within the shared concurrency limit. Rate-limited requests are retried
+    up to AI_SUMMARY_MAX_RETRIES times, and every worker waits out the growing cooldown together.
+    """
+    max_retries = getattr(settings, 'AI_SUMMARY_MAX_RETRIES', 3)
+    for attempt in range(max_retries + 1):
+        _rate_limit_backoff.wait()
+        try:
+            with _summary_slots:
+                result = request()
+        except errors.APIError as e:
+            if e.code not in RATE_LIMIT_STATUSES or attempt >= max_retries:
+                raise
+            logger.info(f"Gemini rate limited the request ({e.code}), backing off")
+            _rate_limit_backoff.failed()
+            continue
+        _rate_limit_backoff.succeeded()
+        return result
+
+def request_job_summary(client, job_description):
+    """Ask Gemini for a job summary; raises when the response cannot be used"""
+    prompt = f"""
+    Please generate a concise and professional job summary based on the following job description.
+    The summary should highlight key responsibilities, requirements, and unique aspects of the role.
+    Keep it under 150 words.
+
+    Job Description:
+    {job_description}
+    
+    Return the response in valid JSON format only:
+    {{
+        "job_summary": "generated summary text here",
+        "key_responsibilities": ["responsibility 1", "responsibility 2"],
+        "required_qualifications": ["qualification 1", "qualification 2"],
+        "preferred_qualifications": ["qualification 1", "qualification 2"]
+    }}
+    """
+    
+    config = types.GenerateContentConfig(
+        temperature=0.2,
+        top_p=0.95,
+        top_k=40,
+        max_output_tokens=1024,
+        response_mime_type="application/json",
+    )
+    
+    response = client.models.generate_content(
+        model=GEMINI_MODEL,
+        contents=prompt,
+        config=config,
+    )
+    
+    summary_data = parse_gemini_response(response.text)
+    
+    if isinstance(summary_data, dict) and 'job_summary' in summary_data:
+        return summary_data['job_summary'].strip()
+    logger.error(f"Unexpected response format: {summary_data}")
+    raise Exception("Unexpected response format")
+
+def request_job_summaries(client, job_descriptions):
+    """
+    Ask Gemini to summarise several job descriptions in one prompt. Returns {description: summary}
+    for the ones it answered; raises when the response cannot be used at all.
+    """
+    jobs = "\n\n".join(
+        f"Job {index}:\n{job_description}" for index, job_description in enumerate(job_descriptions)
+    )
+    prompt = f"""
+    Please generate a concise and professional job summary for each of the following job descriptions.
+    Each summary should highlight key responsibilities, requirements, and unique aspects of the role.
+    Keep each summary under 150 words and summarise every job independently of the others.
+
+    {jobs}
+
+    Return the response in valid JSON format only, with one entry per job:
+    {{
+        "summaries": [
+            {{"id": 0, "job_summary": "generated summary text here"}}
+        ]
+    }}
+    """
+
+    config = types.GenerateContentConfig(
+        temperature=0.2,
+        top_p=0.95,
+        top_k=40,
+        max_output_tokens=512 * len(job_descriptions),
+        response_mime_type="application/json",
+    )
+
+    response = client.models.generate_content(
+        model=GEMINI_MODEL,
+        contents=prompt,
+        config=config,
+    )
+
+    summary_data = parse_gemini_response(response.text)
+    if not isinstance(summary_data, dict) or not isinstance(summary_data.get('summaries'), list):
+        logger.error(f"Unexpected response format: {summary_data}")
+        raise Exception("Unexpected response format")
+
+    summaries = {}
+    for item in summary_data['summaries']:
+        if not isinstance(item, dict) or not isinstance(item.get('job_summary'), str):
+            continue
+        index = item.get('id')
+        if isinstance(index, int) and 0 <= index < len(job_descriptions):
+            summaries[job_descriptions[index]] = item['job_summary'].strip()
+    return summaries
 
 def parse_gemini_response(response_text):
     """Parse Gemini response and extract JSON"""
@@ -1,119 +1,232 @@
-from users.models import OdooCredentials
-from users.services.odoo_service import OdooService
+from users.models import OdooCredentials, OdooSyncWatermark
+from users.services.odoo_service import get_odoo_service
 from companies.models import Company
 from job.models import Job
+from django.db import transaction
 from django.utils import timezone
-from datetime import timedelta
-from job.services.ai_service import generate_job_summary
+from django.utils.dateparse import parse_datetime
+from datetime import timedelta, timezone as datetime_timezone
+from job.services.ai_service import generate_job_summaries
+from api.services.response_cache_service import ResponseCacheService
 
 class JobSyncService:
+    BULK_BATCH_SIZE = 500
+    JOB_SYNC_FIELDS = [
+        'odoo_job_id', 'job_title', 'job_description', 'generated_job_summary', 'state', 'is_active',
+    ]
+
     @staticmethod
     def sync_jobs_for_company(company):
         try:
-            recruiter = company.recruiter
-            odoo_creds = OdooCredentials.objects.filter(recruiter=recruiter).last()
-            if not odoo_creds:
-                raise ValueError("No Odoo credentials found for this recruiter")
-                
-            odoo_service = OdooService(
-                db_url=odoo_creds.db_url,
-                db_name=odoo_creds.db_name,
-                email=odoo_creds.email_address,
-                api_key=odoo_creds.get_api_key()
+            odoo_creds, odoo_service = JobSyncService._connect(company.recruiter)
+            return JobSyncService.sync_jobs_for_companies(
+                [company],
+                odoo_service,
+                odoo_creds,
+                odoo_company_id=company.odoo_company_id
             )
-            
-            if not odoo_service.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
-            
-            odoo_jobs = odoo_service.get_jobs(user_id=odoo_creds.odoo_user_id)
-            synced_jobs = []
-            
-            for odoo_job in odoo_jobs:
-               
-                job_company_name = None
-                
-                if odoo_job.get('company_id') and isinstance(odoo_job['company_id'], list):
-                    job_company_name = odoo_job['company_id'][1]
-                
-                if job_company_name != company.company_name:
-                    continue
-
-                # 
-                job_description = odoo_job.get('description', '')
-                generate_summary = generate_job_summary(job_description) if job_description else ''
-                
-                job, created = Job.objects.update_or_create(
-                    company=company,
-                    job_title=odoo_job['name'],
-                    defaults={
-                        'job_description': odoo_job.get('description', ''),
-                        'generated_job_summary': generate_summary,
-                        'state': odoo_job.get('state', 'open'),
-                        'expired_at': timezone.now() + timedelta(days=365),
-                        'posted_at': odoo_job.get('create_date', timezone.now())
-                    }
-                )
-                synced_jobs.append(job)
-            
-            return synced_jobs
         except Exception as e:
             raise
 
     @staticmethod
     def sync_jobs_for_user(recruiter):
         try:
-            odoo_creds = OdooCredentials.objects.filter(recruiter=recruiter).last()
-            if not odoo_creds:
-                raise ValueError("No Odoo credentials found for this recruiter")
-                
-            odoo_service = OdooService(
-                db_url=odoo_creds.db_url,
-                db_name=odoo_creds.db_name,
-                email=odoo_creds.email_address,
-                api_key=odoo_creds.get_api_key()
-            )
-            
-            if not odoo_service.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
-            
-            odoo_jobs = odoo_service.get_jobs(user_id=odoo_creds.odoo_user_id)
-            synced_jobs = []
-            
+            odoo_creds, odoo_service = JobSyncService._connect(recruiter)
             companies = Company.objects.filter(recruiter=recruiter)
-            
-            company_map = {}
-            for company in companies:
-                if company.company_name not in company_map:
-                    company_map[company.company_name] = company
-            
-            for odoo_job in odoo_jobs:
-                job_company_name = None
-                
-                if odoo_job.get('company_id') and isinstance(odoo_job['company_id'], list):
-                    job_company_name = odoo_job['company_id'][1]
-                
-                if not job_company_name or job_company_name not in company_map:
-                    continue
-                
-                company = company_map[job_company_name]
-
-                 # 
-                job_description = odoo_job.get('description', '')
-                generate_summary = generate_job_summary(job_description) if job_description else ''
-                
-                job, created = Job.objects.update_or_create(
+            return JobSyncService.sync_jobs_for_companies(companies, odoo_service, odoo_creds)
+        except Exception as e:
+            raise
+
+    @staticmethod
+    def sync_jobs_for_companies(companies, odoo_service, odoo_creds, odoo_company_id=None):
+        """
+        Fetch the credential's hr.job records once, partition them by Odoo company ID and
+        reconcile every company's jobs in one transaction. Watermarks are kept per company and the
+        fetch resumes from the oldest, so a company linked after earlier syncs gets a full fetch
+        instead of losing the jobs that were skipped while it was unknown.
+        """
+        companies = list(companies)
+        scopes = [f"company:{company.company_id}" for company in companies]
+        sinces = [OdooSyncWatermark.get_since(odoo_creds, 'hr.job', scope) for scope in scopes]
+        since = min(sinces) if sinces and None not in sinces else None
+        odoo_jobs = odoo_service.get_jobs(
+            company_id=odoo_company_id,
+            user_id=odoo_creds.odoo_user_id,
+            since=since
+        )
+
+        synced_jobs = JobSyncService._bulk_upsert_jobs(
+            companies,
+            JobSyncService._partition_by_company(odoo_jobs, companies)
+        )
+
+        JobSyncService._archive_missing_jobs(
+            odoo_service,
+            odoo_creds,
+            Job.objects.filter(company__in=companies)
+        )
+        # Every fetched job of these companies was reconciled, so each can resume after the newest one.
+        for scope in scopes:
+            OdooSyncWatermark.advance(odoo_creds, 'hr.job', scope, odoo_jobs)
+
+        return synced_jobs
+
+    @staticmethod
+    def _connect(recruiter):
+        odoo_creds = OdooCredentials.objects.filter(recruiter=recruiter).last()
+        if not odoo_creds:
+            raise ValueError("No Odoo credentials found for this recruiter")
+
+        odoo_service = get_odoo_service(odoo_creds)
+
+        if not odoo_service:
+            raise Exception("Failed to authenticate with Odoo")
+        return odoo_creds, odoo_service
+
+    @staticmethod
+    def _partition_by_company(odoo_jobs, companies):
+        """Pair each Odoo job with its local company, matched by Odoo company ID and by name only for unlinked companies"""
+        companies_by_odoo_id = {}
+        companies_by_name = {}
+        for company in companies:
+            if company.odoo_company_id:
+                companies_by_odoo_id.setdefault(company.odoo_company_id, company)
+            else:
+                companies_by_name.setdefault(company.company_name, company)
+
+        pairs = []
+        for odoo_job in odoo_jobs:
+            company_data = odoo_job.get('company_id')
+            if not company_data or not isinstance(company_data, list):
+                continue
+            company = companies_by_odoo_id.get(company_data[0])
+            if company is None and len(company_data) > 1:
+                company = companies_by_name.get(company_data[1])
+            if company is not None:
+                pairs.append((company, odoo_job))
+        return pairs
+
+    @staticmethod
+    def _bulk_upsert_jobs(companies, company_job_pairs):
+        """
+        Reconcile the companies' (company, odoo_job) pairs with one lookup of existing jobs and chunked
+        bulk_create/bulk_update in one transaction. Summaries are only generated for new jobs,
+        changed descriptions and active jobs whose earlier summary failed, all in one concurrent
+        batch before the transaction is opened.
+        """
+        if not companies:
+            return []
+
+        company_ids = {company.company_id for company in companies}
+        by_odoo_id = {}
+        by_title = {}
+        existing_jobs = list(Job.objects.filter(company_id__in=company_ids))
+        for job in existing_jobs:
+            if job.odoo_job_id:
+                by_odoo_id[job.odoo_job_id] = job
+            by_title.setdefault((job.company_id, job.job_title), job)
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        synced_jobs = []
+        needs_summary = []
+        seen = set()
+        for company, odoo_job in company_job_pairs:
+            job = by_odoo_id.get(odoo_job.get('id')) or by_title.get((company.company_id, odoo_job['name']))
+            if job is not None and job.pk in seen:
+                continue
+
+            job_description = odoo_job.get('description') or ''
+            job_data = {
+                'odoo_job_id': odoo_job.get('id'),
+                'job_title': odoo_job['name'],
+                'job_description': job_description,
+                'state': odoo_job.get('state', 'open'),
+                'is_active': True,
+            }
+
+            if job is None:
+                job = Job(
                     company=company,
-                    job_title=odoo_job['name'],
-                    defaults={
-                        'job_description': odoo_job.get('description', ''),
-                        'generated_job_summary': generate_summary,
-                        'state': odoo_job.get('state', 'open'),
-                        'expired_at': timezone.now() + timedelta(days=365),
-                        'posted_at': odoo_job.get('create_date', timezone.now())
-                    }
+                    posted_at=JobSyncService._parse_odoo_date(odoo_job.get('create_date')) or now,
+                    expired_at=now + timedelta(days=365),
+                    generated_job_summary='',
+                    **job_data
                 )
-                synced_jobs.append(job)
-            
-            return synced_jobs
-        except Exception as e:
-            raise
\ No newline at end of file
+                to_create.append(job)
+                if job_description:
+                    needs_summary.append(job)
+                by_title[(company.company_id, job.job_title)] = job
+            else:
+                seen.add(job.pk)
+                if job.job_description != job_description:
+                    job.generated_job_summary = ''
+                if job_description and not job.generated_job_summary:
+                    needs_summary.append(job)
+                changed = job.company_id != company.company_id
+                job.company = company
+                for field, value in job_data.items():
+                    if getattr(job, field) != value:
+                        setattr(job, field, value)
+                        changed = True
+                if changed:
+                    job.updated_at = now
+                    to_update.append(job)
+            synced_jobs.append(job)
+
+        # Incremental fetches skip unchanged jobs, so failed summaries are retried from the local rows.
+        for job in existing_jobs:
+            if job.pk not in seen and job.is_active and job.job_description and not job.generated_job_summary:
+                needs_summary.append(job)
+
+        summaries = generate_job_summaries([job.job_description for job in needs_summary])
+        updated = {job.pk for job in to_update}
+        for job in needs_summary:
+            job.generated_job_summary = summaries[job.job_description]
+            if job.generated_job_summary and job.pk is not None and job.pk not in updated:
+                job.updated_at = now
+                to_update.append(job)
+
+        if to_create or to_update:
+            with transaction.atomic():
+                if to_create:
+                    Job.objects.bulk_create(to_create, batch_size=JobSyncService.BULK_BATCH_SIZE)
+                if to_update:
+                    Job.objects.bulk_update(
+                        to_update,
+                        JobSyncService.JOB_SYNC_FIELDS + ['company', 'updated_at'],
+                        batch_size=JobSyncService.BULK_BATCH_SIZE
+                    )
+            ResponseCacheService.invalidate(ResponseCacheService.SCOPE_COMPANY_JOBS, company_ids)
+            ResponseCacheService.invalidate(ResponseCacheService.SCOPE_JOB_CANDIDATES, [job.job_id for job in to_update])
+
+        return synced_jobs
+
+    @staticmethod
+    def _parse_odoo_date(odoo_date_string):
+        """Parse Odoo date string to an aware UTC datetime"""
+        if not odoo_date_string:
+            return None
+        try:
+            parsed = parse_datetime(odoo_date_string)
+        except (ValueError, TypeError):
+            return None
+        if parsed and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed, datetime_timezone.utc)
+        return parsed
+
+    @staticmethod
+    def _archive_missing_jobs(odoo_service, odoo_creds, jobs):
+        """Mark jobs that were deleted or archived in Odoo as inactive"""
+        active_ids = odoo_service.get_job_ids(user_id=odoo_creds.odoo_user_id)
+        archived = jobs.filter(
+            odoo_job_id__isnull=False,
+            is_active=True
+        ).exclude(
+            odoo_job_id__in=active_ids
+        )
+        company_ids = set(archived.values_list('company_id', flat=True))
+        updated = archived.update(is_active=False)
+        ResponseCacheService.invalidate(ResponseCacheService.SCOPE_COMPANY_JOBS, company_ids)
+        return updated
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+import google.genai as genai
+from google.genai import errors
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_ai_client():
+    """
+    Return the process-wide client for AI_PROVIDER: 'gemini' (default), 'fake', or the dotted
+    path of a class. A provider exposes models.generate_content(model, contents, config) returning
+    an object with .text, like genai.Client, and may name its model with a model_name attribute.
+    Returns None when the provider cannot be set up.
+    """
+    provider = getattr(settings, 'AI_PROVIDER', 'gemini')
+    try:
+        if provider == 'gemini':
+            key = (provider, getattr(settings, 'GEMINI_API_KEY', None))
+            if not key[1]:
+                logger.error("GEMINI_API_KEY is not configured in settings")
+                return None
+            factory = lambda: genai.Client(api_key=key[1])
+        elif provider == 'fake':
+            key = (
+                provider,
+                getattr(settings, 'AI_FAKE_LATENCY', 0.0),
+                getattr(settings, 'AI_FAKE_ERROR_RATE', 0.0),
+                getattr(settings, 'AI_FAKE_SEED', 0),
+            )
+            factory = lambda: FakeAIClient(latency=key[1], error_rate=key[2], seed=key[3])
+        else:
+            key = (provider,)
+            factory = import_string(provider)
+
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = factory()
+                _clients[key] = client
+            return client
+    except Exception as e:
+        logger.error(f"Failed to initialize AI client {provider}: {str(e)}")
+        return None
+
+
+def ai_model_name(client, default):
+    """Model name to record in summary cache keys, so one provider never serves another's summaries"""
+    model_name = getattr(client, 'model_name', None)
+    return model_name if isinstance(model_name, str) else default
+
+
+class FakeAIResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeAIClient:
+    """
+    Deterministic local stand-in for Gemini, for offline runs and benchmarks. Every prompt gets
+    schema-valid JSON derived from a hash of the prompt, after latency seconds (jittered between
+    half and one and a half times), and error_rate of calls fail with a 429 like a throttled Gemini.
+    """
+    model_name = 'fake-llm'
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # Mirrors genai.Client, whose requests go through client.models.generate_content.
+        self.models = self
+
+    def generate_content(self, model, contents, config=None):
+        with self._lock:
+            self.calls += 1
+            jitter = self._random.random()
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.failures += 1
+        if self.latency:
+            time.sleep(self.latency * (0.5 + jitter))
+        if failed:
+            raise errors.APIError(429, {'error': {'code': 429, 'message': 'Fake rate limit', 'status': 'RESOURCE_EXHAUSTED'}})
+        return FakeAIResponse(json.dumps(self.answer(contents)))
+
+    @staticmethod
+    def answer(prompt):
+        """The JSON document for prompt, shaped after the schema the prompt asks for"""
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8]
+        if '"summaries"' in prompt:
+            return {
+                'summaries': [
+                    {'id': int(index), 'job_summary': f"Summary {digest}-{index}: a role with clear responsibilities."}
+                    for index in re.findall(r'Job (\d+):', prompt)
+                ]
+            }
+        if '"skills_summary"' in prompt:
+            return {
+                'skills_summary': f"Candidate {digest} has experience relevant to the role.",
+                'key_skills': {
+                    'technical_professional_skills': ['Python', 'SQL'],
+                    'soft_skills': ['Communication'],
+                    'industry_knowledge': ['Recruitment'],
+                    'tools_software_equipment': ['Odoo'],
+                    'certifications_licenses': [],
+                },
+                'experience': {
+                    'total_years': str(int(digest, 16) % 15 + 1),
+                    'relevant_experience': 'Similar roles',
+                    'career_level': 'mid-level',
+                },
+                'education': {
+                    'highest_degree': 'Bachelor',
+                    'field_of_study': 'Computer Science',
+                    'relevant_education': 'Not specified',
+                },
+                'languages': ['English'],
+                'additional_qualifications': [],
+            }
+        if '"job_summary"' in prompt:
+            return {
+                'job_summary': f"Summary {digest}: a role with clear responsibilities.",
+                'key_responsibilities': ['Deliver the role'],
+                'required_qualifications': ['Relevant experience'],
+                'preferred_qualifications': [],
+            }
+        return {'text': f"Response {digest}"}
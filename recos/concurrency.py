@@ -0,0 +1,108 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from django.conf import settings
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+
+def get_sync_concurrency():
+    """Number of companies/jobs synced in parallel; SQLite serialises writes so it always runs sequentially"""
+    if connection.vendor == 'sqlite':
+        return 1
+    return max(1, int(getattr(settings, 'SYNC_CONCURRENCY', 4)))
+
+
+def run_concurrently(func, items, max_workers=None):
+    """
+    Call func for every item on a bounded thread pool and return (item, result, error)
+    tuples in the original order. Each worker thread closes its own database
+    connections when it finishes so pooled threads never leak them.
+    """
+    items = list(items)
+    if max_workers is None:
+        max_workers = get_sync_concurrency()
+    max_workers = min(max_workers, len(items))
+
+    if max_workers <= 1:
+        return [_call(func, item) for item in items]
+
+    def run_in_thread(item):
+        try:
+            return _call(func, item)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='recos-sync') as executor:
+        return list(executor.map(run_in_thread, items))
+
+
+def iter_concurrently(func, items, max_workers):
+    """
+    Like run_concurrently, but yield (item, result, error) as each call finishes so the caller can
+    consume results (e.g. write them to the database) while later items are still running.
+    At most max_workers calls run at once and at most as many finished results wait to be consumed.
+    """
+    items = iter(items)
+    if max_workers <= 1:
+        for item in items:
+            yield _call(func, item)
+        return
+
+    def run_in_thread(item):
+        try:
+            return _call(func, item)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='recos-fetch') as executor:
+        pending = {executor.submit(run_in_thread, item) for item in islice(items, max_workers * 2)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                for item in islice(items, 1):
+                    pending.add(executor.submit(run_in_thread, item))
+
+
+def _call(func, item):
+    try:
+        return item, func(item), None
+    except Exception as e:
+        logger.warning(f"Concurrent sync task failed for {item}: {str(e)}")
+        return item, None, e
+
+
+class HostBackoff:
+    """
+    Cooldown shared by every thread talking to one rate-limited service (an Odoo host, the LLM API):
+    after a throttled or failed request all of them wait an exponentially growing, jittered delay
+    before calling it again
+    """
+    def __init__(self, base_delay=0.5, max_delay=30):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failures = 0
+        self.retry_at = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            delay = self.retry_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def failed(self):
+        with self._lock:
+            self.failures += 1
+            delay = min(self.max_delay, self.base_delay * 2 ** (self.failures - 1))
+            delay *= 0.5 + random.random() / 2
+            self.retry_at = max(self.retry_at, time.monotonic() + delay)
+
+    def succeeded(self):
+        with self._lock:
+            self.failures = 0
@@ -0,0 +1,110 @@
+import re
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def file_download_response(request, field_file, content_type, filename, etag=None, last_modified=None,
+                           cache_control='private, no-cache', disposition='attachment'):
+    """
+    Serve a stored file with validators so clients can revalidate instead of downloading it again:
+    a 304 when If-None-Match/If-Modified-Since match, a 206 for a single satisfiable Range, and a
+    bodiless response carrying X-Sendfile/X-Accel-Redirect when ATTACHMENT_SENDFILE_HEADER is set.
+    etag is an opaque strong validator such as the content checksum; last_modified is a datetime.
+    """
+    etag = quote_etag(etag) if etag else None
+    last_modified = int(last_modified.timestamp()) if last_modified else None
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        _set_validators(not_modified, etag, last_modified, cache_control)
+        return not_modified
+
+    offload_header = getattr(settings, 'ATTACHMENT_SENDFILE_HEADER', '')
+    if offload_header:
+        # The front server reads the file and handles Range itself.
+        response = HttpResponse(content_type=content_type)
+        response[offload_header] = _offload_path(field_file, offload_header)
+    else:
+        size = field_file.size
+        byte_range = _requested_range(request, size, etag)
+        if byte_range == 'unsatisfiable':
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            _set_validators(response, etag, last_modified, cache_control)
+            return response
+        start, end = byte_range or (0, size - 1)
+        length = max(0, end - start + 1)
+        response = StreamingHttpResponse(
+            _read_range(field_file, start, length),
+            status=206 if byte_range else 200,
+            content_type=content_type,
+        )
+        response['Content-Length'] = str(length)
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = f'{disposition}; filename="{filename}"'
+    _set_validators(response, etag, last_modified, cache_control)
+    return response
+
+
+def _set_validators(response, etag, last_modified, cache_control):
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control
+
+
+def _offload_path(field_file, header):
+    if header.lower() == 'x-accel-redirect':
+        prefix = getattr(settings, 'ATTACHMENT_ACCEL_REDIRECT_PREFIX', '/protected/')
+        return prefix.rstrip('/') + '/' + field_file.name.lstrip('/')
+    return field_file.path
+
+
+def _requested_range(request, size, etag):
+    """
+    Return (start, end) for a single byte range, None to send the whole file, or 'unsatisfiable'.
+    Multi-range requests and ranges guarded by a stale If-Range are answered with the whole file.
+    """
+    header = request.META.get('HTTP_RANGE', '').replace(' ', '')
+    if not header:
+        return None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and (not etag or if_range != etag):
+        return None
+    match = RANGE_RE.match(header)
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            return 'unsatisfiable'
+        return max(0, size - suffix), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return 'unsatisfiable'
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _read_range(field_file, start, length):
+    with field_file.open('rb') as handle:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -89,6 +90,33 @@ else:
         }
     }
 
+# Shared cache for reset codes, token lookups and API responses. Redis when REDIS_URL is set
+# (needs the redis package), the database with CACHE_BACKEND=db (run createcachetable), and
+# otherwise files shared by every worker on the host. Tests that use the cache override CACHES.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+elif os.getenv("CACHE_BACKEND") == "db":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "recos_cache",
+            "OPTIONS": {"MAX_ENTRIES": 50000},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_DIR", os.path.join(tempfile.gettempdir(), "recos_cache")),
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -129,7 +157,7 @@ AUTH_USER_MODEL = 'users.Recruiter'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES':[
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES':[
         'rest_framework.permissions.IsAuthenticated',
@@ -151,4 +179,36 @@ DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@recos.com')
 FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
 SITE_NAME = 'Recos'
 PASSWORD_RESET_TIMEOUT = 3600
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
\ No newline at end of file
+GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+
+SYNC_CONCURRENCY = int(os.getenv('SYNC_CONCURRENCY', '4'))
+ODOO_MAX_CONCURRENT_REQUESTS_PER_HOST = int(os.getenv('ODOO_MAX_CONCURRENT_REQUESTS_PER_HOST', '4'))
+SYNC_JOB_STALE_AFTER = int(os.getenv('SYNC_JOB_STALE_AFTER', '3600'))
+SYNC_JOB_HEARTBEAT_INTERVAL = int(os.getenv('SYNC_JOB_HEARTBEAT_INTERVAL', '60'))
+SYNC_JOB_MAX_ATTEMPTS = int(os.getenv('SYNC_JOB_MAX_ATTEMPTS', '3'))
+ATTACHMENT_DOWNLOAD_CONCURRENCY = int(os.getenv('ATTACHMENT_DOWNLOAD_CONCURRENCY', '8'))
+ODOO_MAX_RETRIES = int(os.getenv('ODOO_MAX_RETRIES', '3'))
+AI_SUMMARY_CACHE_TTL = int(os.getenv('AI_SUMMARY_CACHE_TTL', str(30 * 24 * 60 * 60)))
+AI_SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv('AI_SUMMARY_CACHE_MAX_ENTRIES', '50000'))
+TEXT_EXTRACTION_WORKERS = int(os.getenv('TEXT_EXTRACTION_WORKERS', str(os.cpu_count() or 1)))
+TEXT_EXTRACTION_MAX_PAGES = int(os.getenv('TEXT_EXTRACTION_MAX_PAGES', '20'))
+TEXT_EXTRACTION_MAX_ROWS = int(os.getenv('TEXT_EXTRACTION_MAX_ROWS', '2000'))
+TEXT_EXTRACTION_TOKEN_BUDGET = int(os.getenv('TEXT_EXTRACTION_TOKEN_BUDGET', '8000'))
+ATTACHMENT_SENDFILE_HEADER = os.getenv('ATTACHMENT_SENDFILE_HEADER', '')
+ATTACHMENT_ACCEL_REDIRECT_PREFIX = os.getenv('ATTACHMENT_ACCEL_REDIRECT_PREFIX', '/protected/')
+ATTACHMENT_PREVIEW_MAX_SIZE = int(os.getenv('ATTACHMENT_PREVIEW_MAX_SIZE', '480'))
+ATTACHMENT_PREVIEW_CACHE_SECONDS = int(os.getenv('ATTACHMENT_PREVIEW_CACHE_SECONDS', str(7 * 24 * 60 * 60)))
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', '50'))
+TOKEN_AUTH_CACHE_TTL = int(os.getenv('TOKEN_AUTH_CACHE_TTL', '60'))
+TOKEN_AUTH_LOCAL_TTL = int(os.getenv('TOKEN_AUTH_LOCAL_TTL', '5'))
+TOKEN_AUTH_LOCAL_MAX_ENTRIES = int(os.getenv('TOKEN_AUTH_LOCAL_MAX_ENTRIES', '1024'))
+API_RESPONSE_CACHE_TTL = int(os.getenv('API_RESPONSE_CACHE_TTL', '300'))
+ODOO_SERVICE_POOL_TTL = int(os.getenv('ODOO_SERVICE_POOL_TTL', '900'))
+ODOO_SERVICE_POOL_MAX_ENTRIES = int(os.getenv('ODOO_SERVICE_POOL_MAX_ENTRIES', '256'))
+AI_SUMMARY_CONCURRENCY = int(os.getenv('AI_SUMMARY_CONCURRENCY', '4'))
+AI_SUMMARY_PACK_SIZE = int(os.getenv('AI_SUMMARY_PACK_SIZE', '5'))
+AI_SUMMARY_MAX_RETRIES = int(os.getenv('AI_SUMMARY_MAX_RETRIES', '3'))
+AI_PROVIDER = os.getenv('AI_PROVIDER', 'gemini')
+AI_FAKE_LATENCY = float(os.getenv('AI_FAKE_LATENCY', '0'))
+AI_FAKE_ERROR_RATE = float(os.getenv('AI_FAKE_ERROR_RATE', '0'))
+AI_FAKE_SEED = int(os.getenv('AI_FAKE_SEED', '0'))
@@ -0,0 +1,45 @@
+import binascii
+import hashlib
+
+
+class HashingWriter:
+    """Write-only wrapper that forwards to destination while counting bytes and hashing them with SHA-256"""
+
+    def __init__(self, destination):
+        self.destination = destination
+        self.size = 0
+        self._digest = hashlib.sha256()
+
+    def write(self, data):
+        self.size += len(data)
+        self._digest.update(data)
+        return self.destination.write(data)
+
+    @property
+    def checksum(self):
+        return self._digest.hexdigest()
+
+
+class Base64StreamDecoder:
+    """
+    Decode base64 text that arrives in arbitrary pieces, passing decoded bytes to write() as soon
+    as each complete 4-character group is available, so only one piece is held in memory at a time.
+    """
+    WHITESPACE = b' \t\r\n'
+
+    def __init__(self, write):
+        self.write = write
+        self._pending = b''
+
+    def feed(self, data):
+        if isinstance(data, str):
+            data = data.encode('ascii')
+        data = self._pending + data.translate(None, self.WHITESPACE)
+        usable = len(data) - len(data) % 4
+        self._pending = data[usable:]
+        if usable:
+            self.write(binascii.a2b_base64(data[:usable]))
+
+    def close(self):
+        if self._pending:
+            raise ValueError("Incomplete base64 data")
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Recruiter, OdooCredentials
+from .models import Recruiter, OdooCredentials, OdooSyncWatermark
 
 @admin.register(Recruiter)
 class RecruiterAdmin(admin.ModelAdmin):
@@ -10,4 +10,9 @@ class RecruiterAdmin(admin.ModelAdmin):
 class OdooCredentialsAdmin(admin.ModelAdmin):
     list_display = ['recruiter', 'db_name', 'email_address', 'created_at']
     search_fields = ['recruiter__username', 'recruiter__email', 'db_name', 'email_address']
-    exclude = ['api_key']
\ No newline at end of file
+    exclude = ['api_key']
+
+@admin.register(OdooSyncWatermark)
+class OdooSyncWatermarkAdmin(admin.ModelAdmin):
+    list_display = ['credentials', 'model_name', 'scope', 'last_write_date', 'last_synced_at']
+    search_fields = ['credentials__recruiter__email', 'model_name', 'scope']
@@ -0,0 +1,112 @@
+import hashlib
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from recos.caching import LocalTTLCache
+
+SECRET_USER_FIELDS = {'password', 'verification_code', 'verification_code_expires'}
+
+_local_auth = LocalTTLCache(
+    max_entries=getattr(settings, 'TOKEN_AUTH_LOCAL_MAX_ENTRIES', 1024),
+    ttl=getattr(settings, 'TOKEN_AUTH_LOCAL_TTL', 5),
+)
+
+
+def _token_cache_key(key):
+    # Keys are bearer secrets, so only their digest is used as a cache key.
+    return f"auth_token:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def _user_cache_key(user_id):
+    return f"auth_user:{user_id}"
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that resolves token -> user from a short-lived local LRU, then the shared
+    cache, and only then the database. Saving or deleting a user or token invalidates both levels
+    (users.signals); bulk updates must call invalidate_token/invalidate_user themselves, and other
+    workers may keep serving the old entry for TOKEN_AUTH_LOCAL_TTL.
+    """
+
+    def authenticate_credentials(self, key):
+        state = _get_cached(_token_cache_key(key), lambda: self._load_token(key))
+        user = _build_user(state)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        token = Token.from_db(user._state.db, ['key', 'user_id'], [key, user.pk])
+        token.user = user
+        return (user, token)
+
+    @staticmethod
+    def _load_token(key):
+        try:
+            return _user_state(Token.objects.select_related('user').get(key=key).user)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+
+
+def get_cached_user(user_id, load):
+    """Return the user for a session's user id through the same two cache levels as tokens"""
+    state = _get_cached(_user_cache_key(user_id), lambda: _user_state(load(user_id)))
+    return _build_user(state) if state is not None else None
+
+
+def _user_state(user):
+    """
+    The columns of user that may be cached, plus its session auth hash (an HMAC of the password)
+    so session requests can be verified without it. Credentials (password hash, verification
+    code) are left out and load lazily from the database if a caller reads them.
+    """
+    if user is None:
+        return None
+    return {
+        'fields': {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+            if field.attname not in SECRET_USER_FIELDS
+        },
+        'session_auth_hash': user.get_session_auth_hash(),
+    }
+
+
+def _build_user(state):
+    # A fresh instance per request, so concurrent requests never share one user object.
+    User = get_user_model()
+    fields = state['fields']
+    user = User.from_db(router.db_for_read(User), list(fields), list(fields.values()))
+    user._cached_session_auth_hash = state['session_auth_hash']
+    return user
+
+
+def _get_cached(cache_key, load):
+    value = _local_auth.get(cache_key)
+    if value is not None:
+        return value
+    value = cache.get(cache_key)
+    if value is None:
+        value = load()
+        if value is None:
+            return None
+        cache.set(cache_key, value, getattr(settings, 'TOKEN_AUTH_CACHE_TTL', 60))
+    _local_auth.set(cache_key, value)
+    return value
+
+
+def invalidate_token(key):
+    cache_key = _token_cache_key(key)
+    _local_auth.delete(cache_key)
+    cache.delete(cache_key)
+
+
+def invalidate_user(user):
+    """Drop every cached token and session lookup for user; call after changing or deleting it"""
+    keys = [_token_cache_key(key) for key in Token.objects.filter(user=user).values_list('key', flat=True)]
+    keys.append(_user_cache_key(user.pk))
+    for key in keys:
+        _local_auth.delete(key)
+    cache.delete_many(keys)
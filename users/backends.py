@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import BaseBackend
+from users.authentication import get_cached_user
 
 class EmailBackend(BaseBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
@@ -12,6 +13,10 @@ class EmailBackend(BaseBackend):
             return None
 
     def get_user(self, user_id):
+        return get_cached_user(user_id, self._load_user)
+
+    @staticmethod
+    def _load_user(user_id):
         UserModel = get_user_model()
         try:
             return UserModel.objects.get(pk=user_id)
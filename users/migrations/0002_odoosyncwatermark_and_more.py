@@ -0,0 +1,39 @@
+# Generated by Django 4.2.24 on 2026-10-17 14:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OdooSyncWatermark",
+            fields=[
+                ("watermark_id", models.AutoField(primary_key=True, serialize=False)),
+                ("model_name", models.CharField(max_length=64)),
+                ("scope", models.CharField(blank=True, default="", max_length=64)),
+                ("last_write_date", models.DateTimeField(blank=True, null=True)),
+                ("last_synced_at", models.DateTimeField(auto_now=True)),
+                (
+                    "credentials",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sync_watermarks",
+                        to="users.odoocredentials",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="odoosyncwatermark",
+            constraint=models.UniqueConstraint(
+                fields=("credentials", "model_name", "scope"),
+                name="unique_odoo_sync_watermark",
+            ),
+        ),
+    ]
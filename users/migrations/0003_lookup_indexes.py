@@ -0,0 +1,19 @@
+# Generated by Django 4.2.24 on 2026-10-17 15:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_odoosyncwatermark_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="odoocredentials",
+            index=models.Index(
+                fields=["recruiter", "-created_at"], name="odoo_creds_recr_created_idx"
+            ),
+        ),
+    ]
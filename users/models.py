@@ -8,6 +8,7 @@ import base64
 import os
 from django.conf import settings
 from django.utils import timezone
+from datetime import datetime, timezone as datetime_timezone
 
 
 class RecruiterManager(BaseUserManager):
@@ -58,6 +59,17 @@ class Recruiter(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name', 'last_name'] 
     
+    def get_session_auth_hash(self):
+        # Users rebuilt from the auth cache carry their hash, so the deferred password is not loaded.
+        cached_hash = getattr(self, '_cached_session_auth_hash', None)
+        if cached_hash is not None:
+            return cached_hash
+        return super().get_session_auth_hash()
+
+    def set_password(self, raw_password):
+        super().set_password(raw_password)
+        self._cached_session_auth_hash = None
+
     def is_verification_code_valid(self, code):
         return (
             self.verification_code == code and 
@@ -79,6 +91,11 @@ class OdooCredentials(models.Model):
     db_url = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['recruiter', '-created_at'], name='odoo_creds_recr_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.recruiter.email} - {self.db_name}"
@@ -135,4 +152,68 @@ class OdooCredentials(models.Model):
             return ""
     
     def get_api_key(self):
-        return self._decrypt_api_key(self.api_key)
\ No newline at end of file
+        return self._decrypt_api_key(self.api_key)
+
+class OdooSyncWatermark(models.Model):
+    watermark_id = models.AutoField(primary_key=True)
+    credentials = models.ForeignKey(OdooCredentials, on_delete=models.CASCADE, related_name='sync_watermarks')
+    model_name = models.CharField(max_length=64)
+    scope = models.CharField(max_length=64, blank=True, default='')
+    last_write_date = models.DateTimeField(null=True, blank=True)
+    last_synced_at = models.DateTimeField(auto_now=True)
+
+    ODOO_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['credentials', 'model_name', 'scope'],
+                name='unique_odoo_sync_watermark'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.credentials} - {self.model_name} {self.scope} @ {self.last_write_date}"
+
+    @classmethod
+    def get_since(cls, credentials, model_name, scope=''):
+        """Odoo-formatted write_date to resume from, or None when a full sync is needed"""
+        if not credentials:
+            return None
+        watermark = cls.objects.filter(
+            credentials=credentials,
+            model_name=model_name,
+            scope=scope
+        ).first()
+        if not watermark or not watermark.last_write_date:
+            return None
+        utc_value = watermark.last_write_date.astimezone(datetime_timezone.utc)
+        return utc_value.strftime(cls.ODOO_DATETIME_FORMAT)
+
+    @classmethod
+    def advance(cls, credentials, model_name, scope, records):
+        """Move the watermark to the newest write_date among the synced Odoo records"""
+        if not credentials:
+            return None
+        write_dates = []
+        for record in records:
+            value = record.get('write_date')
+            if not value:
+                continue
+            try:
+                parsed = datetime.strptime(value, cls.ODOO_DATETIME_FORMAT)
+            except (ValueError, TypeError):
+                continue
+            write_dates.append(timezone.make_aware(parsed, datetime_timezone.utc))
+
+        watermark, created = cls.objects.get_or_create(
+            credentials=credentials,
+            model_name=model_name,
+            scope=scope
+        )
+        if write_dates:
+            latest = max(write_dates)
+            if not watermark.last_write_date or latest > watermark.last_write_date:
+                watermark.last_write_date = latest
+        watermark.save()
+        return watermark
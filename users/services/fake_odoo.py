@@ -0,0 +1,188 @@
+import base64
+import hashlib
+import io
+import json
+import random
+import threading
+import time
+import requests
+from requests.adapters import BaseAdapter
+
+
+class FakeOdooAdapter(BaseAdapter):
+    """
+    In-process Odoo JSON-RPC server for benchmarks, mounted on an OdooService HTTP session with
+    session.mount(url, adapter) so the real client code (batching, streaming, retries) runs
+    unchanged. Serves a generated recruiter with companies, jobs, applicants and text resumes,
+    and waits latency seconds (jittered between half and one and a half times) per request.
+    """
+    UID = 1
+    WRITE_DATE = '2025-01-01 00:00:00'
+
+    def __init__(self, companies=3, jobs_per_company=5, candidates_per_job=10, attachments_per_candidate=1,
+                 latency=0.0, seed=0, run_id=''):
+        super().__init__()
+        self.latency = latency
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.records = {
+            'res.users': [],
+            'res.company': [],
+            'hr.job': [],
+            'hr.applicant': [],
+            'ir.attachment': [],
+        }
+        self._contents = {}
+        self._generate(companies, jobs_per_company, candidates_per_job, attachments_per_candidate, run_id)
+
+    def _generate(self, companies, jobs_per_company, candidates_per_job, attachments_per_candidate, run_id):
+        records = self.records
+        for company_index in range(1, companies + 1):
+            company = [company_index, f"Benchmark Company {company_index}"]
+            records['res.company'].append({'id': company_index, 'name': company[1], 'country_id': False})
+            for job_number in range(jobs_per_company):
+                job_id = len(records['hr.job']) + 1
+                job = [job_id, f"Role {job_id}"]
+                records['hr.job'].append({
+                    'id': job_id,
+                    'name': job[1],
+                    'company_id': company,
+                    'user_id': [self.UID, 'Benchmark Recruiter'],
+                    'description': f"Role {job_id} at {company[1]}: build and run services, review work and mentor the team.",
+                    'no_of_recruitment': 1,
+                    'create_date': self.WRITE_DATE,
+                    'write_date': self.WRITE_DATE,
+                })
+                for candidate_number in range(candidates_per_job):
+                    applicant_id = len(records['hr.applicant']) + 1
+                    records['hr.applicant'].append({
+                        'id': applicant_id,
+                        'partner_name': f"Candidate {applicant_id}",
+                        'email_from': f"candidate{applicant_id}@example.invalid",
+                        'stage_id': [1, 'Applied'],
+                        'company_id': company,
+                        'job_id': job,
+                        'date_open': self.WRITE_DATE,
+                        'date_last_stage_update': self.WRITE_DATE,
+                        'partner_phone': '',
+                        'create_date': self.WRITE_DATE,
+                        'write_date': self.WRITE_DATE,
+                        'department_id': False,
+                    })
+                    for attachment_number in range(attachments_per_candidate):
+                        attachment_id = len(records['ir.attachment']) + 1
+                        content = (
+                            f"Resume {run_id} {attachment_id}\nCandidate {applicant_id} applying for {job[1]}.\n"
+                            f"Experience: {attachment_id % 12 + 1} years of Python, SQL and team work.\n"
+                        ).encode() * 20
+                        self._contents[attachment_id] = content
+                        records['ir.attachment'].append({
+                            'id': attachment_id,
+                            'name': f"resume_{attachment_id}.txt",
+                            'mimetype': 'text/plain',
+                            'file_size': len(content),
+                            'type': 'binary',
+                            'res_model': 'hr.applicant',
+                            'res_id': applicant_id,
+                            'create_date': self.WRITE_DATE,
+                            'write_date': self.WRITE_DATE,
+                            'checksum': hashlib.sha1(content).hexdigest(),
+                        })
+        records['res.users'].append({
+            'id': self.UID,
+            'name': 'Benchmark Recruiter',
+            'email': 'benchmark@example.invalid',
+            'company_id': records['res.company'][0]['id'] if records['res.company'] else False,
+            'company_ids': [company['id'] for company in records['res.company']],
+        })
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        with self._lock:
+            self.requests += 1
+            jitter = self._random.random()
+        if self.latency:
+            time.sleep(self.latency * (0.5 + jitter))
+
+        payload = json.loads(request.body)
+        if isinstance(payload, list):
+            body = [self._dispatch(call) for call in payload]
+        else:
+            body = self._dispatch(payload)
+
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Content-Type'] = 'application/json'
+        response.encoding = 'utf-8'
+        response.raw = io.BytesIO(json.dumps(body).encode())
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+    def _dispatch(self, call):
+        params = call.get('params', {})
+        try:
+            if params.get('service') == 'common' and params.get('method') == 'login':
+                result = self.UID
+            else:
+                result = self._execute_kw(*params['args'][3:])
+            return {'jsonrpc': '2.0', 'id': call.get('id'), 'result': result}
+        except Exception as e:
+            return {'jsonrpc': '2.0', 'id': call.get('id'), 'error': {'message': str(e), 'data': {}}}
+
+    def _execute_kw(self, model, method, args=None, kwargs=None):
+        args = args or []
+        kwargs = kwargs or {}
+        records = self.records[model]
+        if method == 'search':
+            return [record['id'] for record in records if self._matches(record, args[0])]
+        if method == 'search_read':
+            return [self._read(model, record, kwargs.get('fields')) for record in records if self._matches(record, args[0])]
+        if method == 'read':
+            ids = set(args[0])
+            return [self._read(model, record, kwargs.get('fields')) for record in records if record['id'] in ids]
+        if method == 'write':
+            return True
+        raise Exception(f"Method {method} is not supported on {model}")
+
+    def _read(self, model, record, fields):
+        row = {field: record.get(field, False) for field in fields} if fields else dict(record)
+        row['id'] = record['id']
+        if model == 'ir.attachment' and fields and 'datas' in fields:
+            row['datas'] = base64.b64encode(self._contents[record['id']]).decode()
+        return row
+
+    def _matches(self, record, domain):
+        return all(self._evaluate(record, list(domain)))
+
+    def _evaluate(self, record, domain):
+        """Yield the result of every top-level term of a prefix-notation Odoo domain"""
+        while domain:
+            yield self._term(record, domain)
+
+    def _term(self, record, domain):
+        term = domain.pop(0)
+        if term == '|':
+            left = self._term(record, domain)
+            right = self._term(record, domain)
+            return left or right
+        if term == '&':
+            left = self._term(record, domain)
+            right = self._term(record, domain)
+            return left and right
+        if term == '!':
+            return not self._term(record, domain)
+        field, operator, value = term
+        actual = record.get(field, False)
+        if isinstance(actual, list):
+            actual = actual[0]
+        if operator == '=':
+            return actual == value
+        if operator == 'in':
+            return actual in value
+        if operator == '>=':
+            return actual >= value
+        raise Exception(f"Domain operator {operator} is not supported")
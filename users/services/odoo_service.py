@@ -1,7 +1,91 @@
 import json
+import re
+import threading
 import requests
-from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin, urlparse
+from django.conf import settings
+from recos.caching import LocalTTLCache
+from recos.concurrency import HostBackoff
+from recos.streams import Base64StreamDecoder
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+_host_backoffs = {}
+_host_backoffs_lock = threading.Lock()
+_service_pool = LocalTTLCache(
+    max_entries=getattr(settings, 'ODOO_SERVICE_POOL_MAX_ENTRIES', 256),
+    ttl=getattr(settings, 'ODOO_SERVICE_POOL_TTL', 900),
+)
+
+
+def get_shared_session(db_url, db_name, email):
+    """Return a keep-alive HTTP session shared by every OdooService for one credential"""
+    key = (db_url, db_name, email)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({'Content-Type': 'application/json'})
+            _sessions[key] = session
+        return session
+
+
+def get_host_slots(db_url):
+    """Semaphore bounding concurrent in-flight requests to one Odoo host across all sync threads"""
+    host = urlparse(db_url).netloc or db_url
+    with _host_slots_lock:
+        slots = _host_slots.get(host)
+        if slots is None:
+            limit = getattr(settings, 'ODOO_MAX_CONCURRENT_REQUESTS_PER_HOST', 4)
+            slots = threading.BoundedSemaphore(max(1, int(limit)))
+            _host_slots[host] = slots
+        return slots
+
+
+def get_host_backoff(db_url):
+    host = urlparse(db_url).netloc or db_url
+    with _host_backoffs_lock:
+        backoff = _host_backoffs.get(host)
+        if backoff is None:
+            backoff = HostBackoff()
+            _host_backoffs[host] = backoff
+        return backoff
+
+
+def get_odoo_service(odoo_creds):
+    """
+    Return an authenticated OdooService for a credential, reused by every sync in this process for
+    ODOO_SERVICE_POOL_TTL so the API key is decrypted and the login made once per credential.
+    Keyed by updated_at as well, so edited credentials log in afresh. None if the login is rejected.
+    """
+    key = (odoo_creds.pk, odoo_creds.updated_at)
+    odoo_service = _service_pool.get(key)
+    if odoo_service is None:
+        odoo_service = OdooService(
+            db_url=odoo_creds.db_url,
+            db_name=odoo_creds.db_name,
+            email=odoo_creds.email_address,
+            api_key=odoo_creds.get_api_key()
+        )
+        if not odoo_service.authenticate():
+            return None
+        _service_pool.set(key, odoo_service)
+    return odoo_service
+
+
 class OdooService:
+    BATCH_SIZE = 50
+    RETRY_STATUSES = {429, 502, 503, 504}
+    AUTH_ERRORS = {'odoo.exceptions.AccessDenied', 'odoo.http.SessionExpiredException'}
+    STREAM_CHUNK_SIZE = 64 * 1024
+    DATAS_KEY = re.compile(rb'"datas"\s*:\s*')
+
     def __init__(self, db_url, db_name, email, api_key):
         self.db_url = db_url
         self.db_name = db_name
@@ -10,9 +94,12 @@ class OdooService:
         self.uid = None
         self.session = None
         self.context = {}
+        self.http = get_shared_session(db_url, db_name, email)
+        self.host_slots = get_host_slots(db_url)
+        self.host_backoff = get_host_backoff(db_url)
+        self.supports_batch = True
     def authenticate(self):
         endpoint = urljoin(self.db_url, '/jsonrpc')
-        headers = {'Content-Type': 'application/json'}
         payload = {
             "jsonrpc": "2.0",
             "method": "call",
@@ -28,7 +115,8 @@ class OdooService:
             "id": 1
         }
         try:
-            response = requests.post(endpoint, data=json.dumps(payload), headers=headers)
+            with self.host_slots:
+                response = self.http.post(endpoint, data=json.dumps(payload), timeout=30)
             response.raise_for_status()
             result = response.json()
             if 'result' in result and result['result']:
@@ -39,13 +127,8 @@ class OdooService:
                 return False
         except Exception as e:
             return False
-    def call_odoo(self, model, method, args=None, kwargs=None):
-        if not self.uid:
-            if not self.authenticate():
-                raise Exception("Authentication failed")
-        endpoint = urljoin(self.db_url, '/jsonrpc')
-        headers = {'Content-Type': 'application/json'}
-        payload = {
+    def _execute_kw_payload(self, model, method, args=None, kwargs=None, request_id=1):
+        return {
             "jsonrpc": "2.0",
             "method": "call",
             "params": {
@@ -61,30 +144,101 @@ class OdooService:
                     kwargs or {}
                 ]
             },
-            "id": 1
+            "id": request_id
         }
+    def _raise_odoo_error(self, error_data):
+        error_msg = error_data.get('message', 'Unknown Odoo error')
+        if "Access Denied" in error_msg or "permission" in error_msg.lower():
+            raise Exception(f"Odoo Permission Error: {error_msg}")
+        elif "Missing required" in error_msg:
+            raise Exception(f"Odoo Validation Error: {error_msg}")
+        else:
+            raise Exception(f"Odoo Server Error: {error_msg}")
+    def _reauthenticate(self, error_data):
+        """Log in again after a revoked or expired login error; True when the call is worth retrying"""
+        data = error_data.get('data') or {}
+        message = f"{error_data.get('message', '')} {data.get('message', '')}"
+        if data.get('name') not in self.AUTH_ERRORS and 'Access Denied' not in message:
+            return False
+        self.uid = None
+        return self.authenticate()
+    def _post(self, payload, timeout=30, allow_rejection=False):
+        """
+        POST a JSON-RPC payload and return the decoded response. With allow_rejection, a server
+        that answers with an HTTP error status or a body that is not JSON yields None instead.
+        """
+        endpoint = urljoin(self.db_url, '/jsonrpc')
         try:
-            response = requests.post(endpoint, data=json.dumps(payload), headers=headers, timeout=30)
-            response.raise_for_status()
-            result = response.json()
-            if 'error' in result:
-                error_data = result['error']
-                error_msg = error_data.get('message', 'Unknown Odoo error')
-                error_code = error_data.get('code', 'Unknown code')
-                error_data_str = error_data.get('data', {})
-                if "Access Denied" in error_msg or "permission" in error_msg.lower():
-                    raise Exception(f"Odoo Permission Error: {error_msg}")
-                elif "Missing required" in error_msg:
-                    raise Exception(f"Odoo Validation Error: {error_msg}")
-                else:
-                    raise Exception(f"Odoo Server Error: {error_msg}")
-            return result.get('result')
+            with self.host_slots:
+                response = self.http.post(endpoint, data=json.dumps(payload), timeout=timeout)
         except requests.exceptions.RequestException as e:
             raise Exception(f"Network error connecting to Odoo: {str(e)}")
-        except json.JSONDecodeError as e:
+        try:
+            response.raise_for_status()
+            return response.json()
+        except ValueError as e:
+            if allow_rejection:
+                return None
             raise Exception(f"Invalid response from Odoo: {str(e)}")
-        except Exception as e:
-            raise
+        except requests.exceptions.RequestException as e:
+            if allow_rejection:
+                return None
+            raise Exception(f"Network error connecting to Odoo: {str(e)}")
+    def call_odoo(self, model, method, args=None, kwargs=None):
+        if not self.uid:
+            if not self.authenticate():
+                raise Exception("Authentication failed")
+        result = self._post(self._execute_kw_payload(model, method, args, kwargs))
+        if 'error' in result and self._reauthenticate(result['error']):
+            result = self._post(self._execute_kw_payload(model, method, args, kwargs))
+        if 'error' in result:
+            self._raise_odoo_error(result['error'])
+        return result.get('result')
+    def call_odoo_batch(self, calls):
+        """
+        Run several execute_kw calls in as few round-trips as possible.
+        Each call is a (model, method, args, kwargs) tuple; results come back in the same order.
+        Calls are packed into JSON-RPC batch arrays of BATCH_SIZE; servers that reject
+        batch envelopes are remembered and served sequentially over the same keep-alive session.
+        """
+        if not calls:
+            return []
+        if not self.uid:
+            if not self.authenticate():
+                raise Exception("Authentication failed")
+        results = []
+        for start in range(0, len(calls), self.BATCH_SIZE):
+            chunk = calls[start:start + self.BATCH_SIZE]
+            if self.supports_batch and len(chunk) > 1:
+                chunk_results = self._call_odoo_envelope(chunk)
+                if chunk_results is not None:
+                    results.extend(chunk_results)
+                    continue
+            results.extend(self.call_odoo(*call) for call in chunk)
+        return results
+    def _call_odoo_envelope(self, chunk, reauthenticate=True):
+        payload = [
+            self._execute_kw_payload(*call, request_id=index)
+            for index, call in enumerate(chunk)
+        ]
+        # Servers without batch support answer the array with an error status, a non-JSON page or a single error.
+        response = self._post(payload, timeout=30 + 5 * len(chunk), allow_rejection=True)
+        if not isinstance(response, list):
+            self.supports_batch = False
+            return None
+        by_id = {item.get('id'): item for item in response if isinstance(item, dict)}
+        errors = [item['error'] for item in by_id.values() if 'error' in item]
+        if errors and reauthenticate and self._reauthenticate(errors[0]):
+            return self._call_odoo_envelope(chunk, reauthenticate=False)
+        results = []
+        for index in range(len(chunk)):
+            item = by_id.get(index)
+            if item is None:
+                raise Exception(f"Invalid response from Odoo: missing result for batch call {index}")
+            if 'error' in item:
+                self._raise_odoo_error(item['error'])
+            results.append(item.get('result'))
+        return results
     def get_user_companies(self):
         user_data = self.call_odoo(
             'res.users',
@@ -111,58 +265,95 @@ class OdooService:
             [[self.uid], {'company_id': company_id}]
         )
         
-    def get_jobs(self, company_id=None, user_id=None):
+    JOB_FIELDS = ['name', 'company_id', 'description', 'no_of_recruitment', 'create_date', 'write_date']
+
+    def _job_domain(self, company_id=None, user_id=None, since=None):
         domain = []
         if company_id:
             domain.append(('company_id', '=', company_id))
         if user_id:
             domain.append(('user_id', '=', user_id))
-        
+        if since:
+            domain.append(('write_date', '>=', since))
+        return domain
+
+    def get_jobs(self, company_id=None, user_id=None, since=None):
         return self.call_odoo(
             'hr.job', 
             'search_read', 
-            [domain], 
-            {'fields': ['name', 'company_id', 'description', 'no_of_recruitment','create_date']}
+            [self._job_domain(company_id, user_id, since)], 
+            {'fields': self.JOB_FIELDS}
         )
     
-    def get_jobs_by_user(self, user_id):
+    def get_job_ids(self, company_id=None, user_id=None):
+        """IDs of the jobs that are still active in Odoo, used to detect deletions and archivals"""
+        return self.search_ids('hr.job', self._job_domain(company_id, user_id))
     
-        domain = [('user_id', '=', user_id)]
-        
-        return self.call_odoo(
-            'hr.job', 
-            'search_read', 
-            [domain], 
-            {'fields': ['name', 'company_id', 'description', 'no_of_recruitment','create_date']}
-        )
+    def get_jobs_by_user(self, user_id):
+        return self.get_jobs(user_id=user_id)
     
-    def get_candidates(self, job_id=None, company_id=None):
+    CANDIDATE_FIELDS = [
+        'id',
+        'partner_name',
+        'email_from',
+        'stage_id',
+        'company_id',
+        'job_id',
+        'date_open',
+        'date_last_stage_update',
+        'partner_phone',
+        'create_date',
+        'write_date',
+        'department_id',
+    ]
+
+    def _candidate_domain(self, job_id=None, company_id=None, since=None):
         domain = []
         if job_id:
             domain.append(('job_id', '=', job_id))
         if company_id:
             domain.append(('company_id', '=', company_id))
+        if since:
+            domain.append(('write_date', '>=', since))
+        return domain
 
-        fields = [
-            'id',
-            'partner_name',
-            'email_from',
-            'stage_id',
-            'company_id',
-            'job_id',
-            'date_open',
-            'date_last_stage_update',
-            'partner_phone',
-            'create_date',
-            'department_id',
-        ]
+    def get_candidates(self, job_id=None, company_id=None, since=None):
         return self.call_odoo(
             'hr.applicant',
             'search_read',
-            [domain],
-            {'fields': fields}
+            [self._candidate_domain(job_id, company_id, since)],
+            {'fields': self.CANDIDATE_FIELDS}
         )
 
+    def get_candidate_ids(self, job_id=None, company_id=None):
+        """IDs of the applicants that are still active in Odoo, used to detect deletions and archivals"""
+        return self.search_ids('hr.applicant', self._candidate_domain(job_id, company_id))
+
+    def get_candidates_batch(self, job_ids=None, company_ids=None, since=None):
+        """
+        Fetch applicants for many jobs or companies in one batched round-trip.
+        since optionally maps a job or company ID to its write_date watermark.
+        Returns a dict keyed by the job or company ID that was requested.
+        """
+        keys = list(job_ids or company_ids or [])
+        since = since or {}
+        calls = [
+            (
+                'hr.applicant',
+                'search_read',
+                [
+                    self._candidate_domain(job_id=key, since=since.get(key)) if job_ids
+                    else self._candidate_domain(company_id=key, since=since.get(key))
+                ],
+                {'fields': self.CANDIDATE_FIELDS}
+            )
+            for key in keys
+        ]
+        return dict(zip(keys, self.call_odoo_batch(calls)))
+
+    def search_ids(self, model, domain):
+        return self.call_odoo(model, 'search', [domain]) or []
+
     def get_user_info(self):
         return self.call_odoo(
             'res.users',
@@ -177,22 +368,52 @@ class OdooService:
             [[]],
             {'fields': ['id', 'name', 'country_id']}
         )
+    ATTACHMENT_FIELDS = [
+        'id', 'name', 'mimetype', 'file_size', 'type',
+        'res_model', 'res_id', 'create_date', 'write_date', 'checksum'
+    ]
+    ATTACHMENT_IDS_PER_CALL = 500
+
     def get_attachments(self, res_model, res_id):
-        """Get attachments for a specific model and record ID"""
+        """Get attachment metadata (without file content) for a specific model and record ID"""
         domain = [
             ('res_model', '=', res_model),
             ('res_id', '=', res_id)
         ]
-        fields = [
-            'id', 'name', 'mimetype', 'file_size', 'type',
-            'res_model', 'res_id', 'create_date', 'datas'
-        ]
         return self.call_odoo(
             'ir.attachment',
             'search_read',
             [domain],
-            {'fields': fields}
+            {'fields': self.ATTACHMENT_FIELDS}
         )
+
+    def get_attachments_for_records(self, res_model, res_ids, since=None, include_res_ids=None):
+        """
+        Get attachment metadata (without file content) for many records of a model at once.
+        With since, only attachments written after it are returned, except for the records
+        in include_res_ids whose attachments are always returned.
+        """
+        res_ids = list(res_ids)
+        include_res_ids = set(include_res_ids or [])
+        calls = []
+        for start in range(0, len(res_ids), self.ATTACHMENT_IDS_PER_CALL):
+            chunk = res_ids[start:start + self.ATTACHMENT_IDS_PER_CALL]
+            domain = [
+                ('res_model', '=', res_model),
+                ('res_id', 'in', chunk)
+            ]
+            if since:
+                included = [res_id for res_id in chunk if res_id in include_res_ids]
+                if included:
+                    domain.extend(['|', ('write_date', '>=', since), ('res_id', 'in', included)])
+                else:
+                    domain.append(('write_date', '>=', since))
+            calls.append(('ir.attachment', 'search_read', [domain], {'fields': self.ATTACHMENT_FIELDS}))
+        attachments = []
+        for chunk in self.call_odoo_batch(calls):
+            attachments.extend(chunk or [])
+        return attachments
+
     def get_attachment_content(self, attachment_id):
         """Get the actual file content with base64 data"""
         try:
@@ -206,4 +427,103 @@ class OdooService:
                 return attachment[0]
             return None
         except Exception as e:
-            return None
\ No newline at end of file
+            return None
+    def stream_attachment_content(self, attachment_id, destination, timeout=120, reauthenticate=True):
+        """
+        Download an attachment with the JSON-RPC response streamed: the base64 'datas' value is
+        decoded chunk by chunk into destination (anything with write()), so neither the base64 text
+        nor the file is held in memory. Returns the other fields read, or None if there is no content.
+        """
+        if not self.uid:
+            if not self.authenticate():
+                raise Exception("Authentication failed")
+        payload = self._execute_kw_payload(
+            'ir.attachment',
+            'read',
+            [[attachment_id]],
+            {'fields': ['name', 'mimetype', 'file_size', 'datas']}
+        )
+        endpoint = urljoin(self.db_url, '/jsonrpc')
+        max_retries = getattr(settings, 'ODOO_MAX_RETRIES', 3)
+        written = [0]
+
+        def write(data):
+            written[0] += len(data)
+            destination.write(data)
+
+        for attempt in range(max_retries + 1):
+            self.host_backoff.wait()
+            try:
+                with self.host_slots:
+                    with self.http.post(endpoint, data=json.dumps(payload), timeout=timeout, stream=True) as response:
+                        if response.status_code in self.RETRY_STATUSES and attempt < max_retries:
+                            self.host_backoff.failed()
+                            continue
+                        response.raise_for_status()
+                        envelope, has_content = OdooService._stream_datas_field(
+                            response.iter_content(chunk_size=OdooService.STREAM_CHUNK_SIZE),
+                            Base64StreamDecoder(write)
+                        )
+                self.host_backoff.succeeded()
+                break
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                # Safe to retry only while nothing has been written to destination
+                self.host_backoff.failed()
+                if written[0] or attempt >= max_retries:
+                    raise Exception(f"Network error connecting to Odoo: {str(e)}")
+            except requests.exceptions.RequestException as e:
+                raise Exception(f"Network error connecting to Odoo: {str(e)}")
+        try:
+            result = json.loads(envelope)
+        except json.JSONDecodeError as e:
+            raise Exception(f"Invalid response from Odoo: {str(e)}")
+        if 'error' in result:
+            if reauthenticate and not written[0] and self._reauthenticate(result['error']):
+                return self.stream_attachment_content(attachment_id, destination, timeout, reauthenticate=False)
+            self._raise_odoo_error(result['error'])
+        records = result.get('result') or []
+        if not records or not has_content:
+            return None
+        return records[0]
+
+    @staticmethod
+    def _stream_datas_field(chunks, decoder):
+        """
+        Feed the 'datas' string of a JSON-RPC read response to decoder as it arrives and return
+        (rest of the response with datas emptied, whether datas held content)
+        """
+        head = b''
+        tail = []
+        in_value = False
+        has_content = False
+        done = False
+        for chunk in chunks:
+            if done:
+                tail.append(chunk)
+                continue
+            if not in_value:
+                head += chunk
+                match = OdooService.DATAS_KEY.search(head)
+                if not match or match.end() >= len(head):
+                    continue
+                if head[match.end():match.end() + 1] != b'"':
+                    done = True
+                    continue
+                chunk = head[match.end() + 1:]
+                head = head[:match.end()]
+                in_value = True
+                has_content = True
+            end = chunk.find(b'"')
+            if end == -1:
+                decoder.feed(chunk)
+                continue
+            decoder.feed(chunk[:end])
+            decoder.close()
+            tail.append(chunk[end + 1:])
+            in_value = False
+            done = True
+        if in_value:
+            raise Exception("Attachment content from Odoo was truncated")
+        if has_content:
+            return head + b'""' + b''.join(tail), True
+        return head + b''.join(tail), False
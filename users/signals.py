@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from users.authentication import invalidate_token, invalidate_user
+from users.models import Recruiter
+
+# Single-row writes (admin, password reset, profile updates) invalidate here; queryset.update()
+# sends no signals, so its callers invalidate explicitly.
+
+
+@receiver([post_save, post_delete], sender=Recruiter)
+def invalidate_recruiter_auth(sender, instance, **kwargs):
+    invalidate_user(instance)
+
+
+@receiver([post_save, post_delete], sender=Token)
+def invalidate_token_auth(sender, instance, **kwargs):
+    invalidate_token(instance.key)
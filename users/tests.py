@@ -1,10 +1,24 @@
-from django.test import TestCase, override_settings
-from django.contrib.auth import get_user_model
-from users.models import OdooCredentials
-from unittest.mock import patch
+import base64
+import hashlib
+import json
+import requests
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user, get_user_model
+from users.models import OdooCredentials, OdooSyncWatermark
+from unittest.mock import patch, MagicMock
+from recos.streams import HashingWriter
+from users.authentication import _local_auth, _token_cache_key, get_cached_user, invalidate_user
+from users.services.odoo_service import OdooService, get_odoo_service, _service_pool
 
 User = get_user_model()
 
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
 class OdooCredentialsModelTests(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(
@@ -73,4 +87,323 @@ class OdooCredentialsModelTests(TestCase):
         mock_encrypt.assert_called_with('test_api_key')
         
         credentials.get_api_key()
-        mock_decrypt.assert_called_with('encrypted_api_key')
\ No newline at end of file
+        mock_decrypt.assert_called_with('encrypted_api_key')
+
+class OdooServiceBatchTests(TestCase):
+    def setUp(self):
+        from users.services.odoo_service import OdooService
+        self.service = OdooService('https://batch.odoo.com', 'batch_db', 'odoo@example.com', 'key')
+        self.service.uid = 7
+
+    def _response(self, payload):
+        response = MagicMock()
+        response.json.return_value = payload
+        return response
+
+    def test_shared_session_per_credential(self):
+        from users.services.odoo_service import OdooService
+        other = OdooService('https://batch.odoo.com', 'batch_db', 'odoo@example.com', 'key')
+        self.assertIs(self.service.http, other.http)
+
+    def test_batch_calls_use_single_round_trip(self):
+        with patch.object(self.service.http, 'post') as mock_post:
+            mock_post.return_value = self._response([
+                {'jsonrpc': '2.0', 'id': 1, 'result': ['second']},
+                {'jsonrpc': '2.0', 'id': 0, 'result': ['first']},
+            ])
+            results = self.service.call_odoo_batch([
+                ('hr.applicant', 'search_read', [[('job_id', '=', 1)]], {}),
+                ('hr.applicant', 'search_read', [[('job_id', '=', 2)]], {}),
+            ])
+        self.assertEqual(results, [['first'], ['second']])
+        self.assertEqual(mock_post.call_count, 1)
+
+    def test_batch_falls_back_when_envelopes_rejected(self):
+        with patch.object(self.service.http, 'post') as mock_post:
+            mock_post.side_effect = [
+                self._response({'jsonrpc': '2.0', 'id': None, 'error': {'message': 'Invalid request'}}),
+                self._response({'jsonrpc': '2.0', 'id': 0, 'result': ['first']}),
+                self._response({'jsonrpc': '2.0', 'id': 1, 'result': ['second']}),
+            ]
+            results = self.service.call_odoo_batch([
+                ('hr.job', 'search_read', [[]], {}),
+                ('hr.job', 'search_read', [[]], {}),
+            ])
+        self.assertEqual(results, [['first'], ['second']])
+        self.assertFalse(self.service.supports_batch)
+
+    def test_batch_falls_back_when_envelopes_get_http_error_or_html(self):
+        failed = MagicMock()
+        failed.raise_for_status.side_effect = requests.exceptions.HTTPError('500 Server Error')
+        html = MagicMock()
+        html.json.side_effect = requests.exceptions.JSONDecodeError('Expecting value', '<html>', 0)
+        for rejection in (failed, html):
+            with self.subTest(rejection=rejection):
+                self.service.supports_batch = True
+                with patch.object(self.service.http, 'post') as mock_post:
+                    mock_post.side_effect = [
+                        rejection,
+                        self._response({'jsonrpc': '2.0', 'id': 0, 'result': ['first']}),
+                        self._response({'jsonrpc': '2.0', 'id': 1, 'result': ['second']}),
+                    ]
+                    results = self.service.call_odoo_batch([
+                        ('hr.job', 'search_read', [[]], {}),
+                        ('hr.job', 'search_read', [[]], {}),
+                    ])
+                self.assertEqual(results, [['first'], ['second']])
+                self.assertFalse(self.service.supports_batch)
+
+    def test_attachment_content_is_decoded_while_streaming(self):
+        content = bytes(range(256)) * 40
+        body = json.dumps({
+            'jsonrpc': '2.0',
+            'id': 1,
+            'result': [{'id': 5, 'name': 'cv.pdf', 'mimetype': 'application/pdf', 'datas': base64.b64encode(content).decode()}],
+        }).encode()
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.return_value = [body[start:start + 7] for start in range(0, len(body), 7)]
+        written = []
+
+        with patch.object(self.service.http, 'post', return_value=response) as mock_post:
+            writer = HashingWriter(MagicMock(write=written.append))
+            detail = self.service.stream_attachment_content(5, writer)
+
+        self.assertTrue(mock_post.call_args[1]['stream'])
+        self.assertEqual(b''.join(written), content)
+        self.assertEqual(max(len(piece) for piece in written), 6)
+        self.assertEqual((writer.size, writer.checksum), (len(content), hashlib.sha256(content).hexdigest()))
+        self.assertEqual(detail, {'id': 5, 'name': 'cv.pdf', 'mimetype': 'application/pdf', 'datas': ''})
+
+    @patch('recos.concurrency.time.sleep')
+    def test_throttled_download_backs_off_and_retries(self, mock_sleep):
+        self.addCleanup(setattr, self.service.host_backoff, 'retry_at', 0)
+        throttled = MagicMock(status_code=503)
+        throttled.__enter__.return_value = throttled
+        response = MagicMock(status_code=200)
+        response.__enter__.return_value = response
+        response.iter_content.return_value = [b'{"jsonrpc": "2.0", "id": 1, "result": [{"id": 5, "datas": "aGk="}]}']
+        written = []
+
+        with patch.object(self.service.http, 'post', side_effect=[throttled, response]) as mock_post:
+            self.service.stream_attachment_content(5, MagicMock(write=written.append))
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(b''.join(written), b'hi')
+        mock_sleep.assert_called_once()
+        self.assertEqual(self.service.host_backoff.failures, 0)
+
+    def test_attachment_without_content_streams_nothing(self):
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.return_value = [b'{"jsonrpc": "2.0", "id": 1, "result": [{"id": 5, "datas": false, "name": "x"}]}']
+        destination = MagicMock()
+
+        with patch.object(self.service.http, 'post', return_value=response):
+            self.assertIsNone(self.service.stream_attachment_content(5, destination))
+        destination.write.assert_not_called()
+
+
+@override_settings(ODOO_API_ENCRYPTION_KEY='this_is_a_test_key_for_encryption_32bytes')
+class OdooServicePoolTests(TestCase):
+    def setUp(self):
+        _service_pool.clear()
+        self.addCleanup(_service_pool.clear)
+        user = User.objects.create_user(
+            email='pool@example.com',
+            first_name='Pool',
+            last_name='User',
+            password='testpass123'
+        )
+        self.credentials = OdooCredentials.objects.create(
+            odoo_user_id=5,
+            recruiter=user,
+            api_key='key',
+            email_address='odoo@example.com',
+            db_name='pool_db',
+            db_url='https://pool.odoo.com'
+        )
+
+    def _response(self, payload):
+        response = MagicMock()
+        response.json.return_value = payload
+        return response
+
+    @patch.object(OdooService, 'authenticate', return_value=True)
+    def test_authenticated_service_is_reused_per_credential(self, mock_authenticate):
+        with patch.object(OdooCredentials, 'get_api_key', return_value='key') as mock_get_api_key:
+            first = get_odoo_service(self.credentials)
+            second = get_odoo_service(OdooCredentials.objects.get(pk=self.credentials.pk))
+
+        self.assertIs(first, second)
+        mock_authenticate.assert_called_once()
+        mock_get_api_key.assert_called_once()
+
+    @patch.object(OdooService, 'authenticate', return_value=True)
+    def test_edited_credentials_log_in_again(self, mock_authenticate):
+        first = get_odoo_service(self.credentials)
+        self.credentials.db_name = 'renamed_db'
+        self.credentials.save()
+
+        second = get_odoo_service(self.credentials)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.db_name, 'renamed_db')
+        self.assertEqual(mock_authenticate.call_count, 2)
+
+    def test_rejected_login_is_not_pooled(self):
+        with patch.object(OdooService, 'authenticate', return_value=False):
+            self.assertIsNone(get_odoo_service(self.credentials))
+        with patch.object(OdooService, 'authenticate', return_value=True):
+            self.assertIsNotNone(get_odoo_service(self.credentials))
+
+    def test_expired_login_is_renewed_once_and_retried(self):
+        service = OdooService('https://pool.odoo.com', 'pool_db', 'odoo@example.com', 'key')
+        service.uid = 7
+        denied = {'jsonrpc': '2.0', 'id': 1, 'error': {
+            'message': 'Odoo Server Error', 'data': {'name': 'odoo.exceptions.AccessDenied', 'message': 'Access Denied'}
+        }}
+        with patch.object(service.http, 'post') as mock_post:
+            mock_post.side_effect = [
+                self._response(denied),
+                self._response({'jsonrpc': '2.0', 'id': 1, 'result': 8}),
+                self._response({'jsonrpc': '2.0', 'id': 1, 'result': ['ok']}),
+            ]
+            self.assertEqual(service.call_odoo('hr.job', 'search_read', [[]], {}), ['ok'])
+        self.assertEqual(service.uid, 8)
+
+        with patch.object(service.http, 'post') as mock_post:
+            mock_post.side_effect = [
+                self._response(denied),
+                self._response({'jsonrpc': '2.0', 'id': 1, 'result': 8}),
+                self._response(denied),
+            ]
+            with self.assertRaises(Exception):
+                service.call_odoo('hr.job', 'search_read', [[]], {})
+        self.assertEqual(mock_post.call_count, 3)
+
+
+class OdooSyncWatermarkTests(TestCase):
+    @override_settings(ODOO_API_ENCRYPTION_KEY='this_is_a_test_key_for_encryption_32bytes')
+    def setUp(self):
+        user = User.objects.create_user(
+            email='watermark@example.com',
+            first_name='Water',
+            last_name='Mark',
+            password='testpass123'
+        )
+        self.credentials = OdooCredentials.objects.create(
+            odoo_user_id=5,
+            recruiter=user,
+            api_key='key',
+            email_address='odoo@example.com',
+            db_name='test_db',
+            db_url='https://test.odoo.com'
+        )
+
+    def test_no_watermark_means_full_sync(self):
+        self.assertIsNone(OdooSyncWatermark.get_since(self.credentials, 'hr.job', 'user'))
+
+    def test_advance_keeps_latest_write_date(self):
+        OdooSyncWatermark.advance(self.credentials, 'hr.job', 'user', [
+            {'id': 1, 'write_date': '2025-01-02 10:00:00'},
+            {'id': 2, 'write_date': '2025-01-03 08:30:00'},
+        ])
+        OdooSyncWatermark.advance(self.credentials, 'hr.job', 'user', [
+            {'id': 3, 'write_date': '2025-01-01 00:00:00'},
+        ])
+        self.assertEqual(
+            OdooSyncWatermark.get_since(self.credentials, 'hr.job', 'user'),
+            '2025-01-03 08:30:00'
+        )
+        self.assertIsNone(OdooSyncWatermark.get_since(self.credentials, 'hr.job', 'company:1'))
+
+
+@override_settings(API_RESPONSE_CACHE_TTL=0, CACHES=LOCMEM_CACHES)
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        _local_auth.clear()
+        self.user = User.objects.create_user(
+            email='token@example.com',
+            first_name='Token',
+            last_name='Holder',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def _get_credentials(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/odoo-credentials/list/')
+        return response, len(context.captured_queries)
+
+    def test_repeat_requests_skip_token_lookup(self):
+        first, first_queries = self._get_credentials()
+        _local_auth.clear()
+        from_shared, shared_queries = self._get_credentials()
+        from_local, local_queries = self._get_credentials()
+
+        self.assertEqual([first.status_code, from_shared.status_code, from_local.status_code], [200] * 3)
+        self.assertEqual(first_queries, 2)
+        self.assertEqual(shared_queries, 1)
+        self.assertEqual(local_queries, 1)
+
+    def test_logout_revokes_cached_token(self):
+        self._get_credentials()
+
+        self.assertEqual(self.client.post('/api/logout/').status_code, 200)
+
+        response, _ = self._get_credentials()
+        self.assertEqual(response.status_code, 401)
+
+    def test_invalidated_user_is_reloaded(self):
+        self._get_credentials()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertEqual(self._get_credentials()[0].status_code, 200)
+        invalidate_user(self.user)
+        self.assertEqual(self._get_credentials()[0].status_code, 401)
+
+    def test_saving_or_deleting_revokes_cached_entries(self):
+        self._get_credentials()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self._get_credentials()[0].status_code, 401)
+
+        self.user.is_active = True
+        self.user.save()
+        self.assertEqual(self._get_credentials()[0].status_code, 200)
+        self.token.delete()
+        self.assertEqual(self._get_credentials()[0].status_code, 401)
+
+    def test_cache_holds_no_credentials(self):
+        self._get_credentials()
+
+        cached = cache.get(_token_cache_key(self.token.key))
+        self.assertEqual((cached['fields']['id'], cached['fields']['is_active']), (self.user.pk, True))
+        self.assertNotIn('password', cached['fields'])
+        self.assertNotIn(self.user.password, str(cached))
+        self.assertNotIn(self.token.key, str(cached))
+
+    def test_cached_user_still_checks_its_password(self):
+        get_cached_user(self.user.pk, lambda user_id: User.objects.get(pk=user_id))
+        _local_auth.clear()
+
+        user = get_cached_user(self.user.pk, lambda user_id: None)
+        self.assertTrue(user.check_password('testpass123'))
+
+    def test_session_requests_do_not_load_the_password(self):
+        self.client.force_login(self.user, backend='users.backends.EmailBackend')
+        request = RequestFactory().get('/')
+        request.session = self.client.session
+        expected_hash = self.user.get_session_auth_hash()
+        self.assertEqual(get_user(request).pk, self.user.pk)
+
+        with self.assertNumQueries(0):
+            user = get_user(request)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.get_session_auth_hash(), expected_hash)
+        user.set_password('changed-pass-456')
+        self.assertNotEqual(user.get_session_auth_hash(), expected_hash)